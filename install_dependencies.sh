@@ -10,5 +10,10 @@ sudo apt-get update
 echo "Installing Python packages..."
 sudo pip3 install flask pyserial pynmea2
 
+# Vendor the web libraries so the dashboard works without internet
+echo "Building web assets..."
+python3 src/web/assets.py fetch
+python3 src/web/assets.py build
+
 echo "Dependencies installed successfully!"
 echo "You can now run the main.py script with: sudo python src/main.py"
@@ -15,6 +15,9 @@ setup(
         'numpy',           # For image processing
         'opencv-python',   # For computer vision
     ],
+    extras_require={
+        'websocket': ['flask-sock'],  # WebSocket joystick channel
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
 import os
+import sys
 import time
-import requests
 import json
 import threading
-from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import camera_http
+import motion_detection
+from camera.snapshot_archive import SnapshotArchive
 
 # Load configuration
 config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'settings.json')
@@ -16,16 +22,24 @@ try:
     CAMERA_CONFIG = settings.get('camera', {})
     IP_CAMERA_URL = CAMERA_CONFIG.get('ip_camera_url', 'http://192.168.1.3:8080')
     IP_CAMERA_SNAPSHOT_PATH = CAMERA_CONFIG.get('snapshot_path', '/shot.jpg')
+    ARCHIVE_CONFIG = CAMERA_CONFIG.get('archive', {})
 except Exception as e:
     print(f"Warning: Could not load settings from {config_path}: {e}")
     # Default settings
     IP_CAMERA_URL = 'http://192.168.1.3:8080'
     IP_CAMERA_SNAPSHOT_PATH = '/shot.jpg'
+    ARCHIVE_CONFIG = {}
 
-# Image directory
+# Image directory (one sub-directory per day)
 IMAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'images')
-if not os.path.exists(IMAGE_DIR):
-    os.makedirs(IMAGE_DIR)
+archive = SnapshotArchive(IMAGE_DIR,
+                          max_bytes=ARCHIVE_CONFIG.get('max_size_mb', 500) * 1024 * 1024,
+                          max_age=ARCHIVE_CONFIG.get('max_age_days', 7) * 86400)
+
+# Unchanged scenes are archived at most once per keepalive period
+archive_detector = motion_detection.ChangeDetector(keepalive=ARCHIVE_CONFIG.get('unchanged_interval', 60))
+
+SAVE_TIMEOUT = 5  # seconds take_picture() waits for the image to reach the disk
 
 # Global variables
 camera_initialized = False
@@ -44,7 +58,7 @@ def initialize_camera():
             print(f"Testing connection to IP camera at: {snapshot_url}")
             
             # Try to get a test image
-            response = requests.get(snapshot_url, timeout=5)
+            response = camera_http.get(snapshot_url, kind='snapshot')
             
             if response.status_code == 200:
                 # Just check if we got image data
@@ -67,8 +81,14 @@ def initialize_camera():
             camera_initialized = False
             return False
 
-def take_picture(filename=None):
-    """Take a picture from the IP camera."""
+def take_picture(filename=None, wait=True):
+    """Take a picture from the IP camera.
+    
+    Args:
+        filename: Destination path (default: a new path in the archive)
+        wait: Return only once the file exists; without it the path may not
+              exist yet when this returns
+    """
     global camera_initialized
     
     with camera_lock:
@@ -77,20 +97,21 @@ def take_picture(filename=None):
                 return None
         
         try:
-            # Generate filename if not provided
-            if filename is None:
-                filename = os.path.join(IMAGE_DIR, f'image_{datetime.now().strftime("%Y%m%d_%H%M%S")}.jpg')
-            
             # Get image from IP camera
             snapshot_url = f"{IP_CAMERA_URL}{IP_CAMERA_SNAPSHOT_PATH}"
-            response = requests.get(snapshot_url, timeout=5)
+            response = camera_http.get(snapshot_url, kind='snapshot')
             
             if response.status_code == 200:
-                # Save the raw image data directly to a file
-                with open(filename, 'wb') as f:
-                    f.write(response.content)
-                    
-                print(f"Picture saved to: {filename}")
+                # Skip automatic captures of a scene that has not changed
+                if filename is None and motion_detection.ENABLED:
+                    is_new, _ = archive_detector.check(response.content)
+                    if not is_new:
+                        return archive.latest()
+                
+                # Written in the background; the archive picks a path if none is given
+                filename = archive.save(response.content, filename, wait=SAVE_TIMEOUT if wait else None)
+                if filename:
+                    print(f"Picture saved to: {filename}")
                 return filename
             else:
                 raise Exception(f"HTTP error {response.status_code}")
@@ -111,7 +132,8 @@ def start_continuous_capture(interval=5):
     # Define capture loop
     def capture_loop():
         while continuous_capture_running:
-            take_picture()
+            # Nothing reads the path, so don't hold the camera lock for the write
+            take_picture(wait=False)
             time.sleep(interval)
     
     try:
@@ -164,23 +186,11 @@ def cleanup_camera():
 
 def get_latest_image():
     """Get the path to the most recent image."""
-    try:
-        if not os.path.exists(IMAGE_DIR):
-            return None
-            
-        image_files = [os.path.join(IMAGE_DIR, f) for f in os.listdir(IMAGE_DIR) 
-                      if f.endswith(('.jpg', '.jpeg', '.png'))]
-        
-        if not image_files:
-            return None
-            
-        # Get the most recent file
-        latest_image = max(image_files, key=os.path.getmtime)
-        return latest_image
-        
-    except Exception as e:
-        print(f"Error getting latest image: {e}")
-        return None
+    return archive.latest()
+
+def get_recent_images(count=10):
+    """Get the most recent images, newest first."""
+    return archive.recent(count)
 
 # When run directly, test the module
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Snapshot archive for the Smart Wheelchair camera.
+Stores captured images in per-day directories, writes them in a background
+thread and keeps an in-memory index so the newest image and the retention
+limits never need a directory scan.
+"""
+import os
+import time
+import queue
+import threading
+from collections import deque
+from itertools import islice
+from datetime import datetime
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+class SnapshotArchive:
+    """Bounded, date-partitioned image archive.
+
+    Images older than ``max_age`` seconds, and the oldest images once the
+    archive exceeds ``max_bytes``, are deleted after each write. The index is
+    built from disk once when the archive is created.
+    """
+    def __init__(self, root, max_bytes=500 * 1024 * 1024, max_age=7 * 86400, queue_size=32):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self.lock = threading.Lock()
+        self.entries = deque()  # (timestamp, path, size), oldest first
+        self.total_bytes = 0
+
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.writer_thread = None
+
+        os.makedirs(root, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Index the images already on disk (top level and day directories)."""
+        found = []
+        directories = [self.root]
+        with os.scandir(self.root) as entries:
+            directories += [entry.path for entry in entries if entry.is_dir()]
+
+        for directory in directories:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                        stat = entry.stat()
+                        found.append((stat.st_mtime, entry.path, stat.st_size))
+
+        found.sort()
+        with self.lock:
+            self.entries = deque(found)
+            self.total_bytes = sum(size for _, _, size in found)
+
+    def new_path(self, timestamp=None):
+        """Get the archive path for an image taken at the given time."""
+        moment = datetime.fromtimestamp(timestamp or time.time())
+        directory = os.path.join(self.root, moment.strftime("%Y%m%d"))
+        return os.path.join(directory, f'image_{moment.strftime("%Y%m%d_%H%M%S_%f")[:-3]}.jpg')
+
+    def _ensure_writer(self):
+        if self.writer_thread is None or not self.writer_thread.is_alive():
+            self.writer_thread = threading.Thread(target=self._writer)
+            self.writer_thread.daemon = True
+            self.writer_thread.start()
+
+    def save(self, data, path=None, wait=None):
+        """Queue an image for writing.
+
+        Args:
+            data: Encoded image bytes
+            path: Destination path (default: a new path in today's directory)
+            wait: Seconds to wait for this image to be on disk (default: don't wait)
+
+        Returns:
+            str: Path the image will be written to, or None if the queue is full
+                 (or, when waiting, if the write failed or timed out)
+        """
+        timestamp = time.time()
+        path = path or self.new_path(timestamp)
+        done = threading.Event() if wait is not None else None
+        try:
+            self.write_queue.put_nowait((timestamp, path, data, done))
+        except queue.Full:
+            print(f"Snapshot archive busy, dropping {path}")
+            return None
+        self._ensure_writer()
+
+        if done is not None:
+            if not done.wait(wait):
+                print(f"Timed out waiting for snapshot {path}")
+                return None
+            if not os.path.exists(path):
+                return None
+        return path
+
+    def flush(self, timeout=None):
+        """Wait until every queued image has been written."""
+        if self.writer_thread is None:
+            return
+        if timeout is None:
+            self.write_queue.join()
+            return
+        deadline = time.time() + timeout
+        while self.write_queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.01)
+
+    def _writer(self):
+        """Background worker that writes queued images."""
+        while True:
+            timestamp, path, data, done = self.write_queue.get()
+            try:
+                self._write(timestamp, path, data)
+            except Exception as e:
+                print(f"Error writing snapshot {path}: {e}")
+            finally:
+                if done is not None:
+                    done.set()
+                self.write_queue.task_done()
+
+    def _write(self, timestamp, path, data):
+        """Write one image atomically, index it and apply retention."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            self.entries.append((timestamp, path, len(data)))
+            self.total_bytes += len(data)
+            expired = self._expired(time.time())
+
+        for old_path in expired:
+            self._remove(old_path)
+
+    def _expired(self, now):
+        """Pop the entries that break the retention limits (lock held)."""
+        expired = []
+        entries = self.entries
+        # Always keep the newest image
+        while len(entries) > 1:
+            timestamp, path, size = entries[0]
+            if self.total_bytes <= self.max_bytes and now - timestamp <= self.max_age:
+                break
+            entries.popleft()
+            self.total_bytes -= size
+            expired.append(path)
+        return expired
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        # Remove the day directory once it is empty
+        directory = os.path.dirname(path)
+        if directory != self.root:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+    def latest(self):
+        """Get the path of the newest archived image, or None."""
+        with self.lock:
+            return self.entries[-1][1] if self.entries else None
+
+    def recent(self, count=10):
+        """Get the newest archived images, newest first.
+
+        Returns:
+            list: Dicts with path, time and size
+        """
+        with self.lock:
+            newest = list(islice(reversed(self.entries), max(count, 0)))
+        return [{'path': path, 'time': timestamp, 'size': size}
+                for timestamp, path, size in newest]
+
+    def get_status(self):
+        """Get archive statistics."""
+        with self.lock:
+            return {
+                'images': len(self.entries),
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'max_age': self.max_age,
+                'pending': self.write_queue.qsize()
+            }
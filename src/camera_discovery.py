@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+LAN discovery for phone cameras.
+Probes every address on the local /24 subnet for IP Webcam (port 8080) and
+DroidCam (port 4747) with asyncio, so hundreds of hosts are checked
+concurrently instead of one timeout after another.
+"""
+import time
+import socket
+import asyncio
+import ipaddress
+import threading
+
+# Port and signature of each supported camera app
+CAMERA_SIGNATURES = {
+    'ip_webcam': {
+        'port': 8080,
+        'path': '/status.json',
+        'markers': (b'IP Webcam', b'curvals', b'video_connections')
+    },
+    'droidcam': {
+        'port': 4747,
+        'path': '/',
+        'markers': (b'DroidCam',)
+    }
+}
+
+CONCURRENCY = 128   # probes in flight at once
+CACHE_TTL = 60      # seconds a scan result is reused
+MAX_RESPONSE = 4096  # bytes read from each camera when checking its signature
+
+# Scan results per subnet: {subnet: (time, cameras)}
+discovery_cache = {}
+discovery_lock = threading.Lock()
+
+
+def get_local_subnet():
+    """Get the /24 network of this machine's LAN address."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        # No packet is sent; this only selects the outgoing interface
+        sock.connect(('10.255.255.255', 1))
+        local_ip = sock.getsockname()[0]
+    except OSError:
+        local_ip = '127.0.0.1'
+    finally:
+        sock.close()
+    return str(ipaddress.ip_network(f"{local_ip}/24", strict=False))
+
+
+async def _probe(ip, camera_type, timeout):
+    """Check one host for one camera app.
+
+    Returns:
+        dict: Camera description, or None if the app was not found
+    """
+    signature = CAMERA_SIGNATURES[camera_type]
+    port = signature['port']
+    start = time.time()
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        writer.write(f"GET {signature['path']} HTTP/1.0\r\nHost: {ip}:{port}\r\n\r\n".encode())
+        await writer.drain()
+
+        response = b''
+        while len(response) < MAX_RESPONSE:
+            chunk = await asyncio.wait_for(reader.read(MAX_RESPONSE - len(response)), timeout)
+            if not chunk:
+                break
+            response += chunk
+            if any(marker in response for marker in signature['markers']):
+                return {
+                    'ip': ip,
+                    'port': str(port),
+                    'type': camera_type,
+                    'url': f"http://{ip}:{port}",
+                    'response_time': round(time.time() - start, 3)
+                }
+    except (OSError, asyncio.TimeoutError):
+        pass
+    finally:
+        if writer is not None:
+            writer.close()
+    return None
+
+
+async def discover_async(subnet=None, timeout=1.0, concurrency=CONCURRENCY, camera_types=None):
+    """Probe the subnet and yield each camera as soon as it answers."""
+    network = ipaddress.ip_network(subnet or get_local_subnet(), strict=False)
+    camera_types = camera_types or list(CAMERA_SIGNATURES)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded_probe(ip, camera_type):
+        async with semaphore:
+            return await _probe(ip, camera_type, timeout)
+
+    tasks = [asyncio.ensure_future(bounded_probe(str(host), camera_type))
+             for host in network.hosts() for camera_type in camera_types]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            camera = await next_result
+            if camera:
+                yield camera
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def discover_cameras(timeout=1.0, subnet=None, use_cache=True, callback=None):
+    """Find phone cameras on the local network.
+
+    Args:
+        timeout: Per-probe connect/read timeout in seconds
+        subnet: Network to scan (default: this machine's /24)
+        use_cache: Return a scan younger than CACHE_TTL if there is one
+        callback: Called with each camera as soon as it is found
+
+    Returns:
+        list: Camera dicts with ip, port, type, url and response_time
+    """
+    subnet = subnet or get_local_subnet()
+
+    # One scan at a time; callers that waited get the fresh cached result
+    with discovery_lock:
+        cached = discovery_cache.get(subnet)
+        if use_cache and cached and time.time() - cached[0] < CACHE_TTL:
+            cameras = list(cached[1])
+            if callback:
+                for camera in cameras:
+                    callback(camera)
+            return cameras
+
+        async def scan():
+            found = []
+            async for camera in discover_async(subnet, timeout):
+                found.append(camera)
+                if callback:
+                    callback(camera)
+            return found
+
+        start = time.time()
+        cameras = sorted(asyncio.run(scan()), key=lambda camera: ipaddress.ip_address(camera['ip']))
+        discovery_cache[subnet] = (time.time(), cameras)
+        print(f"Camera discovery on {subnet} found {len(cameras)} cameras in {time.time() - start:.1f}s")
+        return list(cameras)
+
+
+def clear_cache():
+    """Forget cached scan results."""
+    with discovery_lock:
+        discovery_cache.clear()
+
+
+# Scan the local network when run directly
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else None
+    print(f"Scanning {target or get_local_subnet()} for cameras...")
+    discover_cameras(subnet=target, use_cache=False,
+                     callback=lambda camera: print(f"  found {camera['type']} at {camera['url']}"))
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the phone camera modules.
+
+All camera requests go through one keep-alive session with a small
+connection pool, so a frame fetch reuses a warm socket instead of opening
+a new TCP connection. Each call records the outcome per host, which lets
+callers skip separate "is it up?" probes.
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from urllib.parse import urlsplit
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+# (connect, read) timeouts per kind of endpoint
+TIMEOUTS = {
+    'status': (1, 2),     # status.json, HEAD probes
+    'snapshot': (2, 5),   # shot.jpg
+    'photo': (2, 10),     # full resolution photo.jpg
+    'control': (2, 3),    # torch, focus, settings
+    'stream': (3, 5)      # MJPEG streams (read timeout between chunks)
+}
+
+POOL_SIZE = 8  # connections kept per host
+WORKERS = 4              # threads running fetch() requests
+FAILURE_BACKOFF = 5      # seconds fetch() fails fast after repeated failures
+BACKOFF_FAILURES = 2     # consecutive failures that start the backoff
+
+# Optional reusable context manager timing every request (the web app sets a metrics span)
+request_span = None
+
+session = None
+session_lock = threading.Lock()
+
+# Per-host connection health
+health = {}
+health_lock = threading.Lock()
+
+# Worker pool for fetch(), so web handlers never wait longer than their deadline
+executor = None
+executor_lock = threading.Lock()
+
+
+def get_session():
+    """Get the shared keep-alive session."""
+    global session
+
+    with session_lock:
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        return session
+
+
+def _host(url):
+    parts = urlsplit(url)
+    return parts.netloc
+
+
+def _record(url, success, error=None):
+    """Record the outcome of a request for the URL's host."""
+    host = _host(url)
+    now = time.time()
+    with health_lock:
+        state = health.setdefault(host, {
+            'healthy': None,
+            'last_success': None,
+            'last_failure': None,
+            'consecutive_failures': 0,
+            'last_error': None
+        })
+        state['healthy'] = success
+        if success:
+            state['last_success'] = now
+            state['consecutive_failures'] = 0
+        else:
+            state['last_failure'] = now
+            state['consecutive_failures'] += 1
+            state['last_error'] = str(error) if error else None
+
+
+def request(method, url, kind='snapshot', **kwargs):
+    """Make a request on the shared session.
+
+    Args:
+        method: HTTP method
+        url: Full URL
+        kind: Endpoint kind used to pick the timeout (see TIMEOUTS)
+
+    Returns:
+        requests.Response; raises requests exceptions on connection errors
+    """
+    kwargs.setdefault('timeout', TIMEOUTS.get(kind, TIMEOUTS['snapshot']))
+    span = request_span
+    try:
+        if span is None:
+            response = get_session().request(method, url, **kwargs)
+        else:
+            with span:
+                response = get_session().request(method, url, **kwargs)
+    except Exception as e:
+        _record(url, False, e)
+        raise
+    _record(url, response.status_code < 500)
+    return response
+
+
+def get(url, kind='snapshot', **kwargs):
+    """GET a camera URL on the shared session."""
+    return request('GET', url, kind, **kwargs)
+
+
+def head(url, kind='status', **kwargs):
+    """HEAD a camera URL on the shared session."""
+    return request('HEAD', url, kind, **kwargs)
+
+
+def is_healthy(url, max_age=10):
+    """Check the recorded health of a camera host.
+
+    Returns:
+        bool: The outcome of the last request if it is recent, else None
+    """
+    with health_lock:
+        state = health.get(_host(url))
+        if state is None:
+            return None
+        last = max(state['last_success'] or 0, state['last_failure'] or 0)
+        if time.time() - last > max_age:
+            return None
+        return state['healthy']
+
+
+def get_health():
+    """Get a copy of the health state of every camera host."""
+    with health_lock:
+        return {host: dict(state) for host, state in health.items()}
+
+
+def is_backing_off(url):
+    """Check whether a host failed repeatedly within the last FAILURE_BACKOFF seconds."""
+    with health_lock:
+        state = health.get(_host(url))
+        if state is None or state['consecutive_failures'] < BACKOFF_FAILURES:
+            return False
+        return time.time() - (state['last_failure'] or 0) < FAILURE_BACKOFF
+
+
+def get_executor():
+    """Get the worker pool used by fetch()."""
+    global executor
+
+    with executor_lock:
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='camera')
+        return executor
+
+
+def fetch(url, kind='control', deadline=None, method='GET', **kwargs):
+    """Make a request on the worker pool and wait at most ``deadline`` seconds.
+
+    The calling thread is released when the deadline passes even if the
+    phone is still holding the connection open, and hosts that keep failing
+    are skipped for FAILURE_BACKOFF seconds instead of being retried.
+
+    Args:
+        url: Full URL
+        kind: Endpoint kind used to pick the timeout (see TIMEOUTS)
+        deadline: Seconds to wait (default: the kind's connect + read timeout)
+
+    Returns:
+        requests.Response, or None on error, timeout or backoff
+    """
+    if not REQUESTS_AVAILABLE or is_backing_off(url):
+        return None
+    if deadline is None:
+        deadline = sum(TIMEOUTS.get(kind, TIMEOUTS['snapshot']))
+
+    future = get_executor().submit(request, method, url, kind, **kwargs)
+    try:
+        return future.result(timeout=deadline)
+    except FutureTimeout:
+        future.cancel()
+        _record(url, False, f"no response within {deadline}s")
+        return None
+    except Exception:
+        return None
@@ -1,7 +1,7 @@
 import os
-import json
 import threading
 import time
+from urllib.parse import urlsplit
 
 # Default camera settings
 IP_CAMERA_URL = "http://100.126.190.41:8080"  # Updated default to match settings.json
@@ -24,24 +24,21 @@ camera_view = {
     'quality': 'high'
 }
 
-# Try to import requests, with fallback
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+# Shared camera HTTP client - needs the requests module
+import camera_http
+REQUESTS_AVAILABLE = camera_http.REQUESTS_AVAILABLE
+if not REQUESTS_AVAILABLE:
     print("Warning: requests module not found. Camera functionality will be limited.")
     print("Install with: sudo pip3 install requests")
 
+# Shared, cached settings
+import settings_service
+
 # Load settings if available
 try:
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'settings.json')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            settings = json.load(f)
-        
+    camera_settings = settings_service.get_section('camera')
+    if camera_settings:
         # Update camera settings from config
-        camera_settings = settings.get('camera', {})
         IP_CAMERA_URL = camera_settings.get('ip_camera_url', IP_CAMERA_URL)
         SNAPSHOT_PATH = camera_settings.get('snapshot_path', SNAPSHOT_PATH)
         VIDEO_PATH = camera_settings.get('video_path', VIDEO_PATH)
@@ -58,12 +55,60 @@ try:
 except Exception as e:
     print(f"Error loading camera settings: {e}")
 
+# Endpoints per camera app, used by the /api/v2 camera routes
+CAMERA_TYPES = {
+    'ip_webcam': {
+        'port': '8080',
+        'status': '/status.json',
+        'snapshot': '/shot.jpg',
+        'flash_on': '/enabletorch',
+        'flash_off': '/disabletorch',
+        'focus': '/focus'
+    },
+    'droidcam': {
+        'port': '4747',
+        'status': '/',
+        'snapshot': '/shot.jpg',
+        'flash_on': '/cam/1/led_toggle',  # DroidCam only toggles the LED
+        'flash_off': '/cam/1/led_toggle',
+        'focus': '/cam/1/af'
+    }
+}
+
 # Camera availability cache
 camera_available = None
 last_check_time = 0
 check_interval = 10  # seconds
 camera_lock = threading.Lock()
 
+# Background availability check started by get_cached_availability()
+refresh_thread = None
+
+# Background initialization - nothing talks to the phone at import time
+init_thread = None
+init_started = False
+
+def _on_settings_changed(settings, previous):
+    """Pick up camera settings edited in the file or by another module."""
+    global IP_CAMERA_URL, SNAPSHOT_PATH, VIDEO_PATH, MJPEG_PATH, CAMERA_ENABLED
+    global camera_available, last_check_time
+    camera_settings = settings.get('camera', {})
+    if camera_settings == previous.get('camera', {}):
+        return
+
+    url = camera_settings.get('ip_camera_url', IP_CAMERA_URL).rstrip('/')
+    SNAPSHOT_PATH = camera_settings.get('snapshot_path', SNAPSHOT_PATH)
+    VIDEO_PATH = camera_settings.get('video_path', VIDEO_PATH)
+    MJPEG_PATH = camera_settings.get('mjpeg_path', MJPEG_PATH)
+    CAMERA_ENABLED = camera_settings.get('enabled', CAMERA_ENABLED)
+    if url != IP_CAMERA_URL:
+        IP_CAMERA_URL = url
+        with camera_lock:
+            camera_available = None
+            last_check_time = 0
+
+settings_service.add_listener(_on_settings_changed)
+
 def get_snapshot_url():
     """Get the URL for still images."""
     return f"{IP_CAMERA_URL}{SNAPSHOT_PATH}"
@@ -76,10 +121,19 @@ def get_mjpeg_url():
     """Get the URL for MJPEG stream."""
     return f"{IP_CAMERA_URL}{MJPEG_PATH}"
 
-def is_camera_available():
-    """Check if the IP camera is accessible."""
+def is_camera_available(ip=None, port=None, camera_type=None):
+    """Check if the IP camera is accessible.
+    
+    Args:
+        ip, port, camera_type: Probe this camera instead of the configured one
+            (not cached, waits at most the status timeout)
+    """
     global camera_available, last_check_time
     
+    if ip:
+        response = camera_http.fetch(camera_endpoint(ip, port, camera_type, 'status'), kind='status')
+        return response is not None and response.status_code == 200
+    
     # If not enabled, always return False
     if not CAMERA_ENABLED:
         return False
@@ -88,15 +142,25 @@ def is_camera_available():
     if not REQUESTS_AVAILABLE:
         return False
     
+    start_camera_init()
+    
     # Use cached result if checked recently
     current_time = time.time()
     with camera_lock:
         if camera_available is not None and current_time - last_check_time < check_interval:
             return camera_available
     
+    # Any recent camera request already tells us whether it is reachable
+    recent = camera_http.is_healthy(IP_CAMERA_URL, max_age=check_interval)
+    if recent is not None:
+        with camera_lock:
+            camera_available = recent
+            last_check_time = current_time
+        return recent
+    
     # Check camera availability
     try:
-        response = requests.get(get_snapshot_url(), timeout=2)
+        response = camera_http.get(get_snapshot_url(), kind='status')
         available = response.status_code == 200
         
         # Update cache
@@ -114,19 +178,61 @@ def is_camera_available():
             
         return False
 
+def get_cached_availability():
+    """Get the last known camera availability without waiting on the network.
+    
+    If the cached result is stale, a check is started in the background and
+    the old value (None if never checked) is returned.
+    """
+    global refresh_thread
+    
+    with camera_lock:
+        available = camera_available
+        stale = time.time() - last_check_time >= check_interval
+        if stale and CAMERA_ENABLED and REQUESTS_AVAILABLE and (
+                refresh_thread is None or not refresh_thread.is_alive()):
+            refresh_thread = threading.Thread(target=is_camera_available)
+            refresh_thread.daemon = True
+            refresh_thread.start()
+    
+    return available if CAMERA_ENABLED else False
+
 def get_still_image_bytes():
     """Get a still image from the camera as bytes."""
     if not is_camera_available() or not REQUESTS_AVAILABLE:
         return None
     
     try:
-        response = requests.get(get_snapshot_url(), timeout=5)
+        response = camera_http.get(get_snapshot_url(), kind='snapshot')
         if response.status_code == 200:
             return response.content
         return None
     except:
         return None
 
+def discover_cameras(timeout=1.0, use_cache=True):
+    """Find IP Webcam and DroidCam cameras on the local network."""
+    import camera_discovery
+    return camera_discovery.discover_cameras(timeout, use_cache=use_cache)
+
+def iter_mjpeg_frames(url=None):
+    """Yield frames from the camera's MJPEG stream over one connection.
+    
+    Frames are memoryviews into a reused buffer; copy with bytes() to keep one.
+    """
+    if not REQUESTS_AVAILABLE:
+        return
+    
+    from mjpeg_stream import iter_response_frames
+    
+    response = camera_http.get(url or get_mjpeg_url(), kind='stream', stream=True)
+    try:
+        if response.status_code != 200:
+            return
+        yield from iter_response_frames(response)
+    finally:
+        response.close()
+
 def save_snapshot(file_path):
     """Save a snapshot to a file."""
     if not is_camera_available() or not REQUESTS_AVAILABLE:
@@ -156,6 +262,85 @@ def get_camera_info():
     }
     return info
 
+def camera_endpoint(ip, port, camera_type, name):
+    """Build the URL of one endpoint (see CAMERA_TYPES) of a camera."""
+    endpoints = CAMERA_TYPES.get(camera_type, CAMERA_TYPES['ip_webcam'])
+    return f"http://{ip}:{port or endpoints['port']}{endpoints[name]}"
+
+def get_camera_address():
+    """Get the configured camera as (ip, port, camera_type)."""
+    parts = urlsplit(IP_CAMERA_URL)
+    camera_type = settings_service.get_section('camera').get('type')
+    if camera_type not in CAMERA_TYPES:
+        camera_type = 'ip_webcam'
+    return parts.hostname, str(parts.port or CAMERA_TYPES[camera_type]['port']), camera_type
+
+def load_settings():
+    """Get an editable copy of the settings."""
+    return settings_service.thaw(settings_service.get_settings())
+
+def save_settings(settings):
+    """Save the settings atomically.
+    
+    Returns:
+        bool: True if saved
+    """
+    try:
+        settings_service.save_settings(settings)
+        return True
+    except Exception as e:
+        print(f"Error saving settings: {e}")
+        return False
+
+def get_camera_snapshot(ip, port, camera_type=None):
+    """Get a snapshot from a camera, waiting at most the snapshot timeout.
+    
+    Returns:
+        bytes: JPEG data, or None
+    """
+    response = camera_http.fetch(camera_endpoint(ip, port, camera_type, 'snapshot'), kind='snapshot')
+    if response is not None and response.status_code == 200:
+        return response.content
+    return None
+
+def toggle_camera_flash(ip, port, enabled=True, camera_type=None):
+    """Turn the phone's flashlight on or off."""
+    name = 'flash_on' if enabled else 'flash_off'
+    response = camera_http.fetch(camera_endpoint(ip, port, camera_type, name), kind='control')
+    return response is not None and response.status_code == 200
+
+def focus_camera(ip, port, camera_type=None):
+    """Trigger the camera's autofocus."""
+    response = camera_http.fetch(camera_endpoint(ip, port, camera_type, 'focus'), kind='control')
+    return response is not None and response.status_code == 200
+
+def archive_snapshot(image_data):
+    """Store an image in the snapshot archive and wait until it is on disk.
+    
+    Returns:
+        str: Path the image was written to, or None if the archive is busy or the write failed
+    """
+    from camera.camera_control import archive, SAVE_TIMEOUT
+    return archive.save(image_data, wait=SAVE_TIMEOUT)
+
+def update_camera_settings(ip, port, camera_type=None):
+    """Switch to another camera and save it to the settings.
+    
+    Returns:
+        tuple: (success, message)
+    """
+    camera_type = camera_type if camera_type in CAMERA_TYPES else 'ip_webcam'
+    port = port or CAMERA_TYPES[camera_type]['port']
+    
+    success, message = update_camera_url(f"http://{ip}:{port}")
+    if success:
+        try:
+            settings_service.update_settings(
+                lambda settings: settings.setdefault('camera', {}).__setitem__('type', camera_type))
+        except Exception as e:
+            return False, str(e)
+    return success, message
+
 def update_camera_url(new_url):
     """Update the camera URL and save it to the settings file.
     
@@ -165,7 +350,7 @@ def update_camera_url(new_url):
     Returns:
         tuple: (success, message)
     """
-    global IP_CAMERA_URL, camera_available, last_check_time
+    global IP_CAMERA_URL, camera_available, last_check_time, init_started
     
     if not new_url:
         return False, "No URL provided"
@@ -178,20 +363,12 @@ def update_camera_url(new_url):
         with camera_lock:
             camera_available = None
             last_check_time = 0
+            init_started = False  # re-apply view settings to the new camera
         
-        # Load current settings
-        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'settings.json')
-        with open(config_path, 'r') as f:
-            settings = json.load(f)
-        
-        # Update camera URL in settings
-        if 'camera' not in settings:
-            settings['camera'] = {}
-        settings['camera']['ip_camera_url'] = IP_CAMERA_URL
-        
-        # Save settings
-        with open(config_path, 'w') as f:
-            json.dump(settings, f, indent=2)
+        # Save the URL (atomic write through the settings service)
+        def set_url(settings):
+            settings.setdefault('camera', {})['ip_camera_url'] = IP_CAMERA_URL
+        settings_service.update_settings(set_url)
         
         print(f"Camera URL updated to: {IP_CAMERA_URL}")
         return True, "Camera URL updated successfully"
@@ -204,13 +381,9 @@ def apply_camera_settings():
     global camera_position, camera_view, IP_CAMERA_URL
     
     try:
-        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'settings.json')
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                settings = json.load(f)
-            
+        camera_settings = settings_service.get_section('camera')
+        if camera_settings:
             # Update camera settings from config
-            camera_settings = settings.get('camera', {})
             IP_CAMERA_URL = camera_settings.get('ip_camera_url', IP_CAMERA_URL)
             
             # Update position and view settings
@@ -220,25 +393,25 @@ def apply_camera_settings():
                 camera_view.update(camera_settings['view_settings'])
                 
             # Apply camera transformations if connected
-            if REQUESTS_AVAILABLE:
+            if REQUESTS_AVAILABLE and is_camera_available():
                 try:
                     # Apply rotation
                     if camera_view['rotation']:
-                        requests.get(f"{IP_CAMERA_URL}/settings/rotation?set={camera_view['rotation']}")
+                        camera_http.get(f"{IP_CAMERA_URL}/settings/rotation?set={camera_view['rotation']}", kind='control')
                     
                     # Apply flips
                     if camera_view['flip_horizontal']:
-                        requests.get(f"{IP_CAMERA_URL}/settings/flip_h?set=1")
+                        camera_http.get(f"{IP_CAMERA_URL}/settings/flip_h?set=1", kind='control')
                     if camera_view['flip_vertical']:
-                        requests.get(f"{IP_CAMERA_URL}/settings/flip_v?set=1")
+                        camera_http.get(f"{IP_CAMERA_URL}/settings/flip_v?set=1", kind='control')
                     
                     # Apply quality
                     if camera_view['quality'] == 'high':
-                        requests.get(f"{IP_CAMERA_URL}/settings/quality?set=100")
+                        camera_http.get(f"{IP_CAMERA_URL}/settings/quality?set=100", kind='control')
                     elif camera_view['quality'] == 'medium':
-                        requests.get(f"{IP_CAMERA_URL}/settings/quality?set=80")
+                        camera_http.get(f"{IP_CAMERA_URL}/settings/quality?set=80", kind='control')
                     elif camera_view['quality'] == 'low':
-                        requests.get(f"{IP_CAMERA_URL}/settings/quality?set=60")
+                        camera_http.get(f"{IP_CAMERA_URL}/settings/quality?set=60", kind='control')
                         
                 except Exception as e:
                     print(f"Error applying camera settings: {e}")
@@ -246,8 +419,22 @@ def apply_camera_settings():
     except Exception as e:
         print(f"Error loading camera settings: {e}")
 
-# Apply settings on module load
-apply_camera_settings()
+def start_camera_init():
+    """Apply the camera settings in a background thread (once).
+    
+    Returns immediately, so importing or starting the web app never waits
+    on the phone being reachable.
+    """
+    global init_thread, init_started
+    
+    with camera_lock:
+        if init_started or not CAMERA_ENABLED:
+            return
+        init_started = True
+    
+    init_thread = threading.Thread(target=apply_camera_settings)
+    init_thread.daemon = True
+    init_thread.start()
 
 if __name__ == "__main__":
     # Test camera connection
@@ -6,21 +6,37 @@ This uses requests to get images directly from DroidCam's HTTP server.
 import os
 import time
 import subprocess
-import requests
+import threading
+
+import camera_http
+from mjpeg_stream import iter_response_frames
 
 # Settings
 droidcam_ip = "127.0.0.1"
 droidcam_port = "4747"
 droidcam_connected = False
+
+# Connecting restarts the adb server, so it only happens on first use, in the background
+connect_thread = None
+connect_lock = threading.Lock()
 last_frame = None
 last_frame_time = 0
 
+# Background MJPEG reader - one connection shared by all get_frame() calls
+frame_event = threading.Event()
+stream_thread = None
+stream_running = False
+stream_lock = threading.Lock()  # guards starting and ending the stream worker
+last_request_time = 0
+STREAM_IDLE_TIMEOUT = 10  # seconds without get_frame() before closing the stream
+FRAME_MAX_AGE = 2         # seconds before a cached frame is considered stale
+
 def is_droidcam_available():
     """Check if DroidCam is available."""
     try:
         # Try to access the DroidCam info page
         url = f"http://{droidcam_ip}:{droidcam_port}/favicon.ico"
-        response = requests.head(url, timeout=1)
+        response = camera_http.head(url, kind='status')
         return response.status_code == 200
     except:
         return False
@@ -73,54 +89,95 @@ def connect_droidcam(ip=None, port=None):
         droidcam_connected = False
         return False, "Could not connect to DroidCam. Make sure the app is running."
 
-def get_frame():
-    """Get the latest frame from DroidCam."""
-    global last_frame, last_frame_time
+def _stream_worker():
+    """Keep the latest frame from DroidCam's MJPEG stream."""
+    global last_frame, last_frame_time, stream_running
     
-    # Check if we need to refresh the frame (no more than once every 100ms)
-    current_time = time.time()
-    if current_time - last_frame_time < 0.1 and last_frame is not None:
-        return last_frame
+    if not droidcam_connected:
+        connect_droidcam()
     
+    url = f"http://{droidcam_ip}:{droidcam_port}/video"
     try:
-        # Get image directly from DroidCam's video endpoint
-        url = f"http://{droidcam_ip}:{droidcam_port}/video"
-        response = requests.get(url, stream=True, timeout=2)
-        
-        if response.status_code == 200:
-            # Store the frame and time
-            last_frame = response.content
-            last_frame_time = current_time
-            return last_frame
+        response = camera_http.get(url, kind='stream', stream=True)
+        try:
+            if response.status_code != 200:
+                print(f"DroidCam stream returned HTTP {response.status_code}")
+                return
+            
+            for frame in iter_response_frames(response):
+                last_frame = bytes(frame)
+                last_frame_time = time.time()
+                frame_event.set()
+                
+                # Close the stream once nobody is asking for frames
+                if time.time() - last_request_time > STREAM_IDLE_TIMEOUT:
+                    break
+        finally:
+            response.close()
     except Exception as e:
-        print(f"Error getting frame: {e}")
+        print(f"Error reading DroidCam stream: {e}")
+    finally:
+        with stream_lock:
+            stream_running = False
+
+def get_frame(timeout=2.0):
+    """Get the latest frame from DroidCam."""
+    global last_request_time, stream_thread, stream_running
     
-    return None
+    last_request_time = time.time()
+    
+    # Start the background reader on demand
+    with stream_lock:
+        if not stream_running:
+            stream_running = True
+            stream_thread = threading.Thread(target=_stream_worker)
+            stream_thread.daemon = True
+            stream_thread.start()
+    
+    # Wait for a fresh frame if the cached one is missing or stale
+    if last_frame is None or time.time() - last_frame_time > FRAME_MAX_AGE:
+        frame_event.clear()
+        if not frame_event.wait(timeout):
+            return None
+    
+    return last_frame
+
+def connect_in_background(ip=None, port=None):
+    """Run connect_droidcam() in a background thread unless one is already running."""
+    global connect_thread
+    
+    with connect_lock:
+        if connect_thread is not None and connect_thread.is_alive():
+            return
+        connect_thread = threading.Thread(target=connect_droidcam, args=(ip, port))
+        connect_thread.daemon = True
+        connect_thread.start()
 
 def get_still_image():
     """Get a still image from DroidCam."""
     try:
         # Try to get image directly from DroidCam's still image endpoint
         url = f"http://{droidcam_ip}:{droidcam_port}/photo.jpg"
-        response = requests.get(url, timeout=2)
+        response = camera_http.get(url, kind='snapshot')
         
         if response.status_code == 200:
             return response.content
         
         # If that fails, try the regular shot endpoint
         url = f"http://{droidcam_ip}:{droidcam_port}/shot.jpg"
-        response = requests.get(url, timeout=2)
+        response = camera_http.get(url, kind='snapshot')
         
         if response.status_code == 200:
             return response.content
     except Exception as e:
         print(f"Error getting still image: {e}")
     
+    # Not reachable yet - set up the connection for the next call
+    if not droidcam_connected:
+        connect_in_background()
+    
     return None
 
-# Initialize with USB connection
-connect_droidcam("127.0.0.1", "4747")
-
 # Test code
 if __name__ == "__main__":
     print("DroidCam Simple Connector Test")
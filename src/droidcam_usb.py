@@ -7,23 +7,29 @@ import time
 import subprocess
 import threading
 import cv2
-import requests
+
+import camera_http
+from frame_capture import PacedCapture
 
 # Global variables
-frame_lock = threading.Lock()
-latest_frame = None
+capture = PacedCapture()  # latest frame, pacing and JPEG cache
 capture_running = False
 capture_thread = None
+capture_lock = threading.Lock()  # guards starting the capture worker
 droidcam_ip = "127.0.0.1"
 droidcam_port = "4747"
 droidcam_connected = False
 
+# Connecting restarts the adb server, so it only happens on first use, in the background
+connect_thread = None
+connect_lock = threading.Lock()
+
 def is_droidcam_available():
     """Check if DroidCam is available."""
     try:
         # Try to access the DroidCam info page
         url = f"http://{droidcam_ip}:{droidcam_port}/favicon.ico"
-        response = requests.head(url, timeout=2)
+        response = camera_http.head(url, kind='status')
         return response.status_code == 200
     except:
         return False
@@ -78,27 +84,29 @@ def connect_droidcam(ip=None, port=None):
 
 def start_capture():
     """Start capturing frames from DroidCam."""
-    global capture_running, capture_thread, droidcam_connected
-    
-    if capture_running:
-        return True, "Capture already running"
-    
-    if not droidcam_connected:
-        success, message = connect_droidcam()
-        if not success:
-            return False, message
+    global capture_running, capture_thread
     
-    # Start the capture thread
-    capture_running = True
-    capture_thread = threading.Thread(target=_capture_worker)
-    capture_thread.daemon = True
-    capture_thread.start()
+    with capture_lock:
+        if capture_running:
+            return True, "Capture already running"
+        
+        # Start the capture thread - it connects first, which can take seconds with adb
+        capture_running = True
+        capture_thread = threading.Thread(target=_capture_worker)
+        capture_thread.daemon = True
+        capture_thread.start()
     
     return True, "Capture started successfully"
 
 def _capture_worker():
     """Background worker that captures frames from DroidCam."""
-    global latest_frame, capture_running
+    global capture_running
+    
+    if not droidcam_connected:
+        success, message = connect_droidcam()
+        if not success:
+            # The stream may already be forwarded, so try it anyway
+            print(f"DroidCam connection: {message}")
     
     try:
         # Open video capture from DroidCam
@@ -113,17 +121,8 @@ def _capture_worker():
         print(f"DroidCam stream opened successfully: {video_url}")
         
         # Capture frames until stopped
-        while capture_running:
-            ret, frame = cap.read()
-            if ret:
-                with frame_lock:
-                    latest_frame = frame
-            else:
-                print("Failed to read frame from DroidCam")
-                time.sleep(1)  # Wait before retrying
-            
-            # Small delay to prevent high CPU usage
-            time.sleep(0.03)  # ~30 fps
+        capture.run(cap, lambda: capture_running, retry_delay=1,
+                    failure_message="Failed to read frame from DroidCam")
         
         # Release resources
         cap.release()
@@ -141,47 +140,54 @@ def stop_capture():
         return True, "Capture not running"
     
     capture_running = False
+    capture.wake()  # wake an idle worker so it exits promptly
     if capture_thread:
         capture_thread.join(timeout=1.0)
     
     return True, "Capture stopped successfully"
 
-def get_frame():
+def get_frame_and_sequence(if_newer_than=None):
+    """Get the latest frame as JPEG bytes together with its sequence number.
+    
+    Args:
+        if_newer_than: Sequence number the caller already has; returns
+            (None, sequence) if no newer frame has been captured
+    """
+    return capture.get_frame_and_sequence(if_newer_than)
+
+def get_frame(if_newer_than=None):
     """Get the latest captured frame as JPEG bytes."""
-    global latest_frame
+    frame, _ = get_frame_and_sequence(if_newer_than)
+    return frame
+
+def connect_in_background(ip=None, port=None):
+    """Run connect_droidcam() in a background thread unless one is already running."""
+    global connect_thread
     
-    with frame_lock:
-        if latest_frame is None:
-            return None
-        
-        try:
-            # Convert frame to JPEG
-            ret, jpeg = cv2.imencode('.jpg', latest_frame)
-            if ret:
-                return jpeg.tobytes()
-        except Exception as e:
-            print(f"Error encoding frame: {e}")
-    
-    return None
+    with connect_lock:
+        if connect_thread is not None and connect_thread.is_alive():
+            return
+        connect_thread = threading.Thread(target=connect_droidcam, args=(ip, port))
+        connect_thread.daemon = True
+        connect_thread.start()
 
 def get_still_image():
     """Get a still image from DroidCam."""
     if not droidcam_connected:
-        success, message = connect_droidcam()
-        if not success:
-            return None
+        # Don't block the caller on adb; the stream may already be forwarded
+        connect_in_background()
     
     try:
         # Try to get image directly from DroidCam's still image endpoint
         url = f"http://{droidcam_ip}:{droidcam_port}/photo.jpg"
-        response = requests.get(url, timeout=5)
+        response = camera_http.get(url, kind='photo')
         
         if response.status_code == 200:
             return response.content
         
         # If that fails, try the regular video endpoint
         url = f"http://{droidcam_ip}:{droidcam_port}/shot.jpg"
-        response = requests.get(url, timeout=5)
+        response = camera_http.get(url, kind='photo')
         
         if response.status_code == 200:
             return response.content
@@ -191,9 +197,6 @@ def get_still_image():
     # If direct methods fail, use the captured frame
     return get_frame()
 
-# Initialize with USB connection
-connect_droidcam("127.0.0.1", "4747")
-
 # Test code
 if __name__ == "__main__":
     print("DroidCam USB Connector Test")
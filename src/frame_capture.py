@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Demand-paced frame capture shared by the OpenCV camera backends.
+A capture worker grabs frames at the target rate only while someone is
+asking for them, and each captured frame is encoded to JPEG at most once,
+no matter how many viewers request it.
+"""
+import time
+import threading
+import cv2
+
+# Capture pacing
+TARGET_FPS = 30        # frames decoded per second while someone is watching
+IDLE_INTERVAL = 0.5    # seconds between grabs while nobody is watching
+DEMAND_TIMEOUT = 5.0   # seconds after the last request before capture idles
+FLUSH_FRAMES = 4       # frames buffered while idle, dropped when a viewer returns
+
+
+class PacedCapture:
+    """Latest captured frame, paced by demand, with an encode-once JPEG cache."""
+    def __init__(self, target_fps=TARGET_FPS, idle_interval=IDLE_INTERVAL,
+                 demand_timeout=DEMAND_TIMEOUT, flush_frames=FLUSH_FRAMES):
+        self.target_fps = target_fps
+        self.idle_interval = idle_interval
+        self.demand_timeout = demand_timeout
+        self.flush_frames = flush_frames
+
+        self.frame_lock = threading.Lock()
+        self.latest_frame = None
+        self.frame_sequence = 0  # incremented for every captured frame
+
+        # JPEG of the frame with encoded_sequence, shared by all viewers
+        self.encode_lock = threading.Lock()
+        self.encoded_frame = None
+        self.encoded_sequence = 0
+
+        self.last_demand_time = 0
+        self.demand_event = threading.Event()
+
+    def wake(self):
+        """Wake an idle capture loop (e.g. so it notices it should stop)."""
+        self.demand_event.set()
+
+    def run(self, cap, is_running, retry_delay=0.1, failure_message=None):
+        """Capture from an opened cv2.VideoCapture until is_running() returns False.
+
+        Args:
+            cap: Opened video capture
+            is_running: Callable checked before every frame
+            retry_delay: Seconds to wait after a failed grab
+            failure_message: Printed after a failed grab, if given
+        """
+        frame_interval = 1.0 / self.target_fps
+        next_frame_time = time.monotonic()
+        idle = True
+
+        while is_running():
+            self.demand_event.clear()
+            if time.time() - self.last_demand_time > self.demand_timeout:
+                # Nobody is watching: keep the stream open but drain it slowly
+                if self.latest_frame is not None:
+                    # It will be stale by the time anyone asks; wait for a fresh one instead
+                    with self.frame_lock:
+                        self.latest_frame = None
+                idle = True
+                cap.grab()
+                self.demand_event.wait(self.idle_interval)
+                continue
+
+            if idle:
+                # Drop frames queued while idle so the first one shown is current
+                for _ in range(self.flush_frames):
+                    cap.grab()
+                idle = False
+                next_frame_time = time.monotonic()
+
+            # grab() blocks until the camera delivers a frame, so it paces the loop
+            if not cap.grab():
+                if failure_message:
+                    print(failure_message)
+                time.sleep(retry_delay)
+                continue
+
+            now = time.monotonic()
+            if now + frame_interval / 2 < next_frame_time:
+                continue  # ahead of schedule - discard without decoding
+
+            ret, frame = cap.retrieve()
+            if ret:
+                with self.frame_lock:
+                    self.latest_frame = frame
+                    self.frame_sequence += 1
+
+            next_frame_time += frame_interval
+            if next_frame_time < now:
+                next_frame_time = now  # fell behind; don't try to catch up in a burst
+
+    def get_frame_and_sequence(self, if_newer_than=None):
+        """Get the latest frame as JPEG bytes together with its sequence number.
+
+        Each captured frame is encoded at most once, outside frame_lock, and the
+        bytes are shared by every caller.
+
+        Args:
+            if_newer_than: Sequence number the caller already has; returns
+                (None, sequence) if no newer frame has been captured
+        """
+        # Any request keeps the capture loop at full rate
+        self.last_demand_time = time.time()
+        self.demand_event.set()
+
+        with self.frame_lock:
+            frame = self.latest_frame
+            sequence = self.frame_sequence
+
+        if frame is None or (if_newer_than is not None and sequence <= if_newer_than):
+            return None, sequence
+
+        with self.encode_lock:
+            if self.encoded_sequence != sequence:
+                try:
+                    # Convert to JPEG
+                    ret, jpeg = cv2.imencode('.jpg', frame)
+                    if not ret:
+                        return None, sequence
+                    self.encoded_frame = jpeg.tobytes()
+                    self.encoded_sequence = sequence
+                except Exception as e:
+                    print(f"Error encoding frame: {e}")
+                    return None, sequence
+            return self.encoded_frame, self.encoded_sequence
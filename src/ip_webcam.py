@@ -2,13 +2,14 @@
 """
 IP Webcam connector - Simple module to connect to the IP Webcam Android app.
 """
-import requests
 import time
 
+import camera_http
+from mjpeg_stream import iter_response_frames
+
 # Default settings - you'll update this with your phone's IP
 WEBCAM_IP = "192.168.1.100"  # Replace with your phone's IP
 WEBCAM_PORT = "8080"         # Default port for IP Webcam
-TIMEOUT = 3                  # Connection timeout in seconds
 
 def get_url(endpoint=""):
     """Get full URL for a specific endpoint."""
@@ -17,7 +18,7 @@ def get_url(endpoint=""):
 def is_connected():
     """Check if the IP Webcam is available."""
     try:
-        response = requests.head(get_url(), timeout=TIMEOUT)
+        response = camera_http.head(get_url(), kind='status')
         return response.status_code == 200
     except:
         return False
@@ -42,12 +43,9 @@ def connect(ip=None, port=None):
 
 def get_frame():
     """Get a single video frame from IP Webcam."""
-    if not is_connected():
-        return None
-    
     try:
-        # Try the video feed endpoint
-        response = requests.get(get_url("shot.jpg"), timeout=TIMEOUT)
+        # One request on a pooled connection - a failure here is the connectivity check
+        response = camera_http.get(get_url("shot.jpg"), kind='snapshot')
         
         if response.status_code == 200:
             return response.content
@@ -56,14 +54,27 @@ def get_frame():
     
     return None
 
+def stream_frames():
+    """Yield video frames from the IP Webcam MJPEG feed over one connection.
+    
+    Frames are memoryviews into a reused buffer; copy with bytes() to keep one.
+    """
+    response = camera_http.get(get_url("video"), kind='stream', stream=True)
+    try:
+        if response.status_code != 200:
+            return
+        yield from iter_response_frames(response)
+    finally:
+        response.close()
+
 def take_snapshot():
     """Take a high-quality snapshot."""
-    if not is_connected():
+    if camera_http.is_healthy(get_url()) is False:
         return None
     
     try:
         # Use higher quality photo endpoint
-        response = requests.get(get_url("photo.jpg"), timeout=TIMEOUT*2)
+        response = camera_http.get(get_url("photo.jpg"), kind='photo')
         
         if response.status_code == 200:
             return response.content
@@ -75,34 +86,25 @@ def take_snapshot():
 
 def control_flashlight(enabled=True):
     """Control the phone's flashlight."""
-    if not is_connected():
-        return False
-    
     try:
         endpoint = "enabletorch" if enabled else "disabletorch"
-        response = requests.get(get_url(endpoint), timeout=TIMEOUT)
+        response = camera_http.get(get_url(endpoint), kind='control')
         return response.status_code == 200
     except:
         return False
 
 def control_focus():
     """Trigger camera focus."""
-    if not is_connected():
-        return False
-    
     try:
-        response = requests.get(get_url("focus"), timeout=TIMEOUT)
+        response = camera_http.get(get_url("focus"), kind='control')
         return response.status_code == 200
     except:
         return False
 
 def get_camera_info():
     """Get information about the camera."""
-    if not is_connected():
-        return None
-    
     try:
-        response = requests.get(get_url("status.json"), timeout=TIMEOUT)
+        response = camera_http.get(get_url("status.json"), kind='status')
         if response.status_code == 200:
             return response.json()
     except:
@@ -99,11 +99,17 @@ def main():
     web_settings = settings.get('web_interface', {})
     web_port = web_settings.get('port', 5001)  # Changed default from 5000 to 5001
     web_debug = web_settings.get('debug', False)
+    web_server_mode = web_settings.get('server', 'production')
+    web_threads = web_settings.get('threads', 32)
+    web_keepalive = web_settings.get('keepalive_timeout', 5)
     
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Wheelchair Control System')
     parser.add_argument('--port', type=int, default=web_port, help='Web server port')
     parser.add_argument('--debug', action='store_true', default=web_debug, help='Enable debug mode')
+    parser.add_argument('--server', choices=['production', 'development'], default=web_server_mode,
+                        help='Web server mode (production uses a fixed thread pool)')
+    parser.add_argument('--threads', type=int, default=web_threads, help='Web server worker threads')
     parser.add_argument('--no-motor', action='store_true', help='Disable motor control')
     parser.add_argument('--no-sensor', action='store_true', help='Disable sensors')
     parser.add_argument('--no-web', action='store_true', help='Disable web interface')
@@ -196,6 +202,18 @@ def main():
                 if gps_started:
                     logger.info("GPS monitoring started")
                     gps_initialized = True
+                    
+                    # Smooth position between fixes using commanded wheel motion
+                    if settings.get('gps_fusion', {}).get('enabled', True):
+                        from sensors import gps_fusion
+                        if gps_fusion.start_fusion():
+                            logger.info("GPS fusion started")
+                    
+                    # Check every fix against configured zones
+                    if settings.get('geofence', {}).get('enabled', True):
+                        from navigation import geofence
+                        if geofence.start_geofencing():
+                            logger.info("Geofencing started")
                 else:
                     logger.warning("Failed to start GPS monitoring")
             except Exception as e:
@@ -222,6 +240,7 @@ def main():
             try:
                 # Import the web app
                 from web.app import app
+                from web.server import create_server
                 
                 # Pass the initialized components to the web app
                 app.config['MOTOR_CONTROL_AVAILABLE'] = MOTOR_CONTROL_AVAILABLE
@@ -232,9 +251,16 @@ def main():
                 
                 # Start the web server in a thread with error handling
                 def start_web_server(app, port, debug):
+                    # Hardware lives in this process, so never use the reloader
+                    app.debug = debug
+                    server_options = {
+                        'mode': args.server,
+                        'threads': args.threads,
+                        'keepalive_timeout': web_keepalive
+                    }
                     try:
                         # Try to start the server
-                        app.run(host='0.0.0.0', port=port, debug=debug, use_reloader=False)
+                        server = create_server(app, '0.0.0.0', port, **server_options)
                     except OSError as e:
                         if "Address already in use" in str(e):
                             logger.error(f"Port {port} is already in use. Try a different port.")
@@ -242,13 +268,19 @@ def main():
                             try:
                                 new_port = port + 1
                                 logger.info(f"Attempting to bind to alternate port {new_port}")
-                                app.run(host='0.0.0.0', port=new_port, debug=debug, use_reloader=False)
+                                server = create_server(app, '0.0.0.0', new_port, **server_options)
                             except Exception as retry_e:
                                 logger.error(f"Failed to bind to alternate port: {retry_e}")
+                                return
                         else:
                             logger.error(f"Web server error: {e}")
+                            return
                     except Exception as e:
                         logger.error(f"Failed to start web interface: {e}")
+                        return
+                    
+                    logger.info(f"Web server running in {args.server} mode with {args.threads} threads")
+                    server.serve_forever()
                 
                 web_thread = threading.Thread(target=start_web_server, args=(app, args.port, args.debug))
                 web_thread.daemon = True
@@ -344,6 +376,20 @@ def main():
             except Exception as e:
                 print(f"Error cleaning up sensors: {e}")
         
+        if 'navigation.geofence' in sys.modules:
+            try:
+                from navigation import geofence
+                geofence.stop_geofencing()
+            except Exception as e:
+                print(f"Error stopping geofencing: {e}")
+        
+        if 'sensors.gps_fusion' in sys.modules:
+            try:
+                from sensors import gps_fusion
+                gps_fusion.stop_fusion()
+            except Exception as e:
+                print(f"Error stopping GPS fusion: {e}")
+        
         if 'gps_module' in sys.modules:
             try:
                 from sensors import gps_module
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Incremental MJPEG demuxer shared by the camera modules.
+
+Reads a multipart/x-mixed-replace stream into one reusable buffer and
+yields each JPEG frame as a memoryview into that buffer, so frames are
+located without copying. A yielded view is only valid until more data is
+fed in; callers that keep a frame must copy it with bytes(frame).
+"""
+
+SOI = b'\xff\xd8'  # JPEG start of image
+EOI = b'\xff\xd9'  # JPEG end of image
+
+
+def boundary_from_content_type(content_type):
+    """Get the multipart boundary from a Content-Type header, or None."""
+    if not content_type or 'boundary=' not in content_type:
+        return None
+    boundary = content_type.split('boundary=', 1)[1].split(';')[0].strip().strip('"')
+    return boundary.encode('ascii', errors='ignore') or None
+
+
+class MJPEGDemuxer:
+    """Split an MJPEG byte stream into frames.
+
+    With a boundary, parts are located by the boundary marker and their
+    Content-Length header when present. Without one, frames are found by
+    scanning for the JPEG SOI/EOI markers.
+    """
+    def __init__(self, boundary=None, buffer_size=512 * 1024, max_frame_size=8 * 1024 * 1024):
+        if isinstance(boundary, str):
+            boundary = boundary.encode('ascii')
+        # Some servers put the leading dashes in the header value, some don't
+        self.marker = b'--' + boundary.lstrip(b'-') if boundary else None
+        self.max_frame_size = max_frame_size
+        self.buffer = bytearray(buffer_size)
+        self.start = 0  # first unconsumed byte
+        self.end = 0    # end of valid data
+
+    def _reserve(self, size):
+        """Make room for size more bytes after the valid data."""
+        if len(self.buffer) - self.end >= size:
+            return
+
+        pending = self.end - self.start
+        if pending + size > self.max_frame_size:
+            # Never found a frame end - drop the data rather than grow forever
+            self.start = self.end = 0
+            pending = 0
+
+        if len(self.buffer) - pending >= size:
+            # Compact in place; same-length slice assignment keeps the buffer
+            self.buffer[0:pending] = self.buffer[self.start:self.end]
+        else:
+            new_buffer = bytearray(max(len(self.buffer) * 2, pending + size))
+            new_buffer[0:pending] = self.buffer[self.start:self.end]
+            self.buffer = new_buffer
+        self.start = 0
+        self.end = pending
+
+    def feed(self, data):
+        """Append a chunk of stream data."""
+        size = len(data)
+        self._reserve(size)
+        self.buffer[self.end:self.end + size] = data
+        self.end += size
+
+    def readinto(self, stream, size=32768):
+        """Read up to size bytes from a file-like stream straight into the buffer.
+
+        Returns:
+            int: Number of bytes read (0 at end of stream)
+        """
+        self._reserve(size)
+        view = memoryview(self.buffer)[self.end:self.end + size]
+        try:
+            count = stream.readinto(view) or 0
+        finally:
+            view.release()
+        self.end += count
+        return count
+
+    def _content_length(self, header_start, header_end):
+        """Get the Content-Length of a part from its headers, or None."""
+        headers = bytes(self.buffer[header_start:header_end]).lower()
+        index = headers.find(b'content-length:')
+        if index < 0:
+            return None
+        value = headers[index + 15:].split(b'\r\n', 1)[0].strip()
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+    def _next_part(self):
+        """Locate the next complete multipart part."""
+        buffer = self.buffer
+        marker = self.marker
+
+        index = buffer.find(marker, self.start, self.end)
+        if index < 0:
+            # Keep only a tail that could be the start of a split marker
+            self.start = max(self.start, self.end - len(marker) + 1)
+            return None
+        self.start = index
+
+        header_end = buffer.find(b'\r\n\r\n', index, self.end)
+        if header_end < 0:
+            return None
+        body = header_end + 4
+
+        length = self._content_length(index, header_end)
+        if length is not None:
+            if body + length > self.end:
+                return None
+            frame_end = body + length
+            self.start = frame_end
+        else:
+            next_marker = buffer.find(marker, body, self.end)
+            if next_marker < 0:
+                return None
+            # JPEG data ends in FFD9, so trailing CR/LF/dashes belong to the delimiter
+            frame_end = next_marker
+            while frame_end > body and buffer[frame_end - 1] in (10, 13, 45):
+                frame_end -= 1
+            self.start = next_marker
+
+        return memoryview(buffer)[body:frame_end]
+
+    def _next_jpeg(self):
+        """Locate the next complete JPEG by its SOI/EOI markers."""
+        buffer = self.buffer
+
+        index = buffer.find(SOI, self.start, self.end)
+        if index < 0:
+            self.start = max(self.start, self.end - 1)
+            return None
+        self.start = index
+
+        eoi = buffer.find(EOI, index + 2, self.end)
+        if eoi < 0:
+            return None
+        self.start = eoi + 2
+        return memoryview(buffer)[index:eoi + 2]
+
+    def frames(self):
+        """Yield every complete frame currently buffered."""
+        next_frame = self._next_part if self.marker else self._next_jpeg
+        while True:
+            frame = next_frame()
+            if frame is None:
+                return
+            if len(frame):
+                yield frame
+
+
+def iter_response_frames(response, chunk_size=32768):
+    """Yield frames from a streaming requests response to an MJPEG URL.
+
+    Data is read from the raw socket stream directly into the demuxer
+    buffer. Frames are memoryviews valid until the next frame is requested.
+    """
+    demuxer = MJPEGDemuxer(boundary_from_content_type(response.headers.get('Content-Type')))
+    raw = response.raw
+
+    if hasattr(raw, 'readinto'):
+        while demuxer.readinto(raw, chunk_size):
+            yield from demuxer.frames()
+    else:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            demuxer.feed(chunk)
+            yield from demuxer.frames()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Cheap change detection for camera frames.
+Each JPEG is decoded at 1/8 scale in grayscale and reduced to a small grid;
+the motion score is the fraction of grid cells that differ noticeably from
+the last frame that was reported as changed.
+"""
+import os
+import json
+import time
+
+try:
+    import cv2
+    import numpy as np
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# Default settings
+ENABLED = True
+GRID_SIZE = (32, 24)     # cells compared per frame (width, height)
+PIXEL_THRESHOLD = 15     # grey level difference for a cell to count as changed
+MOTION_THRESHOLD = 0.01  # fraction of changed cells for a frame to count as new
+KEEPALIVE = 2.0          # seconds after which an unchanged frame is passed on anyway
+
+# Try to load settings
+try:
+    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'settings.json')
+    if os.path.exists(config_path):
+        with open(config_path, 'r') as f:
+            settings = json.load(f)
+
+        motion_settings = settings.get('camera', {}).get('motion', {})
+        ENABLED = motion_settings.get('enabled', ENABLED)
+        PIXEL_THRESHOLD = motion_settings.get('pixel_threshold', PIXEL_THRESHOLD)
+        MOTION_THRESHOLD = motion_settings.get('threshold', MOTION_THRESHOLD)
+        KEEPALIVE = motion_settings.get('keepalive', KEEPALIVE)
+except Exception as e:
+    print(f"Error loading motion detection settings: {e}")
+
+
+class ChangeDetector:
+    """Decide whether a JPEG frame differs from the last changed frame.
+
+    The reference grid only moves when a frame counts as changed, so slow
+    drift still adds up to a change instead of being lost frame by frame.
+    """
+    def __init__(self, threshold=MOTION_THRESHOLD, pixel_threshold=PIXEL_THRESHOLD,
+                 keepalive=KEEPALIVE, grid_size=GRID_SIZE):
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.keepalive = keepalive
+        self.grid_size = grid_size
+        self.reference = None
+        self.reference_time = 0
+        self.score = None
+        self.last_motion_time = None
+
+    def _grid(self, jpeg):
+        """Decode a JPEG into the comparison grid, or None."""
+        data = np.frombuffer(jpeg, dtype=np.uint8)
+        gray = cv2.imdecode(data, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+        if gray is None:
+            return None
+        return cv2.resize(gray, self.grid_size, interpolation=cv2.INTER_AREA)
+
+    def check(self, jpeg, now=None):
+        """Score a frame against the reference.
+
+        Returns:
+            tuple: (is_new, score). is_new is True for changed frames and for
+            one unchanged frame every ``keepalive`` seconds; score is None if
+            the frame could not be scored
+        """
+        now = now or time.time()
+        if not CV2_AVAILABLE:
+            return True, None
+
+        try:
+            grid = self._grid(jpeg)
+        except Exception as e:
+            print(f"Error scoring frame: {e}")
+            grid = None
+        if grid is None:
+            return True, None
+
+        if self.reference is None or self.reference.shape != grid.shape:
+            score = 1.0
+        else:
+            diff = cv2.absdiff(grid, self.reference)
+            score = float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+        self.score = score
+
+        changed = score >= self.threshold
+        if changed:
+            self.last_motion_time = now
+        if changed or now - self.reference_time >= self.keepalive:
+            self.reference = grid
+            self.reference_time = now
+            return True, score
+        return False, score
+
+    def get_status(self):
+        return {
+            'score': self.score,
+            'threshold': self.threshold,
+            'last_motion_time': self.last_motion_time
+        }
@@ -46,6 +46,23 @@ motor_pwm = {
 motors_initialized = False
 motor_lock = threading.Lock()
 
+# Last commanded speed per motor (-100 to 100), used for dead reckoning
+motor_speeds = {
+    1: 0,
+    2: 0,
+    3: 0,
+    4: 0
+}
+last_command_time = None
+
+# Dynamic speed cap (0-100) applied on top of MAX_SPEED, e.g. by geofences
+speed_limit = MAX_SPEED
+
+# Emergency stop latch - while set, set_motor_speed() only ever writes 0.
+# Cleared only by clear_emergency_stop() (an explicit start by the user).
+estopped = False
+estop_lock = threading.Lock()
+
 # Initialize with timeout
 def initialize_motors(timeout=2.0):
     """Initialize the GPIO pins for motor control with timeout."""
@@ -138,7 +155,7 @@ def initialize_motors(timeout=2.0):
 
 def set_motor_speed(motor_num, speed):
     """Set the speed of a specific motor (-100 to 100)."""
-    global motors_initialized, motor_pwm
+    global motors_initialized, motor_pwm, last_command_time
     
     if not motors_initialized:
         print(f"Motors not initialized. Cannot set motor {motor_num} speed.")
@@ -149,11 +166,12 @@ def set_motor_speed(motor_num, speed):
         print(f"Motor {motor_num} not available")
         return False
     
-    # Clamp speed to valid range
-    speed = max(-MAX_SPEED, min(MAX_SPEED, speed))
+    # Clamp speed to valid range and any active speed limit
+    limit = min(MAX_SPEED, speed_limit)
+    speed = max(-limit, min(limit, speed))
     
     # For optimal performance at full speed, use exactly 100% when speed is close to max
-    if abs(speed) > 95:
+    if abs(speed) > 95 and limit >= 100:
         speed = 100 if speed > 0 else -100
     
     try:
@@ -164,28 +182,47 @@ def set_motor_speed(motor_num, speed):
         
         print(f"Motor {motor_num} - Setting speed {speed} on pins: PWM={pwm_pin}, IN1={in1_pin}, IN2={in2_pin}")
         
-        # Set direction based on speed
+        # The latch check and the pin writes happen under one lock, so a
+        # command that raced an emergency stop cannot restart the wheels
+        with estop_lock:
+            refused = estopped and speed != 0
+            if refused:
+                speed = 0
+            
+            # Set direction based on speed
+            if speed > 0:
+                # Forward
+                GPIO.output(in1_pin, True)
+                GPIO.output(in2_pin, False)
+            elif speed < 0:
+                # Backward
+                GPIO.output(in1_pin, False)
+                GPIO.output(in2_pin, True)
+            else:
+                # Stop
+                GPIO.output(in1_pin, False)
+                GPIO.output(in2_pin, False)
+            
+            # Set PWM duty cycle (convert from -100-100 to 0-100)
+            duty_cycle = abs(speed)
+            motor_pwm[motor_num].ChangeDutyCycle(duty_cycle)
+            
+            # Remember what was commanded so other modules can estimate motion
+            motor_speeds[motor_num] = speed
+            last_command_time = time.time()
+        
+        # Logged after the lock is released so console output never delays an emergency stop
         if speed > 0:
-            # Forward
             print(f"Motor {motor_num} - Forward: IN1=HIGH, IN2=LOW")
-            GPIO.output(in1_pin, True)
-            GPIO.output(in2_pin, False)
         elif speed < 0:
-            # Backward
             print(f"Motor {motor_num} - Backward: IN1=LOW, IN2=HIGH")
-            GPIO.output(in1_pin, False)
-            GPIO.output(in2_pin, True)
         else:
-            # Stop
             print(f"Motor {motor_num} - Stop: IN1=LOW, IN2=LOW")
-            GPIO.output(in1_pin, False)
-            GPIO.output(in2_pin, False)
-        
-        # Set PWM duty cycle (convert from -100-100 to 0-100)
-        duty_cycle = abs(speed)
         print(f"Motor {motor_num} - Setting PWM duty cycle to {duty_cycle}%")
-        motor_pwm[motor_num].ChangeDutyCycle(duty_cycle)
         
+        if refused:
+            print(f"Motor {motor_num} - Emergency stop active, command refused")
+            return False
         return True
     except Exception as e:
         print(f"Error setting motor {motor_num} speed: {e}")
@@ -270,11 +307,54 @@ def stop():
     result = True
     for motor_num in range(1, 5):
         if motor_pwm[motor_num] is not None:
-            result = result and set_motor_speed(motor_num, 0)
+            # Every motor gets the stop, even after one write fails
+            ok = set_motor_speed(motor_num, 0)
+            result = result and ok
     
     print("Motors stopped")
     return result
 
+def emergency_stop():
+    """Cut power to every motor immediately and latch the stop.
+    
+    Unlike stop(), this never initializes the motors, does no logging and
+    only waits for a pin write already in progress (estop_lock). Until
+    clear_emergency_stop() is called, set_motor_speed() refuses to drive.
+    Motors that were never initialized are not moving and are skipped.
+    """
+    global estopped, last_command_time
+    
+    result = True
+    with estop_lock:
+        estopped = True
+        for motor_num, pwm in list(motor_pwm.items()):
+            if pwm is None:
+                continue
+            try:
+                # Duty cycle first - that alone removes drive power
+                pwm.ChangeDutyCycle(0)
+                GPIO.output(MOTOR_PINS[f'motor{motor_num}_in1'], False)
+                GPIO.output(MOTOR_PINS[f'motor{motor_num}_in2'], False)
+            except Exception:
+                result = False
+            motor_speeds[motor_num] = 0
+        last_command_time = time.time()
+    return result
+
+def clear_emergency_stop():
+    """Release the emergency stop latch (an explicit start by the user)."""
+    global estopped
+    
+    with estop_lock:
+        was_stopped = estopped
+        estopped = False
+    if was_stopped:
+        print("Emergency stop released")
+    return was_stopped
+
+def is_emergency_stopped():
+    return estopped
+
 def cleanup_motors(reset_gpio=False):
     """Clean up GPIO resources."""
     global motors_initialized, motor_pwm
@@ -339,8 +419,58 @@ def cleanup_motors(reset_gpio=False):
     finally:
         # Ensure motor_pwm is reset even if an error occurs
         motor_pwm = {1: None, 2: None, 3: None, 4: None}
+        for motor_num in motor_speeds:
+            motor_speeds[motor_num] = 0
         motors_initialized = False
 
+def set_speed_limit(limit=None):
+    """Cap motor speed (0-100) until changed; None removes the cap.
+    
+    Motors that are already running above the new limit are slowed down.
+    """
+    global speed_limit
+    
+    new_limit = MAX_SPEED if limit is None else max(0, min(MAX_SPEED, limit))
+    if new_limit == speed_limit:
+        return True
+    
+    speed_limit = new_limit
+    print(f"Motor speed limit set to {speed_limit}")
+    
+    result = True
+    if motors_initialized:
+        for motor_num in range(1, 5):
+            if motor_pwm[motor_num] is not None and abs(motor_speeds[motor_num]) > speed_limit:
+                # Every motor gets the clamp, even after one write fails
+                ok = set_motor_speed(motor_num, motor_speeds[motor_num])
+                result = result and ok
+    return result
+
+def get_speed_limit():
+    """Get the active motor speed cap (0-100)."""
+    return speed_limit
+
+def get_commanded_motion():
+    """Get the last commanded left/right speeds (-100 to 100).
+    
+    Returns:
+        dict: left, right and the time of the last motor command
+    """
+    if MOTOR_CONFIG['type'] == 'paired':
+        left_motors = [m for m in MOTOR_CONFIG['left_motors'] if motor_pwm.get(m) is not None]
+        right_motors = [m for m in MOTOR_CONFIG['right_motors'] if motor_pwm.get(m) is not None]
+    else:
+        left_motors = right_motors = [m for m in range(1, 5) if motor_pwm.get(m) is not None]
+    
+    left = sum(motor_speeds[m] for m in left_motors) / len(left_motors) if left_motors else 0
+    right = sum(motor_speeds[m] for m in right_motors) / len(right_motors) if right_motors else 0
+    
+    return {
+        'left': left,
+        'right': right,
+        'last_command_time': last_command_time
+    }
+
 # Ensure GPIO is cleaned up on normal exit
 import atexit
 atexit.register(cleanup_motors)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Geofence module for Smart Wheelchair system.
+Checks each GPS fix against configured zones, publishes enter/exit events
+and caps motor speed while the wheelchair is inside a restricted zone.
+"""
+import os
+import sys
+import time
+import math
+import threading
+import json
+from collections import deque
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Default settings
+GRID_SIZE = 0.001  # degrees per index cell (~100 m)
+FENCES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                           'config', 'geofences.json')
+
+# Try to load settings
+try:
+    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                              'config', 'settings.json')
+    if os.path.exists(config_path):
+        with open(config_path, 'r') as f:
+            settings = json.load(f)
+
+        geofence_settings = settings.get('geofence', {})
+        GRID_SIZE = geofence_settings.get('grid_size', GRID_SIZE)
+        if geofence_settings.get('fences_file'):
+            FENCES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                       geofence_settings['fences_file'])
+except Exception as e:
+    print(f"Error loading geofence settings: {e}")
+
+
+class Geofence:
+    """A named polygon zone with an optional speed limit."""
+    __slots__ = ('name', 'polygon', 'speed_limit', 'alert', 'min_lat', 'min_lon', 'max_lat', 'max_lon')
+
+    def __init__(self, name, polygon, speed_limit=None, alert=True):
+        if len(polygon) < 3:
+            raise ValueError(f"Geofence {name} needs at least 3 points")
+
+        self.name = name
+        self.polygon = [(float(lat), float(lon)) for lat, lon in polygon]
+        self.speed_limit = speed_limit
+        self.alert = alert
+
+        lats = [lat for lat, _ in self.polygon]
+        lons = [lon for _, lon in self.polygon]
+        self.min_lat, self.max_lat = min(lats), max(lats)
+        self.min_lon, self.max_lon = min(lons), max(lons)
+
+    def contains(self, latitude, longitude):
+        """Check whether a point is inside the fence (bounding box, then ray casting)."""
+        if not (self.min_lat <= latitude <= self.max_lat and self.min_lon <= longitude <= self.max_lon):
+            return False
+
+        inside = False
+        polygon = self.polygon
+        j = len(polygon) - 1
+        for i in range(len(polygon)):
+            lat_i, lon_i = polygon[i]
+            lat_j, lon_j = polygon[j]
+            if (lat_i > latitude) != (lat_j > latitude):
+                crossing = lon_i + (latitude - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+                if longitude < crossing:
+                    inside = not inside
+            j = i
+        return inside
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'polygon': [list(point) for point in self.polygon],
+            'speed_limit': self.speed_limit,
+            'alert': self.alert
+        }
+
+
+class GeofenceEngine:
+    """Incremental point-in-polygon evaluation over a grid index.
+
+    Each fence is registered in every grid cell its bounding box touches, so
+    a fix only tests the fences listed in its own cell.
+    """
+    def __init__(self, fences=None, grid_size=GRID_SIZE):
+        self.grid_size = grid_size
+        self.fences = []
+        self.grid = {}
+        self.inside = set()     # names of fences currently containing the position
+        self.last_cell = None
+        self.candidates = []
+        for fence in fences or []:
+            self.add_fence(fence)
+
+    def _cell(self, latitude, longitude):
+        return (math.floor(latitude / self.grid_size), math.floor(longitude / self.grid_size))
+
+    def add_fence(self, fence):
+        """Add a fence to the index."""
+        self.fences.append(fence)
+        min_row, min_col = self._cell(fence.min_lat, fence.min_lon)
+        max_row, max_col = self._cell(fence.max_lat, fence.max_lon)
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                self.grid.setdefault((row, col), []).append(fence)
+        self.last_cell = None
+
+    def update(self, latitude, longitude):
+        """Evaluate a new position.
+
+        Returns:
+            list: (event, fence) tuples where event is 'enter' or 'exit'
+        """
+        cell = self._cell(latitude, longitude)
+        if cell != self.last_cell:
+            self.last_cell = cell
+            self.candidates = self.grid.get(cell, [])
+
+        now_inside = set()
+        events = []
+        for fence in self.candidates:
+            if fence.contains(latitude, longitude):
+                now_inside.add(fence.name)
+                if fence.name not in self.inside:
+                    events.append(('enter', fence))
+
+        # Fences outside this cell cannot contain the point, so anything left is an exit
+        if self.inside - now_inside:
+            for fence in self.fences:
+                if fence.name in self.inside and fence.name not in now_inside:
+                    events.append(('exit', fence))
+
+        self.inside = now_inside
+        return events
+
+    def active_speed_limit(self):
+        """Get the lowest speed limit of the fences currently containing the position."""
+        limits = [fence.speed_limit for fence in self.fences
+                  if fence.name in self.inside and fence.speed_limit is not None]
+        return min(limits) if limits else None
+
+
+# Module state
+engine = None
+geofence_lock = threading.Lock()
+is_running = False
+recent_events = deque(maxlen=50)
+event_seq = 0  # increases by one per event; clients track it instead of comparing clocks
+event_listeners = []
+geofence_status = {
+    'inside': [],
+    'speed_limit': None,
+    'last_check': None
+}
+
+
+def load_fences(path=None):
+    """Load fences from the geofence JSON file."""
+    path = path or FENCES_FILE
+    if not os.path.exists(path):
+        print(f"Geofence file not found at {path}")
+        return []
+
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    fences = []
+    for entry in data.get('fences', []):
+        try:
+            fences.append(Geofence(entry['name'], entry['polygon'],
+                                   entry.get('speed_limit'), entry.get('alert', True)))
+        except (KeyError, ValueError) as e:
+            print(f"Skipping invalid geofence: {e}")
+    return fences
+
+
+def add_event_listener(callback):
+    """Register a callback(event_dict) for geofence enter/exit events."""
+    if callback not in event_listeners:
+        event_listeners.append(callback)
+
+
+def _apply_speed_limit(limit):
+    """Pass the geofence speed limit on to the motor layer."""
+    try:
+        from motor_control import pi_to_motor as motor
+        motor.set_speed_limit(limit)
+    except Exception as e:
+        print(f"Error applying geofence speed limit: {e}")
+
+
+def check_position(latitude, longitude):
+    """Evaluate a position against all fences and publish any events."""
+    global event_seq
+
+    with geofence_lock:
+        if engine is None:
+            return []
+        events = engine.update(latitude, longitude)
+        limit = engine.active_speed_limit()
+        previous_limit = geofence_status['speed_limit']
+        geofence_status['inside'] = sorted(engine.inside)
+        geofence_status['speed_limit'] = limit
+        geofence_status['last_check'] = time.time()
+
+    published = []
+    for event, fence in events:
+        with geofence_lock:
+            event_seq += 1
+            seq = event_seq
+        event_data = {
+            'seq': seq,
+            'event': event,
+            'fence': fence.name,
+            'speed_limit': fence.speed_limit,
+            'alert': fence.alert,
+            'latitude': latitude,
+            'longitude': longitude,
+            'time': time.time()
+        }
+        recent_events.append(event_data)
+        published.append(event_data)
+        print(f"Geofence {event}: {fence.name}")
+        for callback in list(event_listeners):
+            try:
+                callback(event_data)
+            except Exception as e:
+                print(f"Error in geofence event listener: {e}")
+
+    if limit != previous_limit:
+        _apply_speed_limit(limit)
+
+    return published
+
+
+def _on_gps_snapshot(snapshot):
+    """GPS snapshot listener - runs on the GPS reader thread."""
+    if snapshot.status == 'active' and snapshot.latitude is not None and snapshot.longitude is not None:
+        check_position(snapshot.latitude, snapshot.longitude)
+
+
+def start_geofencing(path=None):
+    """Load fences and start checking every GPS fix against them."""
+    global engine, is_running
+
+    if is_running:
+        return True
+
+    try:
+        from sensors import gps_module
+
+        fences = load_fences(path)
+        with geofence_lock:
+            engine = GeofenceEngine(fences, GRID_SIZE)
+        gps_module.add_snapshot_listener(_on_gps_snapshot)
+        is_running = True
+        print(f"Geofencing started with {len(fences)} fences")
+        return True
+    except Exception as e:
+        print(f"Error starting geofencing: {e}")
+        return False
+
+
+def stop_geofencing():
+    """Stop geofence checks and lift any speed limit they imposed."""
+    global is_running
+
+    try:
+        from sensors import gps_module
+        gps_module.remove_snapshot_listener(_on_gps_snapshot)
+    except Exception:
+        pass
+
+    if is_running and geofence_status['speed_limit'] is not None:
+        _apply_speed_limit(None)
+
+    is_running = False
+    print("Geofencing stopped")
+    return True
+
+
+def get_geofence_status():
+    """Get the current geofence status and recent events."""
+    with geofence_lock:
+        status = dict(geofence_status)
+        status['seq'] = event_seq
+        status['fences'] = [fence.to_dict() for fence in engine.fences] if engine else []
+    status['events'] = list(recent_events)
+    return status
+
+
+if __name__ == "__main__":
+    fences = load_fences()
+    print(f"Loaded {len(fences)} fences from {FENCES_FILE}")
+    for fence in fences:
+        print(f"  {fence.name}: {len(fence.polygon)} points, speed limit {fence.speed_limit}")
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+GPS dead-reckoning fusion for Smart Wheelchair system.
+Propagates position between GPS fixes using the commanded wheel motion and
+corrects it with a complementary filter every time a new fix arrives.
+"""
+import os
+import sys
+import time
+import math
+import threading
+import json
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Thread control
+fusion_thread = None
+is_running = False
+fusion_lock = threading.Lock()
+
+# Fused pose published for navigation and the web UI
+fused_pose = {
+    'latitude': None,
+    'longitude': None,
+    'heading': None,        # degrees clockwise from north
+    'speed': 0.0,           # m/s estimated from commanded motion
+    'source': 'none',       # none, gps, dead_reckoning
+    'since_fix': None,      # seconds since the last GPS fix was applied
+    'last_update': None
+}
+
+# Default settings
+UPDATE_RATE = 10            # Hz - pose publication rate
+MAX_SPEED = 1.5             # m/s at 100% duty cycle
+WHEEL_BASE = 0.55           # m between left and right wheels
+CORRECTION_GAIN = 0.6       # 0..1 weight given to each new GPS fix
+RESET_DISTANCE = 30.0       # m - snap to the fix if the estimate is further off
+MAX_PREDICTION_TIME = 10.0  # s - stop extrapolating if fixes stop arriving
+
+EARTH_RADIUS = 6371000.0    # m
+
+# Try to load settings
+try:
+    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                              'config', 'settings.json')
+    if os.path.exists(config_path):
+        with open(config_path, 'r') as f:
+            settings = json.load(f)
+
+        fusion_settings = settings.get('gps_fusion', {})
+        UPDATE_RATE = fusion_settings.get('update_rate', UPDATE_RATE)
+        MAX_SPEED = fusion_settings.get('max_speed', MAX_SPEED)
+        WHEEL_BASE = fusion_settings.get('wheel_base', WHEEL_BASE)
+        CORRECTION_GAIN = fusion_settings.get('correction_gain', CORRECTION_GAIN)
+        RESET_DISTANCE = fusion_settings.get('reset_distance', RESET_DISTANCE)
+        MAX_PREDICTION_TIME = fusion_settings.get('max_prediction_time', MAX_PREDICTION_TIME)
+except Exception as e:
+    print(f"Error loading GPS fusion settings: {e}")
+
+
+class DeadReckoningFilter:
+    """Complementary filter combining wheel odometry with GPS fixes.
+
+    Positions are tracked in metres east/north of the first fix so the
+    prediction step is plain planar kinematics.
+    """
+    def __init__(self, max_speed=MAX_SPEED, wheel_base=WHEEL_BASE,
+                 correction_gain=CORRECTION_GAIN, reset_distance=RESET_DISTANCE):
+        self.max_speed = max_speed
+        self.wheel_base = wheel_base
+        self.correction_gain = correction_gain
+        self.reset_distance = reset_distance
+
+        self.origin = None      # (lat, lon) of the local frame
+        self.east = 0.0
+        self.north = 0.0
+        self.heading = None     # radians clockwise from north
+        self.speed = 0.0
+        self.last_fix_time = None
+
+    def _to_local(self, latitude, longitude):
+        """Convert latitude/longitude to metres east/north of the origin."""
+        lat0, lon0 = self.origin
+        east = math.radians(longitude - lon0) * EARTH_RADIUS * math.cos(math.radians(lat0))
+        north = math.radians(latitude - lat0) * EARTH_RADIUS
+        return east, north
+
+    def _to_global(self, east, north):
+        """Convert metres east/north of the origin to latitude/longitude."""
+        lat0, lon0 = self.origin
+        latitude = lat0 + math.degrees(north / EARTH_RADIUS)
+        longitude = lon0 + math.degrees(east / (EARTH_RADIUS * math.cos(math.radians(lat0))))
+        return latitude, longitude
+
+    def predict(self, left, right, dt, heading=None):
+        """Advance the estimate using commanded wheel speeds (-100 to 100).
+
+        Args:
+            left: Commanded left side speed
+            right: Commanded right side speed
+            dt: Time step in seconds
+            heading: Optional external heading in degrees (e.g. compass)
+        """
+        left_speed = left / 100.0 * self.max_speed
+        right_speed = right / 100.0 * self.max_speed
+        self.speed = (left_speed + right_speed) / 2.0
+
+        if heading is not None:
+            self.heading = math.radians(heading)
+        elif self.heading is not None and self.wheel_base > 0:
+            # Positive yaw rate turns clockwise when the left side runs faster
+            self.heading += (left_speed - right_speed) / self.wheel_base * dt
+
+        if self.origin is None or self.heading is None:
+            return
+
+        distance = self.speed * dt
+        self.east += distance * math.sin(self.heading)
+        self.north += distance * math.cos(self.heading)
+
+    def correct(self, latitude, longitude, course=None, timestamp=None):
+        """Blend a new GPS fix into the estimate.
+
+        Args:
+            latitude: Fix latitude in degrees
+            longitude: Fix longitude in degrees
+            course: Optional course over ground in degrees
+            timestamp: Time of the fix (defaults to now)
+        """
+        self.last_fix_time = timestamp if timestamp is not None else time.time()
+
+        if self.origin is None:
+            self.origin = (latitude, longitude)
+            self.east = 0.0
+            self.north = 0.0
+        else:
+            fix_east, fix_north = self._to_local(latitude, longitude)
+            error = math.hypot(fix_east - self.east, fix_north - self.north)
+
+            if error > self.reset_distance:
+                self.east, self.north = fix_east, fix_north
+            else:
+                self.east += self.correction_gain * (fix_east - self.east)
+                self.north += self.correction_gain * (fix_north - self.north)
+
+        # GPS course is only meaningful while moving, and points backwards when reversing
+        if course is not None and abs(self.speed) > 0.1:
+            if self.speed < 0:
+                course = (course + 180) % 360
+            self.heading = math.radians(course)
+
+    def position(self):
+        """Get the current estimate as (latitude, longitude), or None."""
+        if self.origin is None:
+            return None
+        return self._to_global(self.east, self.north)
+
+
+def _read_commanded_motion():
+    """Get commanded (left, right) speeds, or zero motion if unavailable."""
+    try:
+        from motor_control import pi_to_motor as motor
+        motion = motor.get_commanded_motion()
+        return motion['left'], motion['right']
+    except Exception:
+        return 0.0, 0.0
+
+
+def start_fusion():
+    """Start GPS fusion in a separate thread."""
+    global fusion_thread, is_running
+
+    if is_running:
+        return True
+
+    try:
+        is_running = True
+        fusion_thread = threading.Thread(target=_fusion_thread)
+        fusion_thread.daemon = True
+        fusion_thread.start()
+        print(f"GPS fusion started at {UPDATE_RATE} Hz")
+        return True
+    except Exception as e:
+        print(f"Error starting GPS fusion: {e}")
+        is_running = False
+        return False
+
+
+def _fusion_thread():
+    """Thread function for GPS fusion."""
+    global is_running
+
+    from sensors import gps_module
+
+    estimator = DeadReckoningFilter()
+    period = 1.0 / UPDATE_RATE
+    last_fix_marker = None
+    last_tick = time.time()
+
+    while is_running:
+        try:
+            now = time.time()
+            dt = now - last_tick
+            last_tick = now
+
+            left, right = _read_commanded_motion()
+            estimator.predict(left, right, dt)
+
+            # Apply a correction only when the GPS reports a new fix
+            snapshot = gps_module.get_gps_snapshot()
+            source = 'dead_reckoning'
+            if (snapshot.status == 'active' and snapshot.latitude is not None
+                    and snapshot.last_update != last_fix_marker):
+                last_fix_marker = snapshot.last_update
+                estimator.correct(snapshot.latitude, snapshot.longitude, snapshot.course, now)
+                source = 'gps'
+
+            since_fix = None
+            if estimator.last_fix_time is not None:
+                since_fix = now - estimator.last_fix_time
+
+            position = estimator.position()
+            with fusion_lock:
+                if position is None or since_fix > MAX_PREDICTION_TIME:
+                    fused_pose['source'] = 'none'
+                else:
+                    fused_pose['latitude'], fused_pose['longitude'] = position
+                    fused_pose['source'] = source
+                fused_pose['heading'] = (math.degrees(estimator.heading) % 360
+                                         if estimator.heading is not None else None)
+                fused_pose['speed'] = estimator.speed
+                fused_pose['since_fix'] = since_fix
+                fused_pose['last_update'] = now
+
+            time.sleep(max(0.0, period - (time.time() - now)))
+
+        except Exception as e:
+            print(f"Error in GPS fusion: {e}")
+            time.sleep(1)
+
+
+def stop_fusion():
+    """Stop GPS fusion."""
+    global is_running
+
+    is_running = False
+
+    if fusion_thread is not None:
+        fusion_thread.join(timeout=2.0)
+
+    print("GPS fusion stopped")
+    return True
+
+
+def get_fused_pose():
+    """Get the current fused pose."""
+    with fusion_lock:
+        return fused_pose.copy()
+
+
+if __name__ == "__main__":
+    print("GPS Fusion Test")
+    print("===============")
+
+    from sensors import gps_module
+
+    if gps_module.start_gps_monitoring() and start_fusion():
+        try:
+            for i in range(20):
+                print(get_fused_pose())
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            print("Test interrupted")
+        finally:
+            stop_fusion()
+            gps_module.stop_gps_monitoring()
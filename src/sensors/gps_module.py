@@ -1,30 +1,87 @@
 #!/usr/bin/env python3
 """GPS module for Smart Wheelchair system"""
 import os
+import sys
 import time
 import threading
 import json
-import glob
 from datetime import datetime
 
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensors import gps_port_finder
+from sensors.gps_source import GPSSourceError, create_gps_source
+
 # Thread control variables
 gps_thread = None
 is_running = False
-gps_lock = threading.Lock()
 
-# Global state
-gps_data = {
-    'latitude': None,
-    'longitude': None,
-    'altitude': None,
-    'speed': None,
-    'course': None,
-    'satellites': None,
-    'timestamp': None,
-    'fix_quality': None,
-    'last_update': None,
-    'status': 'disconnected'
-}
+class GPSSnapshot:
+    """Immutable view of one GPS epoch.
+    
+    The reader thread builds a new snapshot per epoch and publishes it with a
+    single reference swap, so readers never need a lock and never see GGA and
+    RMC fields from different epochs.
+    """
+    __slots__ = ('version', 'latitude', 'longitude', 'altitude', 'speed', 'course',
+                 'satellites', 'timestamp', 'fix_quality', 'last_update', 'status')
+    
+    FIELDS = ('latitude', 'longitude', 'altitude', 'speed', 'course', 'satellites',
+              'timestamp', 'fix_quality', 'last_update', 'status')
+    
+    def __init__(self, version=0, **fields):
+        object.__setattr__(self, 'version', version)
+        for name in self.FIELDS:
+            object.__setattr__(self, name, fields.get(name))
+        if self.status is None:
+            object.__setattr__(self, 'status', 'disconnected')
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("GPSSnapshot is immutable")
+    
+    def replace(self, version, **changes):
+        """Create a new snapshot with some fields changed."""
+        fields = {name: getattr(self, name) for name in self.FIELDS}
+        fields.update(changes)
+        return GPSSnapshot(version, **fields)
+    
+    def as_dict(self):
+        """Get the snapshot as a plain dict."""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+# Latest published snapshot - only the reader thread replaces it
+current_snapshot = GPSSnapshot()
+publish_lock = threading.Lock()  # serializes writers only
+
+# Callbacks run on the reader thread for every published snapshot
+snapshot_listeners = []
+
+def add_snapshot_listener(callback):
+    """Register a callback(snapshot) to run whenever a new snapshot is published."""
+    if callback not in snapshot_listeners:
+        snapshot_listeners.append(callback)
+
+def remove_snapshot_listener(callback):
+    """Unregister a snapshot callback."""
+    if callback in snapshot_listeners:
+        snapshot_listeners.remove(callback)
+
+def _publish(**changes):
+    """Publish a new snapshot built from the current one plus changes."""
+    global current_snapshot
+    
+    with publish_lock:
+        current_snapshot = current_snapshot.replace(current_snapshot.version + 1, **changes)
+        snapshot = current_snapshot
+    
+    for callback in list(snapshot_listeners):
+        try:
+            callback(snapshot)
+        except Exception as e:
+            print(f"Error in GPS snapshot listener: {e}")
+    
+    return snapshot
 
 # GPS Configuration class to avoid global variable issues
 class GPSConfig:
@@ -35,6 +92,12 @@ class GPSConfig:
         self.baud_rate = 9600
         self.timeout = 1
         self.update_interval = 5
+        self.autodetect = True      # probe ports for NMEA instead of trusting the configured one
+        self.stale_timeout = 30     # seconds without a valid sentence before the port is probed again
+        self.source = 'serial'      # serial, replay or pty
+        self.replay_file = None
+        self.replay_speed = 1.0
+        self.replay_loop = False
         
         # Try to load settings from config
         self.load_from_config()
@@ -54,6 +117,12 @@ class GPSConfig:
                 self.baud_rate = gps_settings.get('baud_rate', self.baud_rate)
                 self.timeout = gps_settings.get('timeout', self.timeout)
                 self.update_interval = gps_settings.get('update_interval', self.update_interval)
+                self.autodetect = gps_settings.get('autodetect', self.autodetect)
+                self.stale_timeout = gps_settings.get('stale_timeout', self.stale_timeout)
+                self.source = gps_settings.get('source', self.source)
+                self.replay_file = gps_settings.get('replay_file', self.replay_file)
+                self.replay_speed = gps_settings.get('replay_speed', self.replay_speed)
+                self.replay_loop = gps_settings.get('replay_loop', self.replay_loop)
             else:
                 print(f"Config file not found at {config_path}, using default settings")
         except Exception as e:
@@ -64,26 +133,13 @@ class GPSConfig:
 config = GPSConfig()
 
 def find_gps_port():
-    """Find available GPS port"""
-    # Common GPS ports to check
-    potential_ports = [
-        '/dev/ttyS0',     # Common for Raspberry Pi 3 and 4
-        '/dev/ttyAMA0',   # Common for older Pis
-        '/dev/ttyUSB0',   # Common for USB GPS modules
-        '/dev/ttyACM0'    # Some USB GPS modules use this
-    ]
-    
-    # Add any additional ttyUSB devices
-    usb_ports = glob.glob('/dev/ttyUSB*')
-    for port in usb_ports:
-        if port not in potential_ports:
-            potential_ports.append(port)
-    
-    # Check which ports exist
-    for port in potential_ports:
-        if os.path.exists(port):
-            print(f"Found port: {port}")
-            return port
+    """Find the GPS port by probing candidate ports for NMEA traffic."""
+    result = gps_port_finder.detect_gps_port()
+    if result:
+        port, baud_rate = result
+        config.baud_rate = baud_rate
+        print(f"Found port: {port}")
+        return port
     
     return None
 
@@ -96,27 +152,21 @@ def start_gps_monitoring():
     
     # Check if required modules are available
     try:
-        import serial
         import pynmea2
+        if config.source == 'serial':
+            import serial
     except ImportError as e:
         print(f"Required module missing: {e}")
         print("Please install missing modules with: sudo pip3 install pyserial pynmea2")
         return False
     
-    # Check if port exists, try autodetection if not
-    if not os.path.exists(config.port):
-        print(f"GPS port {config.port} not found")
-        detected_port = find_gps_port()
-        if detected_port:
-            print(f"Using auto-detected port: {detected_port}")
-            config.port = detected_port
-        else:
-            print("No GPS ports found")
-            return False
+    if config.source == 'replay' and not (config.replay_file and os.path.exists(config.replay_file)):
+        print(f"GPS replay file {config.replay_file} not found")
+        return False
     
-    # Start monitoring thread
+    # Start monitoring thread - port detection runs there, it can take several seconds
     try:
-        print(f"Starting GPS monitoring on {config.port}")
+        print(f"Starting GPS monitoring from {config.source} source")
         is_running = True
         gps_thread = threading.Thread(target=_gps_monitoring_thread)
         gps_thread.daemon = True
@@ -127,36 +177,71 @@ def start_gps_monitoring():
         is_running = False
         return False
 
+def _resolve_port():
+    """Probe for the port with NMEA traffic, or fall back to autodetection if the port is missing.
+    
+    Returns:
+        bool: False if there is no port to open
+    """
+    if config.source != 'serial' or not (config.autodetect or not os.path.exists(config.port)):
+        return True
+    
+    if not os.path.exists(config.port):
+        print(f"GPS port {config.port} not found")
+    detected_port = find_gps_port()
+    if detected_port:
+        print(f"Using auto-detected port: {detected_port}")
+        config.port = detected_port
+    elif os.path.exists(config.port):
+        print(f"No NMEA traffic detected, using configured port {config.port}")
+    else:
+        print("No GPS ports found")
+        return False
+    return True
+
 def _gps_monitoring_thread():
     """Thread function for GPS monitoring."""
-    global is_running, gps_data
+    global is_running
     
     # Import required modules
     try:
-        import serial
         import pynmea2
     except ImportError as e:
         print(f"Required module missing in monitoring thread: {e}")
         is_running = False
         return
     
-    print(f"Starting GPS monitoring on {config.port} at {config.baud_rate} baud")
-    
     while is_running:
+        if not _resolve_port():
+            _publish(status='disconnected')
+            time.sleep(5)
+            continue
+        
         try:
-            # Try to open serial port
-            with serial.Serial(config.port, baudrate=config.baud_rate, 
-                              timeout=config.timeout) as ser:
-                print(f"Connected to GPS module at {config.port}")
+            # Try to open the configured GPS source
+            with create_gps_source(config) as source:
+                print(f"Connected to GPS source {source.name}")
                 
-                with gps_lock:
-                    gps_data['status'] = 'connected'
+                _publish(status='connected')
+                
+                # Fields for the epoch being assembled, keyed by NMEA UTC time
+                pending = {}
+                pending_epoch = None
+                pending_types = set()
+                last_valid = time.monotonic()
                 
                 # Read data continuously
                 while is_running:
+                    # Nothing valid for a while - the cached port may be wrong or the module moved
+                    if config.source == 'serial' and time.monotonic() - last_valid > config.stale_timeout:
+                        print(f"No valid NMEA on {config.port} for {config.stale_timeout}s, probing again")
+                        gps_port_finder.clear_cached_port()
+                        _publish(status='disconnected')
+                        break
+                    
                     try:
                         # Read a line from the GPS module
-                        line = ser.readline().decode('ascii', errors='replace').strip()
+                        line = source.readline().decode('ascii', errors='replace').strip()
                         
                         # Skip empty lines
                         if not line:
@@ -166,34 +251,59 @@ def _gps_monitoring_thread():
                         if line.startswith('$'):
                             try:
                                 msg = pynmea2.parse(line)
+                                last_valid = time.monotonic()
+                                
+                                if isinstance(msg, pynmea2.GGA):
+                                    sentence_type = 'GGA'
+                                elif isinstance(msg, pynmea2.RMC):
+                                    sentence_type = 'RMC'
+                                else:
+                                    continue
+                                
+                                # A new epoch started before the last one completed
+                                epoch = str(msg.timestamp)
+                                if pending and epoch != pending_epoch:
+                                    _publish(last_update=datetime.now().isoformat(), **pending)
+                                    pending = {}
+                                    pending_types = set()
+                                pending_epoch = epoch
+                                pending_types.add(sentence_type)
                                 
                                 # Extract GPS data from different message types
-                                if isinstance(msg, pynmea2.GGA):  # Global Positioning System Fix Data
-                                    with gps_lock:
-                                        gps_data['latitude'] = msg.latitude
-                                        gps_data['longitude'] = msg.longitude
-                                        gps_data['altitude'] = msg.altitude
-                                        gps_data['fix_quality'] = msg.gps_qual
-                                        gps_data['satellites'] = msg.num_sats
-                                        gps_data['timestamp'] = str(msg.timestamp)
-                                        gps_data['last_update'] = datetime.now().isoformat()
-                                        gps_data['status'] = 'active' if msg.gps_qual > 0 else 'no_fix'
+                                if sentence_type == 'GGA':  # Global Positioning System Fix Data
+                                    pending['latitude'] = msg.latitude
+                                    pending['longitude'] = msg.longitude
+                                    pending['altitude'] = msg.altitude
+                                    pending['fix_quality'] = msg.gps_qual
+                                    pending['satellites'] = msg.num_sats
+                                    pending['timestamp'] = epoch
+                                    pending['status'] = 'active' if msg.gps_qual > 0 else 'no_fix'
                                         
-                                elif isinstance(msg, pynmea2.RMC):  # Recommended Minimum Data
-                                    with gps_lock:
-                                        if hasattr(msg, 'spd_over_grnd') and msg.spd_over_grnd is not None:
-                                            gps_data['speed'] = msg.spd_over_grnd * 1.852  # knots to km/h
-                                        if hasattr(msg, 'true_course') and msg.true_course is not None:
-                                            gps_data['course'] = msg.true_course
+                                else:  # Recommended Minimum Data
+                                    if hasattr(msg, 'spd_over_grnd') and msg.spd_over_grnd is not None:
+                                        pending['speed'] = msg.spd_over_grnd * 1.852  # knots to km/h
+                                    if hasattr(msg, 'true_course') and msg.true_course is not None:
+                                        pending['course'] = msg.true_course
+                                
+                                # Publish as soon as both halves of the epoch are in
+                                if pending_types >= {'GGA', 'RMC'}:
+                                    _publish(last_update=datetime.now().isoformat(), **pending)
+                                    pending = {}
+                                    pending_types = set()
                                 
                             except pynmea2.ParseError:
                                 # Skip parse errors
                                 continue
                     
-                    except serial.SerialException as e:
-                        print(f"Serial error: {e}")
-                        with gps_lock:
-                            gps_data['status'] = 'error'
+                    except GPSSourceError as e:
+                        print(f"GPS source error: {e}")
+                        _publish(status='error')
+                        break
+                    
+                    except EOFError:
+                        # Replay finished - nothing more will arrive
+                        print("GPS replay finished")
+                        is_running = False
                         break
                         
                     except Exception as e:
@@ -201,26 +311,35 @@ def _gps_monitoring_thread():
                         # Continue trying to read
                         continue
         
-        except serial.SerialException as e:
+        except GPSSourceError as e:
             print(f"Failed to connect to GPS: {e}")
-            with gps_lock:
-                gps_data['status'] = 'disconnected'
+            _publish(status='disconnected')
+            
+            # The cached port may be stale - probe again on the next start
+            if config.source == 'serial':
+                gps_port_finder.clear_cached_port()
             
             # Wait before retry
             time.sleep(5)
             
         except Exception as e:
             print(f"Unexpected GPS error: {e}")
-            with gps_lock:
-                gps_data['status'] = 'error'
+            _publish(status='error')
             
             # Wait before retry
             time.sleep(5)
 
+def get_gps_snapshot():
+    """Get the latest immutable GPS snapshot (lock-free)."""
+    return current_snapshot
+
+def get_gps_version():
+    """Get the version number of the latest GPS snapshot."""
+    return current_snapshot.version
+
 def get_gps_data():
     """Get the current GPS data."""
-    with gps_lock:
-        return gps_data.copy()
+    return current_snapshot.as_dict()
 
 def stop_gps_monitoring():
     """Stop GPS monitoring."""
@@ -237,10 +356,9 @@ def stop_gps_monitoring():
     print("GPS monitoring stopped")
     return True
 
-def format_gps_for_display():
+def format_gps_for_display(snapshot=None):
     """Format GPS data for human-readable display."""
-    with gps_lock:
-        data = gps_data.copy()
+    data = (snapshot or current_snapshot).as_dict()
     
     formatted = {
         'status': data['status'],
@@ -285,6 +403,7 @@ def format_gps_for_display():
 # Test function when run directly
 if __name__ == "__main__":
     print("GPS Module Test")
+    print(f"GPS source: {config.source}")
     print(f"GPS port: {config.port}")
     print(f"Port exists: {'Yes' if os.path.exists(config.port) else 'No'}")
     
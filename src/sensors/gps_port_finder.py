@@ -2,33 +2,189 @@
 import os
 import json
 import glob
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def find_available_gps_port():
-    """Find available serial ports for GPS connection."""
+# Probe settings
+BAUD_RATES = [9600, 4800, 38400, 115200]  # Common GPS module baud rates
+PROBE_WINDOW = 1.2       # seconds to listen on each port/baud combination
+MIN_VALID_SENTENCES = 2  # checksummed sentences needed to accept a port
+
+# Last detected port, so restarts can skip the probe
+CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                          'config', 'gps_port_cache.json')
+
+def list_candidate_ports():
+    """List serial ports that might have a GPS module attached."""
     # Common GPS ports to check
     potential_ports = [
-        '/dev/ttyAMA0',  # Common for older Pis
         '/dev/ttyS0',    # Common for newer Pis
-        '/dev/ttyUSB0'   # Common for USB GPS modules
+        '/dev/ttyAMA0',  # Common for older Pis
+        '/dev/serial0',  # Raspberry Pi primary UART alias
+        '/dev/ttyUSB0',  # Common for USB GPS modules
+        '/dev/ttyACM0'   # Some USB GPS modules use this
     ]
     
-    # Add any additional ttyUSB devices
-    usb_ports = glob.glob('/dev/ttyUSB*')
+    # Add any additional USB serial devices
+    usb_ports = sorted(glob.glob('/dev/ttyUSB*') + glob.glob('/dev/ttyACM*'))
     for port in usb_ports:
         if port not in potential_ports:
             potential_ports.append(port)
     
-    # Check which ports actually exist
-    available_ports = [port for port in potential_ports if os.path.exists(port)]
+    # Check which ports actually exist, skipping aliases of ports already listed
+    available_ports = []
+    seen = set()
+    for port in potential_ports:
+        if os.path.exists(port):
+            real_port = os.path.realpath(port)
+            if real_port not in seen:
+                seen.add(real_port)
+                available_ports.append(port)
+    
+    return available_ports
+
+def nmea_checksum_valid(line):
+    """Check whether a line is an NMEA sentence with a valid checksum."""
+    if isinstance(line, bytes):
+        line = line.decode('ascii', errors='replace')
+    line = line.strip()
+    
+    if len(line) < 4 or line[0] not in '$!' or '*' not in line:
+        return False
+    
+    body, _, checksum = line[1:].rpartition('*')
+    if len(checksum) != 2:
+        return False
+    
+    calculated = 0
+    for char in body:
+        calculated ^= ord(char)
+    
+    try:
+        return calculated == int(checksum, 16)
+    except ValueError:
+        return False
+
+def probe_port(port, baud_rates=None, window=PROBE_WINDOW, stop_event=None):
+    """Listen on a port for valid NMEA traffic.
+    
+    Args:
+        port: Serial device path
+        baud_rates: Baud rates to try in order
+        window: Seconds to listen at each baud rate
+        stop_event: Optional threading.Event to abort early
+    
+    Returns:
+        int: The baud rate that produced valid NMEA, or None
+    """
+    import serial
+    
+    for baud_rate in baud_rates or BAUD_RATES:
+        if stop_event is not None and stop_event.is_set():
+            return None
+        
+        try:
+            with serial.Serial(port, baudrate=baud_rate, timeout=0.2) as ser:
+                ser.reset_input_buffer()
+                valid = 0
+                deadline = time.time() + window
+                
+                while time.time() < deadline:
+                    if stop_event is not None and stop_event.is_set():
+                        return None
+                    if nmea_checksum_valid(ser.readline()):
+                        valid += 1
+                        if valid >= MIN_VALID_SENTENCES:
+                            return baud_rate
+        except (serial.SerialException, OSError):
+            # Port cannot be opened at all - no point trying other baud rates
+            return None
     
-    if not available_ports:
+    return None
+
+def load_cached_port():
+    """Get the cached (port, baud_rate) if the port still exists."""
+    try:
+        with open(CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+        if os.path.exists(cached['port']):
+            return cached['port'], cached['baud_rate']
+    except Exception:
+        pass
+    return None
+
+def save_cached_port(port, baud_rate):
+    """Remember a detected port for the next start."""
+    try:
+        with open(CACHE_FILE, 'w') as f:
+            json.dump({'port': port, 'baud_rate': baud_rate, 'detected_at': time.time()}, f)
+    except Exception as e:
+        print(f"Could not cache GPS port: {e}")
+
+def clear_cached_port():
+    """Forget the cached port so the next start probes again."""
+    try:
+        os.remove(CACHE_FILE)
+    except OSError:
+        pass
+
+def detect_gps_port(baud_rates=None, window=PROBE_WINDOW, use_cache=True):
+    """Find the port that is actually producing NMEA data.
+    
+    All candidate ports are probed concurrently; the first one to produce
+    valid checksummed sentences wins and is cached for later starts.
+    
+    Returns:
+        tuple: (port, baud_rate), or None if no GPS traffic was found
+    """
+    if use_cache:
+        cached = load_cached_port()
+        if cached:
+            print(f"Using cached GPS port: {cached[0]} at {cached[1]} baud")
+            return cached
+    
+    try:
+        import serial
+    except ImportError as e:
+        print(f"Required module missing: {e}")
+        return None
+    
+    ports = list_candidate_ports()
+    if not ports:
         print("No potential GPS ports found")
         return None
     
-    print(f"Found potential GPS ports: {', '.join(available_ports)}")
+    print(f"Probing GPS ports: {', '.join(ports)}")
     
-    # Default to the first available port
-    return available_ports[0]
+    stop_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(ports))
+    result = None
+    try:
+        futures = {executor.submit(probe_port, port, baud_rates, window, stop_event): port
+                   for port in ports}
+        for future in as_completed(futures):
+            baud_rate = future.result()
+            if baud_rate:
+                result = (futures[future], baud_rate)
+                break
+    finally:
+        # Let the remaining probes close their ports without waiting on them
+        stop_event.set()
+        executor.shutdown(wait=False)
+    
+    if result:
+        print(f"GPS detected on {result[0]} at {result[1]} baud")
+        save_cached_port(*result)
+    else:
+        print("No NMEA traffic found on any port")
+    
+    return result
+
+def find_available_gps_port():
+    """Find the serial port GPS data is arriving on."""
+    result = detect_gps_port()
+    return result[0] if result else None
 
 def update_gps_port_in_settings():
     """Update the GPS port in settings.json based on available ports."""
@@ -41,10 +197,11 @@ def update_gps_port_in_settings():
         return False
     
     # Find available GPS port
-    port = find_available_gps_port()
-    if not port:
+    result = detect_gps_port(use_cache=False)
+    if not result:
         print("No GPS ports available, settings not updated")
         return False
+    port, baud_rate = result
     
     try:
         # Load current settings
@@ -56,15 +213,17 @@ def update_gps_port_in_settings():
             settings['gps'] = {}
         
         current_port = settings.get('gps', {}).get('port')
+        current_baud_rate = settings.get('gps', {}).get('baud_rate')
         
-        if current_port != port:
+        if current_port != port or current_baud_rate != baud_rate:
             settings['gps']['port'] = port
+            settings['gps']['baud_rate'] = baud_rate
             
             # Save updated settings
             with open(settings_file, 'w') as f:
                 json.dump(settings, f, indent=2)
             
-            print(f"GPS port updated from {current_port} to {port}")
+            print(f"GPS port updated from {current_port} to {port} at {baud_rate} baud")
             return True
         else:
             print(f"GPS port already set to {port}, no update needed")
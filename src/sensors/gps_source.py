@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+GPS input sources for Smart Wheelchair system.
+The GPS monitoring thread reads NMEA lines from any of these, so the same
+pipeline can run on a real receiver, a recorded log or a pseudo-terminal.
+"""
+import os
+import time
+import select
+
+
+class GPSSourceError(IOError):
+    """Raised when a GPS source cannot be opened or read."""
+    pass
+
+
+class SerialSource:
+    """Read NMEA sentences from a serial GPS receiver."""
+    def __init__(self, port, baud_rate=9600, timeout=1):
+        self.port = port
+        self.baud_rate = baud_rate
+        self.timeout = timeout
+        self.serial = None
+
+    @property
+    def name(self):
+        return self.port
+
+    def open(self):
+        import serial
+        try:
+            self.serial = serial.Serial(self.port, baudrate=self.baud_rate, timeout=self.timeout)
+        except serial.SerialException as e:
+            raise GPSSourceError(str(e))
+        return self
+
+    def readline(self):
+        import serial
+        try:
+            return self.serial.readline()
+        except serial.SerialException as e:
+            raise GPSSourceError(str(e))
+
+    def close(self):
+        if self.serial is not None:
+            self.serial.close()
+            self.serial = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _nmea_seconds(line):
+    """Get the UTC time of day in seconds from a GGA/RMC sentence, or None."""
+    if not line.startswith(b'$') or line[3:6] not in (b'GGA', b'RMC'):
+        return None
+    try:
+        field = line.split(b',')[1]
+        return int(field[0:2]) * 3600 + int(field[2:4]) * 60 + float(field[4:])
+    except (IndexError, ValueError):
+        return None
+
+
+class ReplaySource:
+    """Replay a recorded NMEA log file.
+
+    Sentences are paced by their own timestamps divided by ``speed``, so
+    speed=1 is real time, speed=10 is ten times faster and speed=0 replays
+    as fast as the pipeline can consume them.
+    """
+    def __init__(self, path, speed=1.0, loop=False):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.file = None
+        self.start_wall = None
+        self.start_log = None
+        self.last_log = None
+        self.day_offset = 0
+
+    @property
+    def name(self):
+        return f"replay:{self.path}"
+
+    def open(self):
+        try:
+            self.file = open(self.path, 'rb')
+        except OSError as e:
+            raise GPSSourceError(str(e))
+        self.start_wall = None
+        self.start_log = None
+        self.last_log = None
+        self.day_offset = 0
+        return self
+
+    def _pace(self, line):
+        """Sleep until the sentence is due according to its timestamp."""
+        if self.speed <= 0:
+            return
+
+        seconds = _nmea_seconds(line)
+        if seconds is None:
+            return
+
+        # Handle logs that run across midnight UTC
+        if self.last_log is not None and seconds + self.day_offset < self.last_log - 43200:
+            self.day_offset += 86400
+        seconds += self.day_offset
+        self.last_log = seconds
+
+        if self.start_log is None:
+            self.start_log = seconds
+            self.start_wall = time.time()
+            return
+
+        due = self.start_wall + (seconds - self.start_log) / self.speed
+        delay = due - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def readline(self):
+        line = self.file.readline()
+        if not line:
+            if not self.loop:
+                raise EOFError(f"End of GPS log {self.path}")
+            self.file.seek(0)
+            self.start_log = None
+            self.last_log = None
+            self.day_offset = 0
+            line = self.file.readline()
+
+        self._pace(line.strip())
+        return line
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PtySource:
+    """Read NMEA sentences written to a pseudo-terminal.
+
+    Opening the source prints the slave device path; any tool that writes
+    NMEA to that path (e.g. ``cat log.nmea > /dev/pts/N``) feeds the pipeline
+    exactly like a serial receiver would.
+    """
+    def __init__(self, timeout=1):
+        self.timeout = timeout
+        self.master_fd = None
+        self.slave_fd = None
+        self.slave_name = None
+        self.buffer = b''
+
+    @property
+    def name(self):
+        return f"pty:{self.slave_name}"
+
+    def open(self):
+        try:
+            self.master_fd, self.slave_fd = os.openpty()
+            self.slave_name = os.ttyname(self.slave_fd)
+        except OSError as e:
+            raise GPSSourceError(str(e))
+        print(f"GPS pseudo-terminal ready at {self.slave_name}")
+        return self
+
+    def readline(self):
+        deadline = time.time() + self.timeout
+        while b'\n' not in self.buffer:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return b''
+            ready, _, _ = select.select([self.master_fd], [], [], remaining)
+            if not ready:
+                return b''
+            try:
+                chunk = os.read(self.master_fd, 4096)
+            except OSError as e:
+                raise GPSSourceError(str(e))
+            self.buffer += chunk
+
+        line, self.buffer = self.buffer.split(b'\n', 1)
+        return line + b'\n'
+
+    def close(self):
+        for fd in (self.master_fd, self.slave_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self.master_fd = None
+        self.slave_fd = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def create_gps_source(config):
+    """Create the GPS source selected in the GPS configuration.
+
+    Args:
+        config: GPSConfig instance
+
+    Returns:
+        An unopened source (use it as a context manager)
+    """
+    if config.source == 'replay':
+        return ReplaySource(config.replay_file, config.replay_speed, config.replay_loop)
+    if config.source == 'pty':
+        return PtySource(config.timeout)
+    return SerialSource(config.port, config.baud_rate, config.timeout)
+
+
+# Benchmark the GPS pipeline from a recorded log
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from sensors import gps_module
+
+    parser = argparse.ArgumentParser(description='Replay an NMEA log through the GPS pipeline')
+    parser.add_argument('log', help='NMEA log file')
+    parser.add_argument('--speed', type=float, default=0, help='Replay speed (0 = as fast as possible)')
+    args = parser.parse_args()
+
+    gps_module.config.source = 'replay'
+    gps_module.config.replay_file = args.log
+    gps_module.config.replay_speed = args.speed
+    gps_module.config.replay_loop = False
+
+    start = time.time()
+    start_version = gps_module.get_gps_version()
+    if gps_module.start_gps_monitoring():
+        gps_module.gps_thread.join()
+        elapsed = time.time() - start
+        epochs = gps_module.get_gps_version() - start_version
+        print(f"Published {epochs} snapshots in {elapsed:.2f}s ({epochs / max(elapsed, 1e-9):.0f}/s)")
+        print(gps_module.format_gps_for_display())
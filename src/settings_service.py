@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Central settings service for the Smart Wheelchair system.
+Parses config/settings.json once and hands out immutable snapshots. The file
+is only re-read when its mtime, size or inode changes, writes are atomic
+(temp file, fsync, rename) and subscribers are told about every change.
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+
+SETTINGS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'config', 'settings.json')
+CHECK_INTERVAL = 1.0  # seconds between checks of the file's stat signature
+
+
+class FrozenDict(dict):
+    """A dict that refuses modification, so a snapshot can be shared safely."""
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Settings snapshots are read-only; use update_settings()")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value):
+    """Recursively convert parsed JSON into read-only containers."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Recursively convert a snapshot back into plain, editable containers."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class SettingsService:
+    """Cached, hot-reloading view of one JSON settings file."""
+    def __init__(self, path=SETTINGS_FILE, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.lock = threading.RLock()
+        self.snapshot = FrozenDict()
+        self.signature = None
+        self.last_check = 0
+        self.listeners = []
+        self.reloads = 0
+
+    def _stat_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _load(self, signature):
+        """Parse the file; keeps the previous snapshot if it is missing or invalid."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading settings from {self.path}: {e}")
+            return False
+        self.snapshot = freeze(data)
+        self.signature = signature
+        self.reloads += 1
+        return True
+
+    def get(self):
+        """Get the current settings snapshot, reloading it if the file changed."""
+        now = time.time()
+        if now - self.last_check < self.check_interval and self.signature is not None:
+            return self.snapshot
+
+        changed = None
+        with self.lock:
+            self.last_check = now
+            signature = self._stat_signature()
+            if signature is not None and signature != self.signature:
+                previous = self.snapshot
+                if self._load(signature) and self.reloads > 1:
+                    changed = (self.snapshot, previous)
+            snapshot = self.snapshot
+
+        if changed:
+            self._notify(*changed)
+        return snapshot
+
+    def section(self, name, default=None):
+        """Get one top-level section of the settings."""
+        return self.get().get(name, default if default is not None else FrozenDict())
+
+    def save(self, data):
+        """Atomically replace the settings file and notify subscribers."""
+        with self.lock:
+            previous = self.snapshot
+            directory = os.path.dirname(self.path)
+            fd, temp_path = tempfile.mkstemp(prefix='.settings-', suffix='.tmp', dir=directory)
+            try:
+                # Keep the permissions of the file being replaced
+                if os.path.exists(self.path):
+                    os.chmod(temp_path, os.stat(self.path).st_mode & 0o777)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(thaw(data), f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except Exception:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+
+            self.snapshot = freeze(thaw(data))
+            self.signature = self._stat_signature()
+            self.last_check = time.time()
+            snapshot = self.snapshot
+
+        self._notify(snapshot, previous)
+        return snapshot
+
+    def update(self, func):
+        """Edit the settings in place and save them.
+
+        Args:
+            func: Called with an editable copy of the settings; changes it in place
+
+        Returns:
+            The new snapshot
+        """
+        with self.lock:
+            data = thaw(self.get())
+            func(data)
+            return self.save(data)
+
+    def add_listener(self, callback):
+        """Register callback(new_snapshot, old_snapshot) for settings changes."""
+        with self.lock:
+            if callback not in self.listeners:
+                self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self.lock:
+            if callback in self.listeners:
+                self.listeners.remove(callback)
+
+    def _notify(self, snapshot, previous):
+        with self.lock:
+            listeners = list(self.listeners)
+        for callback in listeners:
+            try:
+                callback(snapshot, previous)
+            except Exception as e:
+                print(f"Error in settings listener: {e}")
+
+
+# Shared service for config/settings.json
+service = SettingsService()
+
+
+def get_settings():
+    """Get the current settings snapshot (read-only)."""
+    return service.get()
+
+
+def get_section(name, default=None):
+    """Get one read-only section of the settings."""
+    return service.section(name, default)
+
+
+def update_settings(func):
+    """Edit and atomically save the settings; see SettingsService.update()."""
+    return service.update(func)
+
+
+def save_settings(data):
+    """Atomically replace the whole settings file."""
+    return service.save(data)
+
+
+def add_listener(callback):
+    """Register callback(new_snapshot, old_snapshot) for settings changes."""
+    service.add_listener(callback)
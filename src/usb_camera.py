@@ -5,9 +5,10 @@ import time
 import threading
 import cv2
 
+from frame_capture import PacedCapture
+
 # Global variables
-frame_lock = threading.Lock()
-latest_frame = None
+capture = PacedCapture()  # latest frame, pacing and JPEG cache
 capture_running = False
 capture_thread = None
 
@@ -27,7 +28,7 @@ def start_capture():
 
 def _capture_worker():
     """Background worker to capture frames from phone"""
-    global latest_frame, capture_running
+    global capture_running
     
     try:
         # Verify ADB connection
@@ -36,12 +37,7 @@ def _capture_worker():
         # Start camera capture
         cap = cv2.VideoCapture(0)  # USB camera
         
-        while capture_running:
-            ret, frame = cap.read()
-            if ret:
-                with frame_lock:
-                    latest_frame = frame
-            time.sleep(0.03)  # ~30fps
+        capture.run(cap, lambda: capture_running)
             
         cap.release()
         
@@ -53,21 +49,24 @@ def stop_capture():
     """Stop capturing from phone"""
     global capture_running
     capture_running = False
+    capture.wake()  # wake an idle worker so it exits promptly
     if capture_thread:
         capture_thread.join(timeout=1.0)
     return True
 
-def get_frame():
+def get_frame_and_sequence(if_newer_than=None):
+    """Get the latest frame as JPEG bytes together with its sequence number.
+    
+    Args:
+        if_newer_than: Sequence number the caller already has; returns
+            (None, sequence) if no newer frame has been captured
+    """
+    return capture.get_frame_and_sequence(if_newer_than)
+
+def get_frame(if_newer_than=None):
     """Get the latest frame as JPEG bytes"""
-    with frame_lock:
-        if latest_frame is None:
-            return None
-            
-        # Convert to JPEG
-        ret, jpeg = cv2.imencode('.jpg', latest_frame)
-        if ret:
-            return jpeg.tobytes()
-    return None
+    frame, _ = get_frame_and_sequence(if_newer_than)
+    return frame
 
 def is_connected():
     """Check if phone is connected via USB"""
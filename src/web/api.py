@@ -15,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import camera utilities
 import camera_utils
+from web.rate_limit import too_many_commands
 
 # ----------------- Camera API -----------------
 
@@ -22,12 +23,8 @@ import camera_utils
 def camera_stream():
     """Stream from IP camera - gets a frame of video."""
     try:
-        # Load camera settings
-        settings = camera_utils.load_settings()
-        camera_settings = settings.get("camera", {})
-        ip = camera_settings.get("ip", "192.168.1.100")
-        port = camera_settings.get("port", "8080")
-        camera_type = camera_settings.get("type", "ip_webcam")
+        # Configured camera
+        ip, port, camera_type = camera_utils.get_camera_address()
         
         # Get snapshot
         image_data = camera_utils.get_camera_snapshot(ip, port, camera_type)
@@ -35,20 +32,16 @@ def camera_stream():
         if image_data:
             return Response(image_data, mimetype='image/jpeg')
         else:
-            return Response("Camera not available", mimetype='text/plain')
+            return Response("Camera not available", status=503, mimetype='text/plain')
     except Exception as e:
-        return Response(f"Error: {str(e)}", mimetype='text/plain')
+        return Response(f"Error: {str(e)}", status=500, mimetype='text/plain')
 
 @api_bp.route('/camera/status', methods=['GET'])
 def camera_status():
     """Get camera status."""
     try:
-        # Load camera settings
-        settings = camera_utils.load_settings()
-        camera_settings = settings.get("camera", {})
-        ip = camera_settings.get("ip", "192.168.1.100")
-        port = camera_settings.get("port", "8080")
-        camera_type = camera_settings.get("type", "ip_webcam")
+        # Configured camera
+        ip, port, camera_type = camera_utils.get_camera_address()
         
         # Check if camera is available
         available = camera_utils.is_camera_available(ip, port, camera_type)
@@ -57,7 +50,7 @@ def camera_status():
             'available': available,
             'url': f"http://{ip}:{port}",
             'type': camera_type,
-            'settings': camera_settings
+            'settings': camera_utils.load_settings().get('camera', {})
         })
     except Exception as e:
         return jsonify({'error': str(e), 'available': False})
@@ -84,10 +77,10 @@ def connect_camera():
         # Test connection
         if camera_utils.is_camera_available(ip, port, camera_type):
             # Update settings
-            camera_utils.update_camera_settings(ip, port, camera_type)
+            success, message = camera_utils.update_camera_settings(ip, port, camera_type)
             return jsonify({
-                'success': True,
-                'message': 'Connected to camera successfully'
+                'success': success,
+                'message': 'Connected to camera successfully' if success else message
             })
         else:
             return jsonify({
@@ -101,19 +94,15 @@ def connect_camera():
 def take_snapshot():
     """Take a snapshot from the camera."""
     try:
-        # Load camera settings
-        settings = camera_utils.load_settings()
-        camera_settings = settings.get("camera", {})
-        ip = camera_settings.get("ip", "192.168.1.100")
-        port = camera_settings.get("port", "8080")
-        camera_type = camera_settings.get("type", "ip_webcam")
+        # Configured camera
+        ip, port, camera_type = camera_utils.get_camera_address()
         
         # Get snapshot
         image_data = camera_utils.get_camera_snapshot(ip, port, camera_type)
         
         if image_data:
             # Save snapshot
-            filepath = camera_utils.save_snapshot(image_data)
+            filepath = camera_utils.archive_snapshot(image_data)
             
             if filepath:
                 return jsonify({
@@ -158,12 +147,8 @@ def discover_cameras():
 def toggle_flash():
     """Toggle camera flash/torch."""
     try:
-        # Load camera settings
-        settings = camera_utils.load_settings()
-        camera_settings = settings.get("camera", {})
-        ip = camera_settings.get("ip", "192.168.1.100")
-        port = camera_settings.get("port", "8080")
-        camera_type = camera_settings.get("type", "ip_webcam")
+        # Configured camera
+        ip, port, camera_type = camera_utils.get_camera_address()
         
         # Get flash state
         data = request.get_json() or {}
@@ -174,7 +159,8 @@ def toggle_flash():
         
         # Update settings
         if success:
-            settings["camera"]["use_flash"] = enabled
+            settings = camera_utils.load_settings()
+            settings.setdefault("camera", {})["use_flash"] = enabled
             camera_utils.save_settings(settings)
         
         return jsonify({
@@ -188,12 +174,8 @@ def toggle_flash():
 def trigger_focus():
     """Trigger camera focus."""
     try:
-        # Load camera settings
-        settings = camera_utils.load_settings()
-        camera_settings = settings.get("camera", {})
-        ip = camera_settings.get("ip", "192.168.1.100")
-        port = camera_settings.get("port", "8080")
-        camera_type = camera_settings.get("type", "ip_webcam")
+        # Configured camera
+        ip, port, camera_type = camera_utils.get_camera_address()
         
         # Focus camera
         success = camera_utils.focus_camera(ip, port, camera_type)
@@ -222,7 +204,7 @@ def camera_settings():
             
             # Update only provided settings
             for key, value in data.items():
-                settings['camera'][key] = value
+                settings.setdefault('camera', {})[key] = value
             
             # Save settings
             success = camera_utils.save_settings(settings)
@@ -236,60 +218,64 @@ def camera_settings():
 
 # ----------------- Motor Control API -----------------
 
+# Set by register(): the web app's drive_motors(command, speed=None), which applies
+# the running check and keeps motor_state (SSE, /api/state) up to date, and
+# the per-client limiter shared with the other motion routes
+drive_func = None
+limiter = None
+
+def _drive(command):
+    """Run a motor command through the web app's shared motor path."""
+    try:
+        if drive_func is None:
+            return jsonify({'status': 'error', 'message': 'Motor control not available'}), 503
+        if command != 'stop' and limiter is not None and not limiter.allow(request.remote_addr):
+            return too_many_commands()
+        data = request.get_json(silent=True) or {}
+        # Without a speed the current one is kept
+        speed = data.get('speed')
+        return jsonify(drive_func(command, int(speed) if speed is not None else None))
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@api_bp.route('/motors/start', methods=['POST'])
+def start_motors():
+    """Start the motors (required before any movement)."""
+    return _drive('start')
+
 @api_bp.route('/motors/forward', methods=['POST'])
 def move_forward():
     """Move the wheelchair forward."""
-    try:
-        from motor_control import pi_to_motor as motor
-        data = request.get_json() or {}
-        speed = data.get('speed', 50)
-        motor.forward(speed)
-        return jsonify({'success': True, 'direction': 'forward', 'speed': speed})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return _drive('forward')
 
 @api_bp.route('/motors/backward', methods=['POST'])
 def move_backward():
     """Move the wheelchair backward."""
-    try:
-        from motor_control import pi_to_motor as motor
-        data = request.get_json() or {}
-        speed = data.get('speed', 50)
-        motor.backward(speed)
-        return jsonify({'success': True, 'direction': 'backward', 'speed': speed})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return _drive('backward')
 
 @api_bp.route('/motors/left', methods=['POST'])
 def turn_left():
     """Turn the wheelchair left."""
-    try:
-        from motor_control import pi_to_motor as motor
-        data = request.get_json() or {}
-        speed = data.get('speed', 50)
-        motor.left(speed)
-        return jsonify({'success': True, 'direction': 'left', 'speed': speed})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return _drive('left')
 
 @api_bp.route('/motors/right', methods=['POST'])
 def turn_right():
     """Turn the wheelchair right."""
-    try:
-        from motor_control import pi_to_motor as motor
-        data = request.get_json() or {}
-        speed = data.get('speed', 50)
-        motor.right(speed)
-        return jsonify({'success': True, 'direction': 'right', 'speed': speed})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return _drive('right')
 
 @api_bp.route('/motors/stop', methods=['POST'])
 def stop_motors():
     """Stop all motors."""
-    try:
-        from motor_control import pi_to_motor as motor
-        motor.stop()
-        return jsonify({'success': True, 'status': 'stopped'})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+    return _drive('stop')
+
+def register(app, drive, motion_limiter=None, url_prefix='/api/v2'):
+    """Register the API on the app.
+    
+    Args:
+        drive: drive(command, speed) -> dict, used by every motor route
+        motion_limiter: RateLimiter applied to every motor command except stop
+    """
+    global drive_func, limiter
+    drive_func = drive
+    limiter = motion_limiter
+    app.register_blueprint(api_bp, url_prefix=url_prefix)
@@ -3,8 +3,6 @@ import threading
 import time
 import os
 import sys
-import requests
-import json
 import logging
 import atexit
 
@@ -17,13 +15,28 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import motor control functions
 from motor_control.pi_to_motor import (
     initialize_motors, cleanup_motors, move_forward, 
-    move_backward, stop, set_motor_speed
+    move_backward, stop, set_motor_speed,
+    emergency_stop as motors_emergency_stop, clear_emergency_stop, is_emergency_stopped
 )
 from sensors.distance_sensor import read_distance
 from sensors import gps_module
+from sensors import gps_fusion
+from navigation import geofence
 
 # Import camera utils
 import camera_utils
+import camera_http
+import settings_service
+from web import mjpeg_relay
+from web import frame_tiers
+from web import telemetry
+from web import joystick_channel
+from web import state
+from web import metrics
+from web import api
+from web import assets
+from web import page_cache
+from web import rate_limit
 
 # Weight sensor disabled
 WEIGHT_SENSOR_AVAILABLE = False
@@ -33,6 +46,18 @@ CAMERA_AVAILABLE = True
 
 app = Flask(__name__)
 
+# Vendored, hashed and precompressed static assets (see web/assets.py)
+assets.register(app)
+
+# Per-client limit on motion commands (stop commands are never limited)
+web_settings = settings_service.get_section('web_interface')
+motion_limiter = rate_limit.RateLimiter(rate=web_settings.get('command_rate', rate_limit.RATE),
+                                        burst=web_settings.get('command_burst', rate_limit.BURST))
+
+# Rendered pages, dropped whenever the settings change
+pages = page_cache.PageCache()
+settings_service.add_listener(pages.invalidate)
+
 # Global state variables
 motor_state = {
     "running": False,
@@ -53,34 +78,46 @@ try:
 except Exception as e:
     print(f"Error initializing motors in web app: {e}")
 
+def _timed(span, func):
+    """Wrap a subsystem call so its duration is recorded in a metrics span."""
+    def timed(*args, **kwargs):
+        with span:
+            return func(*args, **kwargs)
+    return timed
+
+# Subsystem calls timed for /metrics (initialize_motors includes the wait on motor_lock)
+initialize_motors = _timed(metrics.span('motor_init'), initialize_motors)
+move_forward = _timed(metrics.span('gpio'), move_forward)
+move_backward = _timed(metrics.span('gpio'), move_backward)
+stop = _timed(metrics.span('gpio'), stop)
+set_motor_speed = _timed(metrics.span('gpio'), set_motor_speed)
+read_distance = _timed(metrics.span('distance_sensor'), read_distance)
+camera_http.request_span = metrics.span('camera_http')
+
+# Apply camera settings in the background so a missing phone can't delay startup
+camera_utils.start_camera_init()
+
 # Start GPS when app starts
-if os.path.exists('/dev/ttyAMA0') or os.path.exists('/dev/ttyS0'):
+if gps_module.config.source != 'serial' or os.path.exists('/dev/ttyAMA0') or os.path.exists('/dev/ttyS0'):
     try:
-        gps_module.start_gps_monitoring()
+        if gps_module.start_gps_monitoring():
+            gps_fusion.start_fusion()
+            geofence.start_geofencing()
     except Exception as e:
         print(f"Error starting GPS monitoring: {e}")
 
 @app.route('/')
 def index():
-    """Main dashboard page."""
-    # Check camera availability
-    camera_status = camera_utils.is_camera_available()
-    
-    return render_template('index.html', 
-                          camera_available=camera_status,
-                          ip_camera_url=camera_utils.IP_CAMERA_URL)
+    """Main dashboard page (camera status is filled in from /api/state)."""
+    return pages.response('index.html', ip_camera_url=camera_utils.IP_CAMERA_URL)
 
 @app.route('/camera_stream')
 def camera_stream():
     """Show IP webcam live stream."""
     try:
-        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'settings.json')
-        with open(config_path, 'r') as f:
-            settings = json.load(f)
-        
-        ip_camera_url = settings.get('camera', {}).get('ip_camera_url', 'http://192.168.1.3:8080')
+        ip_camera_url = settings_service.get_section('camera').get('ip_camera_url', 'http://192.168.1.3:8080')
         
-        return render_template('camera_stream.html', ip_camera_url=ip_camera_url)
+        return pages.response('camera_stream.html', ip_camera_url=ip_camera_url)
     except Exception as e:
         return f"Error loading camera settings: {e}"
 
@@ -98,25 +135,53 @@ def check_camera():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)})
 
+@app.route('/api/camera/mjpeg')
+def camera_mjpeg():
+    """Live MJPEG stream relayed from the single upstream camera connection.
+    
+    ?tier=thumbnail|preview|full selects the resolution (default full).
+    """
+    relay = mjpeg_relay.get_relay()
+    transform = frame_tiers.get_tier_cache().transform_for(request.args.get('tier', frame_tiers.DEFAULT_TIER))
+    return Response(relay.stream(transform),
+                    mimetype='multipart/x-mixed-replace; boundary=' + mjpeg_relay.BOUNDARY.decode())
+
+@app.route('/api/camera/stream')
+def camera_frame():
+    """Latest relayed camera frame as a single JPEG.
+    
+    ?tier=thumbnail|preview|full selects the resolution (default full).
+    """
+    tier = request.args.get('tier', frame_tiers.DEFAULT_TIER)
+    frame, sequence = frame_tiers.get_tier_cache().get_frame(tier, timeout=5.0)
+    if frame is None:
+        return Response("Camera not available", status=503, mimetype='text/plain')
+    
+    response = Response(frame, mimetype='image/jpeg')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/camera/relay')
+def camera_relay_status():
+    """Get MJPEG relay statistics and camera connection health."""
+    status = mjpeg_relay.get_relay().get_status()
+    status['hosts'] = camera_http.get_health()
+    return jsonify(status)
+
 @app.route('/api/camera/status')
 def camera_status():
     """Check if the camera is accessible."""
     try:
-        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'settings.json')
-        with open(config_path, 'r') as f:
-            settings = json.load(f)
-        
-        ip_camera_url = settings.get('camera', {}).get('ip_camera_url', 'http://192.168.1.3:8080')
+        ip_camera_url = settings_service.get_section('camera').get('ip_camera_url', 'http://192.168.1.3:8080')
         
         # Check if camera is responding
-        import requests
         try:
-            response = requests.get(f"{ip_camera_url}/status.json", timeout=2)
+            response = camera_http.get(f"{ip_camera_url}/status.json", kind='status')
             available = response.status_code == 200
         except:
             try:
                 # Try snapshot endpoint as fallback
-                response = requests.get(f"{ip_camera_url}/shot.jpg", timeout=2)
+                response = camera_http.get(f"{ip_camera_url}/shot.jpg", kind='status')
                 available = response.status_code == 200
             except:
                 available = False
@@ -131,65 +196,95 @@ def camera_status():
             'error': str(e)
         })
 
+def drive_motors(command, speed=None):
+    """Run a motor command with the same checks for every route.
+    
+    Args:
+        command: start, stop, forward, backward, left or right
+        speed: Speed percentage (default: keep the current speed)
+    
+    Returns:
+        dict: Response data for the client
+    """
+    if speed is None:
+        speed = motor_state["speed"]
+    
+    # Optimize for full speed operation when speed is near maximum
+    if speed > 95:
+        speed = 100
+    
+    print(f"Motor control: Command={command}, Speed={speed}")
+    
+    # Only movement changes the speed the dashboard shows
+    if command in ('forward', 'backward') and motor_state["running"]:
+        motor_state["speed"] = speed
+    
+    if command == 'start':
+        # Make sure motors are initialized
+        if not hasattr(sys.modules['motor_control.pi_to_motor'], 'motors_initialized') or not sys.modules['motor_control.pi_to_motor'].motors_initialized:
+            if not initialize_motors(timeout=5.0):
+                return {"status": "error", "message": "Failed to initialize motors"}
+        
+        stop()  # Ensure motors are stopped before changing state
+        # Starting is the only way to release a latched emergency stop
+        clear_emergency_stop()
+        motor_state["running"] = True
+        print("Motors started")
+        return {"status": "success", "message": "Motors started"}
+        
+    elif command == 'stop':
+        motor_state["running"] = False
+        motor_state["direction"] = "stop"
+        stop()
+        print("Motors stopped")
+        return {"status": "success", "message": "Motors stopped"}
+        
+    elif not motor_state["running"]:
+        print("Error: Motors not started")
+        return {"status": "error", "message": "Motors not started"}
+        
+    elif command == 'forward':
+        motor_state["direction"] = "forward"
+        result = move_forward(speed)
+        print(f"Moving forward at speed {speed}, result: {result}")
+        
+    elif command == 'backward':
+        motor_state["direction"] = "backward"
+        result = move_backward(speed)
+        print(f"Moving backward at speed {speed}, result: {result}")
+        
+    elif command == 'left' or command == 'right':
+        # Turning functionality disabled - just stop motors
+        motor_state["direction"] = "stop"
+        result = stop()
+        print(f"Turning disabled - stopping motors")
+        return {"status": "info", "message": "Turning functionality disabled", "state": motor_state}
+    
+    else:
+        return {"status": "error", "message": f"Unknown command: {command}"}
+    
+    return {
+        "status": "success", 
+        "state": motor_state
+    }
+
+# Camera and motor REST API at /api/v2 (camera calls are bounded by camera_http.fetch
+# deadlines, motor calls go through drive_motors like every other route)
+api.register(app, drive_motors, motion_limiter)
+
 @app.route('/api/motors/control', methods=['POST'])
 def control_motors():
     """API endpoint to control motors."""
     try:
         data = request.get_json()
         command = data.get('command')
-        speed = int(data.get('speed', motor_state["speed"]))
-        
-        # Optimize for full speed operation when speed is near maximum
-        if speed > 95:
-            speed = 100
+        speed = data.get('speed')
+        speed = int(speed) if speed is not None else None
         
-        print(f"Motor control: Command={command}, Speed={speed}")
+        if command != 'stop' and not motion_limiter.allow(request.remote_addr):
+            return rate_limit.too_many_commands()
         
-        motor_state["speed"] = speed
-        
-        if command == 'start':
-            # Make sure motors are initialized
-            if not hasattr(sys.modules['motor_control.pi_to_motor'], 'motors_initialized') or not sys.modules['motor_control.pi_to_motor'].motors_initialized:
-                if not initialize_motors(timeout=5.0):
-                    return jsonify({"status": "error", "message": "Failed to initialize motors"})
-            
-            motor_state["running"] = True
-            stop()  # Ensure motors are stopped before changing state
-            print("Motors started")
-            return jsonify({"status": "success", "message": "Motors started"})
-            
-        elif command == 'stop':
-            motor_state["running"] = False
-            motor_state["direction"] = "stop"
-            stop()
-            print("Motors stopped")
-            return jsonify({"status": "success", "message": "Motors stopped"})
-            
-        elif not motor_state["running"]:
-            print("Error: Motors not started")
-            return jsonify({"status": "error", "message": "Motors not started"})
-            
-        elif command == 'forward':
-            motor_state["direction"] = "forward"
-            result = move_forward(speed)
-            print(f"Moving forward at speed {speed}, result: {result}")
-            
-        elif command == 'backward':
-            motor_state["direction"] = "backward"
-            result = move_backward(speed)
-            print(f"Moving backward at speed {speed}, result: {result}")
-            
-        elif command == 'left' or command == 'right':
-            # Turning functionality disabled - just stop motors
-            motor_state["direction"] = "stop"
-            result = stop()
-            print(f"Turning disabled - stopping motors")
-            return jsonify({"status": "info", "message": "Turning functionality disabled", "state": motor_state})
-        
-        return jsonify({
-            "status": "success", 
-            "state": motor_state
-        })
+        return jsonify(drive_motors(command, speed))
         
     except Exception as e:
         print(f"Error in motor control: {e}")
@@ -200,13 +295,69 @@ def motor_status():
     """API endpoint to get current motor status."""
     return jsonify(motor_state)
 
+# Shared telemetry stream - one sampler for every connected dashboard
+broadcaster = telemetry.TelemetryBroadcaster()
+broadcaster.add_source('motors', lambda: dict(motor_state))
+broadcaster.add_source('distance', telemetry.distance_source())
+broadcaster.add_source('gps', telemetry.gps_source())
+
+@app.route('/api/stream')
+def telemetry_stream():
+    """Server-Sent Events stream of motor, distance and GPS changes."""
+    response = Response(broadcaster.stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+# Aggregated dashboard state - one versioned document instead of several polls
+dashboard_state = state.StateAggregator()
+dashboard_state.add_section('motors', lambda: dict(motor_state))
+# Same sampler as the SSE stream, so the ultrasonic sensor is never fired from two threads
+dashboard_state.add_section('distance', lambda: broadcaster.current('distance'))
+dashboard_state.add_section('gps', telemetry.gps_source())
+
+def _obstacle_section():
+    from sensors import obstacle_detection
+    return obstacle_detection.get_obstacle_data()
+
+def _camera_section():
+    return {
+        'enabled': camera_utils.CAMERA_ENABLED,
+        'available': camera_utils.get_cached_availability(),
+        'url': camera_utils.IP_CAMERA_URL
+    }
+
+dashboard_state.add_section('obstacle', _obstacle_section)
+dashboard_state.add_section('camera', _camera_section)
+
+@app.route('/api/state')
+def get_dashboard_state():
+    """Motor, distance, obstacle, GPS and camera state in one document.
+    
+    The ETag changes with the combined version, so an unchanged poll gets a
+    304 without serializing anything.
+    """
+    version = dashboard_state.refresh()
+    if dashboard_state.etag(version) in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(dashboard_state.etag(version))
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    
+    body, body_version = dashboard_state.get_body()
+    response = Response(body, mimetype='application/json')
+    response.set_etag(dashboard_state.etag(body_version))
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/api/sensors/distance')
 def sensor_distance():
     """API endpoint to get current distance reading."""
     try:
-        distance = read_distance()
+        # Shared with the SSE stream and /api/state (filtered reading)
+        reading = broadcaster.current('distance', max_age=broadcaster.interval)
         return jsonify({
-            "distance": distance
+            "distance": reading['distance'] if reading else None
         })
     except Exception as e:
         return jsonify({"error": str(e)})
@@ -222,6 +373,86 @@ def motor_test():
     return render_template('motor_test.html')
 
 # Add a simple joystick control endpoint
+def apply_joystick(x, y, speed):
+    """Drive the motors from a joystick position.
+    
+    Args:
+        x: -1 to 1 (left to right)
+        y: -1 to 1 (back to forward)
+        speed: Speed percentage
+    
+    Returns:
+        dict: Response data for the client
+    """
+    # A centered stick - including the channel's disconnect and watchdog stops,
+    # which are sent with speed 0 - must not overwrite the user's speed setting
+    if abs(x) >= 0.1 or abs(y) >= 0.1:
+        motor_state["speed"] = speed
+    
+    # Make sure motors are initialized
+    if not hasattr(sys.modules['motor_control.pi_to_motor'], 'motors_initialized') or not sys.modules['motor_control.pi_to_motor'].motors_initialized:
+        if not initialize_motors(timeout=5.0):
+            return {"status": "error", "message": "Failed to initialize motors"}
+    
+    # No action if motors not running
+    if not motor_state["running"]:
+        return {"status": "error", "message": "Motors not started"}
+    
+    # Only handle forward and backward movements
+    # Turning functionality disabled
+    
+    # Forward/backward component
+    if y > 0.1:  # Forward
+        # Set all motors to the same forward speed
+        result = move_forward(speed)
+        motor_state["direction"] = "forward"
+        logger.info(f"Joystick: Moving forward at speed {speed}")
+        return {
+            "status": "success",
+            "state": motor_state,
+            "message": "Moving forward"
+        }
+    elif y < -0.1:  # Backward
+        # Set all motors to the same backward speed
+        result = move_backward(speed)
+        motor_state["direction"] = "backward"
+        logger.info(f"Joystick: Moving backward at speed {speed}")
+        return {
+            "status": "success",
+            "state": motor_state,
+            "message": "Moving backward"
+        }
+    
+    # Ignore left/right movements - turning disabled
+        
+    # Stop if joystick is centered
+    if abs(x) < 0.1 and abs(y) < 0.1:
+        stop()
+        motor_state["direction"] = "stop"
+        return {"status": "success", "message": "Motors stopped", "state": motor_state}
+        
+    # Calculate motor speeds based on joystick input
+    # Ensure full speed operation when needed
+    left_speed = int(speed * (y - x))
+    right_speed = int(speed * (y + x))
+    
+    # Clamp values to ensure they stay within valid range
+    left_speed = max(-100, min(100, left_speed))
+    right_speed = max(-100, min(100, right_speed))
+    
+    # Set motor speeds
+    set_motor_speed(1, left_speed)
+    set_motor_speed(2, right_speed)
+    
+    return {
+        "status": "success",
+        "state": motor_state,
+        "motors": {
+            "left": int(left_speed),
+            "right": int(right_speed)
+        }
+    }
+
 @app.route('/api/joystick', methods=['POST'])
 def joystick_control():
     """API endpoint for joystick control."""
@@ -231,89 +462,56 @@ def joystick_control():
         y = float(data.get('y', 0))  # -1 to 1 (back to forward)
         speed = int(data.get('speed', motor_state["speed"]))
         
-        motor_state["speed"] = speed
-        
-        # Make sure motors are initialized
-        if not hasattr(sys.modules['motor_control.pi_to_motor'], 'motors_initialized') or not sys.modules['motor_control.pi_to_motor'].motors_initialized:
-            if not initialize_motors(timeout=5.0):
-                return jsonify({"status": "error", "message": "Failed to initialize motors"})
-        
-        # No action if motors not running
-        if not motor_state["running"]:
-            return jsonify({"status": "error", "message": "Motors not started"})
-        
-        # Only handle forward and backward movements
-        # Turning functionality disabled
-        
-        # Forward/backward component
-        if y > 0.1:  # Forward
-            # Set all motors to the same forward speed
-            result = move_forward(speed)
-            motor_state["direction"] = "forward"
-            logger.info(f"Joystick: Moving forward at speed {speed}")
-            return jsonify({
-                "status": "success",
-                "state": motor_state,
-                "message": "Moving forward"
-            })
-        elif y < -0.1:  # Backward
-            # Set all motors to the same backward speed
-            result = move_backward(speed)
-            motor_state["direction"] = "backward"
-            logger.info(f"Joystick: Moving backward at speed {speed}")
-            return jsonify({
-                "status": "success",
-                "state": motor_state,
-                "message": "Moving backward"
-            })
-        
-        # Ignore left/right movements - turning disabled
-            
-        # Stop if joystick is centered
-        if abs(x) < 0.1 and abs(y) < 0.1:
-            stop()
-            motor_state["direction"] = "stop"
-            return jsonify({"status": "success", "message": "Motors stopped", "state": motor_state})
-            
-        # Calculate motor speeds based on joystick input
-        # Ensure full speed operation when needed
-        left_speed = int(speed * (y - x))
-        right_speed = int(speed * (y + x))
-        
-        # Clamp values to ensure they stay within valid range
-        left_speed = max(-100, min(100, left_speed))
-        right_speed = max(-100, min(100, right_speed))
-        
-        # Set motor speeds
-        set_motor_speed(1, left_speed)
-        set_motor_speed(2, right_speed)
+        # A centered joystick (stop) is never limited
+        centered = abs(x) < 0.1 and abs(y) < 0.1
+        if not centered and not motion_limiter.allow(request.remote_addr):
+            return rate_limit.too_many_commands()
         
-        return jsonify({
-            "status": "success",
-            "state": motor_state,
-            "motors": {
-                "left": int(left_speed),
-                "right": int(right_speed)
-            }
-        })
+        return jsonify(apply_joystick(x, y, speed))
         
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)})
 
-# Emergency stop endpoint
-@app.route('/api/emergency_stop')
+# Persistent binary joystick channel (needs flask-sock)
+joystick_coalescer = joystick_channel.register(app, apply_joystick)
+
+@app.route('/api/joystick/channel')
+def joystick_channel_status():
+    """Report whether the WebSocket joystick channel is available."""
+    return jsonify({
+        'available': joystick_coalescer is not None,
+        'path': '/api/joystick/ws',
+        'stats': joystick_coalescer.get_status() if joystick_coalescer else None
+    })
+
+# Emergency stop endpoint (served from the server's priority pool, see web/server.py)
+emergency_span = metrics.span('emergency_stop')
+
+@app.route('/api/emergency_stop', methods=['GET', 'POST'])
 def emergency_stop():
-    """API endpoint for emergency stop."""
+    """API endpoint for emergency stop.
+    
+    Goes straight to the motor layer's emergency_stop() - no initialization,
+    locks or rate limit - and reports how long cutting the motors took.
+    """
     try:
-        # Make sure motors are initialized
-        if not hasattr(sys.modules['motor_control.pi_to_motor'], 'motors_initialized') or not sys.modules['motor_control.pi_to_motor'].motors_initialized:
-            # Try to initialize if needed
-            initialize_motors(timeout=2.0)
-            
-        stop()
+        # Refuse further motion before cutting power, so nothing re-drives the motors
         motor_state["running"] = False
         motor_state["direction"] = "stop"
-        return jsonify({"status": "success", "message": "Emergency stop activated"})
+        if joystick_coalescer is not None:
+            joystick_coalescer.clear()
+        
+        start = time.perf_counter()
+        with emergency_span:
+            result = motors_emergency_stop()
+        latency_ms = (time.perf_counter() - start) * 1000
+        
+        return jsonify({
+            "status": "success" if result else "error",
+            "message": "Emergency stop activated" if result else "Some motors did not respond",
+            "latency_ms": round(latency_ms, 3),
+            "latched": is_emergency_stopped()
+        })
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)})
 
@@ -349,8 +547,10 @@ def update_camera_url():
 def gps_data():
     """Get current GPS data."""
     try:
-        data = gps_module.get_gps_data()
-        return jsonify(data)
+        snapshot = gps_module.get_gps_snapshot()
+        response = jsonify(snapshot.as_dict())
+        response.set_etag(f"gps-{snapshot.version}")
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e), 'status': 'error'})
 
@@ -358,11 +558,30 @@ def gps_data():
 def gps_formatted():
     """Get formatted GPS data for display."""
     try:
-        data = gps_module.format_gps_for_display()
+        snapshot = gps_module.get_gps_snapshot()
+        response = jsonify(gps_module.format_gps_for_display(snapshot))
+        response.set_etag(f"gps-fmt-{snapshot.version}")
+        return response.make_conditional(request)
+    except Exception as e:
+        return jsonify({'error': str(e), 'status': 'error'})
+
+@app.route('/api/gps/fused')
+def gps_fused():
+    """Get the dead-reckoning smoothed GPS pose."""
+    try:
+        data = gps_fusion.get_fused_pose()
         return jsonify(data)
     except Exception as e:
         return jsonify({'error': str(e), 'status': 'error'})
 
+@app.route('/api/geofence/status')
+def geofence_status():
+    """Get the fences containing the current position and recent enter/exit events."""
+    try:
+        return jsonify(geofence.get_geofence_status())
+    except Exception as e:
+        return jsonify({'error': str(e), 'status': 'error'})
+
 @app.route('/api/gps/save', methods=['POST'])
 def save_gps_location():
     """Save current GPS location with optional label."""
@@ -389,6 +608,14 @@ def get_obstacle_status():
 
 # Weight sensor endpoints removed
 
+@app.route('/metrics')
+def get_metrics():
+    """Request and subsystem timing in Prometheus text format."""
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
+# Time every request (registered last so all routes are preallocated)
+metrics.instrument(app)
+
 # Register cleanup function to run when app exits
 @atexit.register
 def cleanup_app():
@@ -410,4 +637,6 @@ def cleanup_app():
         print(f"Error during web app cleanup: {e}")
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', debug=True)
\ No newline at end of file
+    # Run without the reloader so the motors are only initialized once
+    from web.server import serve
+    serve(app, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Static asset pipeline for the Smart Wheelchair web interface.
+The dashboard is usually opened over the chair's own hotspot with no
+internet, so third-party libraries are vendored into static/vendor instead
+of loaded from a CDN. A build step minifies every asset, writes gzip and
+brotli copies and content-hashes the file names. The hashed files are
+served from /assets with a one-year immutable cache, so repeat page loads
+fetch nothing.
+
+    python3 src/web/assets.py fetch   # once, on a machine with internet
+    python3 src/web/assets.py build   # on every deploy
+
+rjsmin/rcssmin (minification) and brotli are optional; without them JS is
+copied as-is, CSS gets a basic minifier and only gzip copies are written.
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import mimetypes
+import urllib.request
+
+try:
+    import rjsmin
+    RJSMIN_AVAILABLE = True
+except ImportError:
+    RJSMIN_AVAILABLE = False
+
+try:
+    import rcssmin
+    RCSSMIN_AVAILABLE = True
+except ImportError:
+    RCSSMIN_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_FILE = os.path.join(DIST_DIR, 'manifest.json')
+
+# Local path (under static/) -> upstream URL; the URL is also the fallback until fetched
+VENDOR = {
+    'vendor/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/bootstrap-icons.css': 'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css',
+    'vendor/fonts/bootstrap-icons.woff2': 'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/fonts/bootstrap-icons.woff2',
+    'vendor/fonts/bootstrap-icons.woff': 'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/fonts/bootstrap-icons.woff',
+    'vendor/nipplejs.min.js': 'https://cdn.jsdelivr.net/npm/nipplejs@0.10.1/dist/nipplejs.min.js',
+    'vendor/jquery.min.js': 'https://code.jquery.com/jquery-3.6.0.min.js'
+}
+
+# Project assets (under static/) to build
+ASSETS = [
+    'css/dashboard.css',
+    'js/dashboard.js',
+    'js/camera.js',
+    'js/camera-settings.js'
+]
+
+# Files referenced by relative URL from a stylesheet keep their name (the CSS pins their version)
+UNHASHED = ('vendor/fonts/',)
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json')
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def fetch_vendor(force=False):
+    """Download the vendored libraries into static/vendor."""
+    for path, url in VENDOR.items():
+        target = os.path.join(STATIC_DIR, path)
+        if os.path.exists(target) and not force:
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        print(f"Fetching {url}")
+        with urllib.request.urlopen(url, timeout=30) as response:
+            data = response.read()
+        with open(target + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(target + '.tmp', target)
+
+
+def minify_css(text):
+    """Strip comments and redundant whitespace from a stylesheet."""
+    if RCSSMIN_AVAILABLE:
+        return rcssmin.cssmin(text)
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    return text.replace(';}', '}').strip()
+
+
+def minify(path, data):
+    """Minify an asset unless it is already minified (*.min.*)."""
+    if '.min.' in os.path.basename(path):
+        return data
+    if path.endswith('.css'):
+        return minify_css(data.decode('utf-8')).encode('utf-8')
+    if path.endswith('.js') and RJSMIN_AVAILABLE:
+        return rjsmin.jsmin(data.decode('utf-8')).encode('utf-8')
+    return data
+
+
+def hashed_name(path, data):
+    """css/dashboard.css -> css/dashboard.<hash>.css"""
+    if path.startswith(UNHASHED):
+        return path
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build(static_dir=STATIC_DIR, dist_dir=DIST_DIR):
+    """Minify, compress and hash every asset into dist/ and write the manifest.
+
+    Vendored files that have not been fetched are skipped; pages keep using
+    the CDN URL for those.
+
+    Returns:
+        dict: Manifest mapping asset paths to hashed paths under dist/
+    """
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+
+    manifest = {}
+    for path in ASSETS + list(VENDOR):
+        source = os.path.join(static_dir, path)
+        if not os.path.exists(source):
+            print(f"Skipping missing asset {path}")
+            continue
+        with open(source, 'rb') as f:
+            data = minify(path, f.read())
+
+        name = hashed_name(path, data)
+        target = os.path.join(dist_dir, name)
+        _write(target, data)
+        if path.endswith(COMPRESSIBLE):
+            _write(target + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+            if BROTLI_AVAILABLE:
+                _write(target + '.br', brotli.compress(data, quality=11))
+        manifest[path] = name
+
+    _write(os.path.join(dist_dir, 'manifest.json'), json.dumps(manifest, indent=2).encode())
+    return manifest
+
+
+def load_manifest(path=MANIFEST_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def register(app, dist_dir=DIST_DIR):
+    """Serve built assets at /assets and add asset_url() to the templates.
+
+    asset_url('js/dashboard.js') gives the hashed /assets URL once the assets
+    are built, the plain /static URL before that, and the CDN URL for a
+    vendored library that has not been fetched.
+    """
+    from flask import request, url_for, send_from_directory
+
+    manifest = load_manifest(os.path.join(dist_dir, 'manifest.json'))
+    if not manifest:
+        print("Static assets not built - run: python3 src/web/assets.py build")
+
+    def asset_url(path):
+        name = manifest.get(path)
+        if name:
+            return url_for('static_asset', filename=name)
+        if path in VENDOR and not os.path.exists(os.path.join(STATIC_DIR, path)):
+            return VENDOR[path]
+        return url_for('static', filename=path)
+
+    @app.route('/assets/<path:filename>')
+    def static_asset(filename):
+        """A built asset, precompressed when the client accepts it."""
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        accepted = request.headers.get('Accept-Encoding', '')
+        encoding = None
+        for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if name in accepted and os.path.exists(os.path.join(dist_dir, filename + suffix)):
+                encoding = name
+                filename += suffix
+                break
+
+        response = send_from_directory(dist_dir, filename, mimetype=mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        return response
+
+    app.jinja_env.globals['asset_url'] = asset_url
+    return asset_url
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    if command == 'fetch':
+        fetch_vendor(force='--force' in sys.argv)
+    elif command == 'build':
+        manifest = build()
+        for path, name in manifest.items():
+            print(f"{path} -> dist/{name}")
+        if not BROTLI_AVAILABLE:
+            print("brotli not installed - only gzip copies written")
+    else:
+        print("Usage: assets.py [fetch [--force] | build]")
+        sys.exit(1)
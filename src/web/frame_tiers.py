@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Resolution tiers for relayed camera frames.
+Produces downscaled JPEG variants of the relay's latest frame so clients on
+slow links can ask for a thumbnail or preview instead of the full image.
+Each variant is encoded once per frame sequence and shared by all clients.
+"""
+import threading
+
+try:
+    import cv2
+    import numpy as np
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+# Tier name -> (max width in pixels, JPEG quality); None keeps the camera frame as is
+TIERS = {
+    'thumbnail': (160, 60),
+    'preview': (480, 75),
+    'full': (None, None)
+}
+DEFAULT_TIER = 'full'
+
+# libjpeg can decode at 1/2, 1/4 or 1/8 scale for little more than the cost of parsing
+REDUCE_FACTORS = (8, 4, 2)
+
+
+def reduce_factor(source_width, width):
+    """Largest reduced-decode factor that still leaves at least width pixels (1 for a full decode)."""
+    if source_width:
+        for factor in REDUCE_FACTORS:
+            if source_width / width >= factor:
+                return factor
+    return 1
+
+
+class FrameTierCache:
+    """Downscale and cache relay frames per tier and frame sequence."""
+    def __init__(self, relay, tiers=None):
+        self.relay = relay
+        self.tiers = tiers or TIERS
+        self.cache = {}  # tier -> (sequence, jpeg bytes)
+        self.locks = {name: threading.Lock() for name in self.tiers}
+        self.source_width = None  # full width of the last decoded camera frame
+
+    def tier_name(self, name):
+        """Map a requested tier to a known one (unknown names get the default)."""
+        return name if name in self.tiers else DEFAULT_TIER
+
+    def _decode(self, frame, width):
+        """Decode a JPEG, using libjpeg's reduced-size decoding when it is enough."""
+        factor = reduce_factor(self.source_width, width)
+        flag = {
+            1: cv2.IMREAD_COLOR,
+            2: cv2.IMREAD_REDUCED_COLOR_2,
+            4: cv2.IMREAD_REDUCED_COLOR_4,
+            8: cv2.IMREAD_REDUCED_COLOR_8
+        }[factor]
+
+        image = cv2.imdecode(np.frombuffer(frame, dtype=np.uint8), flag)
+        if image is not None:
+            # Every decode tracks the camera resolution, so a change is picked up on the next frame
+            self.source_width = image.shape[1] * factor
+        return image
+
+    def _scale(self, frame, width, quality):
+        """Encode a frame at most width pixels wide, or None on failure."""
+        image = self._decode(frame, width)
+        if image is None:
+            return None
+
+        height, current_width = image.shape[:2]
+        if current_width > width:
+            new_height = max(1, int(height * width / current_width))
+            image = cv2.resize(image, (width, new_height), interpolation=cv2.INTER_AREA)
+
+        ret, jpeg = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        return jpeg.tobytes() if ret else None
+
+    def transform(self, tier, frame, sequence):
+        """Get the given tier of a relay frame."""
+        width, quality = self.tiers[tier]
+        if width is None or not CV2_AVAILABLE:
+            return frame
+
+        with self.locks[tier]:
+            cached = self.cache.get(tier)
+            if cached and cached[0] == sequence:
+                return cached[1]
+
+            try:
+                scaled = self._scale(frame, width, quality)
+            except Exception as e:
+                print(f"Error scaling frame to {tier}: {e}")
+                scaled = None
+            if scaled is None:
+                return frame
+
+            self.cache[tier] = (sequence, scaled)
+            return scaled
+
+    def get_frame(self, tier=DEFAULT_TIER, if_newer_than=0, timeout=5.0):
+        """Wait for a relay frame and return it in the requested tier.
+
+        Returns:
+            tuple: (jpeg bytes, sequence), or (None, sequence) on timeout
+        """
+        tier = self.tier_name(tier)
+        frame, sequence = self.relay.get_frame(if_newer_than, timeout)
+        if frame is None:
+            return None, sequence
+        return self.transform(tier, frame, sequence), sequence
+
+    def transform_for(self, tier):
+        """Get a transform(frame, sequence) callable for MJPEGRelay.stream()."""
+        tier = self.tier_name(tier)
+        if self.tiers[tier][0] is None:
+            return None
+        return lambda frame, sequence: self.transform(tier, frame, sequence)
+
+
+# Shared tier cache on top of the shared relay
+tier_cache = None
+tier_cache_lock = threading.Lock()
+
+
+def get_tier_cache():
+    """Get the tier cache for the shared camera relay."""
+    global tier_cache
+
+    with tier_cache_lock:
+        if tier_cache is None:
+            from web import mjpeg_relay
+            tier_cache = FrameTierCache(mjpeg_relay.get_relay())
+        return tier_cache
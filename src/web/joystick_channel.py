@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+WebSocket joystick channel for the Smart Wheelchair web interface.
+The dashboard sends small binary frames over one persistent connection
+instead of a JSON POST per joystick move. Stale frames are dropped by
+sequence number and only the newest target is handed to the motors.
+
+Needs the optional flask-sock package; without it the dashboard keeps
+using the /api/joystick HTTP endpoint.
+"""
+import struct
+import threading
+import time
+
+try:
+    from flask_sock import Sock
+    SOCK_AVAILABLE = True
+except ImportError:
+    SOCK_AVAILABLE = False
+
+# Client -> server: x, y (-1000..1000 = -1..1), speed (0-100), sequence
+FRAME = struct.Struct('<hhBI')
+# Server -> client: sequence, accepted flag
+ACK = struct.Struct('<IB')
+
+WATCHDOG_TIMEOUT = 1.0  # seconds without frames before a moving chair is stopped
+
+
+def decode_frame(data):
+    """Decode a joystick frame.
+
+    Returns:
+        tuple: (x, y, speed, seq) with x and y in -1..1, or None if malformed
+    """
+    if not isinstance(data, (bytes, bytearray)) or len(data) != FRAME.size:
+        return None
+    x, y, speed, seq = FRAME.unpack(data)
+    clamp = lambda value: max(-1.0, min(1.0, value / 1000.0))
+    return clamp(x), clamp(y), min(100, speed), seq
+
+
+def encode_frame(x, y, speed, seq):
+    """Encode a joystick frame (used by tests and tools)."""
+    return FRAME.pack(int(round(x * 1000)), int(round(y * 1000)), int(speed), seq)
+
+
+class JoystickCoalescer:
+    """Deliver only the newest joystick target to the motor layer.
+
+    Frames can arrive faster than the GPIO writes complete; each new target
+    replaces the pending one, so the motors never work through a backlog.
+    A target that is not refreshed within ``watchdog`` seconds stops the chair.
+    """
+    def __init__(self, apply_func, watchdog=WATCHDOG_TIMEOUT):
+        self.apply_func = apply_func
+        self.watchdog = watchdog
+        self.condition = threading.Condition()
+        self.pending = None
+        self.last_target_time = 0
+        self.moving = False
+        self.applied = 0
+        self.coalesced = 0
+        self.thread = None
+
+    def submit(self, x, y, speed):
+        """Queue a target, replacing any target not yet applied."""
+        with self.condition:
+            if self.pending is not None:
+                self.coalesced += 1
+            self.pending = (x, y, speed)
+            self.last_target_time = time.time()
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._worker)
+                self.thread.daemon = True
+                self.thread.start()
+            self.condition.notify()
+
+    def _worker(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait(self.watchdog)
+                    if (self.pending is None and self.moving and
+                            time.time() - self.last_target_time > self.watchdog):
+                        print("Joystick watchdog: no input, stopping")
+                        self.pending = (0.0, 0.0, 0)
+                target = self.pending
+                self.pending = None
+
+            x, y, speed = target
+            try:
+                self.apply_func(x, y, speed)
+            except Exception as e:
+                print(f"Error applying joystick target: {e}")
+            self.moving = abs(x) >= 0.1 or abs(y) >= 0.1
+            self.applied += 1
+
+    def clear(self):
+        """Drop any target not yet applied (after an emergency stop)."""
+        with self.condition:
+            self.pending = None
+
+    def get_status(self):
+        with self.condition:
+            return {
+                'applied': self.applied,
+                'coalesced': self.coalesced,
+                'moving': self.moving
+            }
+
+
+def handle_connection(ws, coalescer):
+    """Read frames from one WebSocket until it closes."""
+    last_seq = None
+    try:
+        while True:
+            data = ws.receive()
+            if data is None:
+                break
+            frame = decode_frame(data)
+            if frame is None:
+                continue
+            x, y, speed, seq = frame
+
+            # Drop frames that arrive out of order or repeat an older target
+            accepted = last_seq is None or seq > last_seq
+            if accepted:
+                last_seq = seq
+                coalescer.submit(x, y, speed)
+            ws.send(ACK.pack(seq, 1 if accepted else 0))
+    finally:
+        # A dropped connection must not leave the chair moving
+        coalescer.submit(0.0, 0.0, 0)
+
+
+def register(app, apply_func, path='/api/joystick/ws'):
+    """Add the WebSocket route to the app if flask-sock is installed.
+
+    Returns:
+        JoystickCoalescer, or None if WebSockets are unavailable
+    """
+    if not SOCK_AVAILABLE:
+        print("flask-sock not installed - joystick WebSocket disabled")
+        return None
+
+    sock = Sock(app)
+    coalescer = JoystickCoalescer(apply_func)
+
+    @sock.route(path)
+    def joystick_ws(ws):
+        handle_connection(ws, coalescer)
+
+    return coalescer
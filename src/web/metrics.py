@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Request metrics for the Smart Wheelchair web interface.
+Per-route latency histograms, in-flight gauges and status counters, plus
+span histograms for the slow subsystem calls made inside requests (motor
+lock and GPIO writes, the ultrasonic sensor, camera HTTP). Exported in
+Prometheus text format by the /metrics route.
+
+Every metric object is created once per route or span name and reused, so
+recording a request only bumps preallocated counters.
+"""
+import time
+import threading
+from bisect import bisect_left
+
+# Upper bounds in seconds; the ultrasonic read alone can take 100 ms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATUS_CLASSES = ('1xx', '2xx', '3xx', '4xx', '5xx')
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() only increments existing slots."""
+    __slots__ = ('buckets', 'counts', 'total', 'count', 'lock')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def snapshot(self):
+        """Get (cumulative bucket counts, sum, count)."""
+        with self.lock:
+            counts = list(self.counts)
+            total, count = self.total, self.count
+        for i in range(1, len(counts)):
+            counts[i] += counts[i - 1]
+        return counts, total, count
+
+
+class RouteMetrics:
+    """Latency, in-flight and status counts for one Flask endpoint."""
+    __slots__ = ('latency', 'in_flight', 'statuses', 'lock')
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.in_flight = 0
+        self.statuses = [0] * len(STATUS_CLASSES)
+        self.lock = threading.Lock()
+
+    def started(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def finished(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def record(self, duration, status):
+        self.latency.observe(duration)
+        index = min(max(status // 100 - 1, 0), len(STATUS_CLASSES) - 1)
+        with self.lock:
+            self.statuses[index] += 1
+
+
+class Span:
+    """Reusable timer for a named block; nests freely on any thread.
+
+    Use the same object for every call (``with metrics.span('gpio'):``);
+    start times live on a per-thread stack rather than on the span.
+    """
+    __slots__ = ('name', 'histogram', 'local')
+
+    def __init__(self, name, local):
+        self.name = name
+        self.histogram = Histogram()
+        self.local = local
+
+    def __enter__(self):
+        stack = getattr(self.local, 'starts', None)
+        if stack is None:
+            stack = self.local.starts = []
+        stack.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.local.starts.pop())
+        return False
+
+
+class MetricsRegistry:
+    """All route and span metrics of the app."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}   # endpoint -> RouteMetrics
+        self.spans = {}    # name -> Span
+        self.local = threading.local()
+
+    def route(self, endpoint):
+        metrics = self.routes.get(endpoint)
+        if metrics is None:
+            with self.lock:
+                metrics = self.routes.setdefault(endpoint, RouteMetrics())
+        return metrics
+
+    def span(self, name):
+        span = self.spans.get(name)
+        if span is None:
+            with self.lock:
+                span = self.spans.setdefault(name, Span(name, self.local))
+        return span
+
+    def render(self):
+        """Export everything in the Prometheus text exposition format."""
+        with self.lock:
+            routes = sorted(self.routes.items())
+            spans = sorted(self.spans.items())
+
+        lines = [
+            '# HELP http_request_duration_seconds Time spent in the route handler.',
+            '# TYPE http_request_duration_seconds histogram'
+        ]
+        for endpoint, metrics in routes:
+            _histogram_lines(lines, 'http_request_duration_seconds', f'route="{endpoint}"', metrics.latency)
+
+        lines += [
+            '# HELP http_requests_in_flight Requests currently being handled.',
+            '# TYPE http_requests_in_flight gauge'
+        ]
+        lines += [f'http_requests_in_flight{{route="{endpoint}"}} {metrics.in_flight}'
+                  for endpoint, metrics in routes]
+
+        lines += [
+            '# HELP http_requests_total Completed requests by status class.',
+            '# TYPE http_requests_total counter'
+        ]
+        for endpoint, metrics in routes:
+            for status, count in zip(STATUS_CLASSES, metrics.statuses):
+                if count:
+                    lines.append(f'http_requests_total{{route="{endpoint}",status="{status}"}} {count}')
+
+        lines += [
+            '# HELP span_duration_seconds Time spent in subsystem calls.',
+            '# TYPE span_duration_seconds histogram'
+        ]
+        for name, span in spans:
+            _histogram_lines(lines, 'span_duration_seconds', f'span="{name}"', span.histogram)
+
+        return '\n'.join(lines) + '\n'
+
+
+def _histogram_lines(lines, metric, labels, histogram):
+    counts, total, count = histogram.snapshot()
+    for bound, cumulative in zip(histogram.buckets, counts):
+        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {counts[-1]}')
+    lines.append(f'{metric}_sum{{{labels}}} {total:.6f}')
+    lines.append(f'{metric}_count{{{labels}}} {count}')
+
+
+# Shared registry for the web app
+registry = MetricsRegistry()
+
+
+def span(name):
+    """Get the reusable timer for a named subsystem call."""
+    return registry.span(name)
+
+
+def instrument(app, registry=registry):
+    """Record latency, in-flight and status metrics for every request to the app.
+
+    Latency covers the route handler; the body of a streaming response
+    (MJPEG, SSE) is not included.
+    """
+    # Preallocate metrics for every route registered so far
+    for rule in app.url_map.iter_rules():
+        registry.route(rule.endpoint)
+
+    from flask import request
+
+    @app.before_request
+    def _metrics_start():
+        metrics = registry.route(request.endpoint or 'unmatched')
+        metrics.started()
+        request.environ['metrics.route'] = metrics
+        request.environ['metrics.start'] = time.perf_counter()
+
+    @app.after_request
+    def _metrics_record(response):
+        metrics = request.environ.get('metrics.route')
+        if metrics is not None:
+            metrics.record(time.perf_counter() - request.environ['metrics.start'], response.status_code)
+        return response
+
+    @app.teardown_request
+    def _metrics_finish(exc):
+        metrics = request.environ.pop('metrics.route', None)
+        if metrics is not None:
+            metrics.finished()
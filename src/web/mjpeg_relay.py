@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+MJPEG relay for the Smart Wheelchair web interface.
+Keeps a single upstream MJPEG connection to the phone camera and fans the
+latest frame out to any number of browser clients.
+"""
+import os
+import sys
+import time
+import threading
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import camera_http
+import motion_detection
+from mjpeg_stream import iter_response_frames
+
+BOUNDARY = b'frame'  # boundary used towards our own clients
+
+
+class MJPEGRelay:
+    """Share one upstream MJPEG stream between many clients.
+
+    The upstream connection is opened when the first client arrives and
+    closed after ``idle_timeout`` seconds without clients. Each client always
+    gets the newest frame, so slow clients skip frames instead of queueing them.
+    """
+    def __init__(self, url_func, idle_timeout=10, reconnect_delay=2, chunk_size=16384,
+                 stall_timeout=15, detect_changes=motion_detection.ENABLED):
+        self.url_func = url_func
+        self.idle_timeout = idle_timeout
+        self.stall_timeout = stall_timeout
+        self.reconnect_delay = reconnect_delay
+        self.chunk_size = chunk_size
+
+        self.condition = threading.Condition()
+        self.frame = None
+        self.sequence = 0
+        self.frame_time = None
+        self.clients = 0
+        self.last_client_time = 0
+        self.running = False
+        self.connected = False
+        self.thread = None
+
+        # Near-identical frames are dropped before they reach clients
+        self.detector = motion_detection.ChangeDetector() if detect_changes else None
+        self.suppressed = 0
+
+    def _ensure_running(self):
+        """Start the upstream worker if it is not already running."""
+        with self.condition:
+            self.last_client_time = time.time()
+            if self.running:
+                return
+            self.running = True
+            self.thread = threading.Thread(target=self._worker)
+            self.thread.daemon = True
+            self.thread.start()
+
+    def _idle(self):
+        return self.clients == 0 and time.time() - self.last_client_time > self.idle_timeout
+
+    def _publish(self, frame):
+        with self.condition:
+            self.frame = frame
+            self.sequence += 1
+            self.frame_time = time.time()
+            self.condition.notify_all()
+
+    def _worker(self):
+        """Read the upstream stream until there are no more clients."""
+        print("MJPEG relay started")
+
+        while True:
+            with self.condition:
+                if self._idle():
+                    self.running = False
+                    # Stale by the time anyone comes back; they wait for a fresh one
+                    self.frame = None
+                    break
+
+            url = self.url_func()
+            try:
+                response = camera_http.get(url, kind='stream', stream=True)
+                if response.status_code != 200:
+                    raise IOError(f"HTTP error {response.status_code}")
+
+                self.connected = True
+                print(f"MJPEG relay connected to {url}")
+                try:
+                    for frame in iter_response_frames(response, self.chunk_size):
+                        if self.detector is not None and not self.detector.check(frame)[0]:
+                            self.suppressed += 1
+                        else:
+                            # The view is reused by the demuxer, so keep a copy for clients
+                            self._publish(bytes(frame))
+                        if self._idle() or self.url_func() != url:
+                            break
+                finally:
+                    response.close()
+                    self.connected = False
+
+            except Exception as e:
+                print(f"MJPEG relay error: {e}")
+                self.connected = False
+                time.sleep(self.reconnect_delay)
+
+        print("MJPEG relay stopped (no clients)")
+
+    def get_frame(self, if_newer_than=0, timeout=5.0):
+        """Wait for a frame newer than the given sequence number.
+
+        Returns:
+            tuple: (frame bytes, sequence), or (None, sequence) on timeout
+        """
+        if not camera_http.REQUESTS_AVAILABLE:
+            return None, self.sequence
+
+        self._ensure_running()
+        deadline = time.time() + timeout
+        with self.condition:
+            while self.frame is None or self.sequence <= if_newer_than:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None, self.sequence
+                self.condition.wait(remaining)
+            return self.frame, self.sequence
+
+    def stream(self, transform=None):
+        """Generate multipart/x-mixed-replace parts for one client.
+
+        Args:
+            transform: Optional callable(frame, sequence) returning the bytes to send
+        """
+        if not camera_http.REQUESTS_AVAILABLE:
+            # get_frame() could never wait for a frame; end the response instead of spinning
+            return
+        with self.condition:
+            self.clients += 1
+        try:
+            sequence = 0
+            last_frame_time = time.time()
+            while True:
+                frame, new_sequence = self.get_frame(if_newer_than=sequence)
+                if frame is None:
+                    # End the response if the camera has stalled so the client can retry
+                    if time.time() - last_frame_time > self.stall_timeout:
+                        break
+                    continue
+                sequence = new_sequence
+                last_frame_time = time.time()
+                if transform is not None:
+                    frame = transform(frame, sequence)
+                yield (b'--' + BOUNDARY + b'\r\n'
+                       b'Content-Type: image/jpeg\r\n'
+                       b'Content-Length: ' + str(len(frame)).encode() + b'\r\n\r\n' +
+                       frame + b'\r\n')
+        finally:
+            with self.condition:
+                self.clients -= 1
+                self.last_client_time = time.time()
+
+    def get_status(self):
+        """Get relay statistics."""
+        with self.condition:
+            return {
+                'running': self.running,
+                'connected': self.connected,
+                'clients': self.clients,
+                'sequence': self.sequence,
+                'frame_age': time.time() - self.frame_time if self.frame_time else None,
+                'suppressed': self.suppressed,
+                'motion': self.get_motion()
+            }
+
+    def get_motion(self):
+        """Get the motion score of the latest upstream frame (None if not scored)."""
+        if self.detector is None:
+            return None
+        return self.detector.get_status()
+
+
+# Shared relay for the camera configured in camera_utils
+relay = None
+relay_lock = threading.Lock()
+
+
+def get_relay():
+    """Get the shared relay for the configured IP camera."""
+    global relay
+
+    with relay_lock:
+        if relay is None:
+            import camera_utils
+            relay = MJPEGRelay(camera_utils.get_mjpeg_url)
+        return relay
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Rendered page cache for the Smart Wheelchair web interface.
+Dashboard pages only change when their template arguments do (camera URL,
+feature flags), so each page is rendered once per set of arguments and
+served from memory with an ETag. Anything that changes per second, like
+camera availability, is filled in by the page from /api/state instead.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+MAX_PAGES = 16  # rendered variants kept in memory
+
+
+class PageCache:
+    """Rendered templates keyed by template name and arguments."""
+    def __init__(self, max_pages=MAX_PAGES):
+        self.max_pages = max_pages
+        self.lock = threading.Lock()
+        self.pages = OrderedDict()  # (template, arguments) -> (body, etag)
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, template, **context):
+        """Get a rendered page, rendering it only if these arguments are new.
+
+        Context values must be hashable. Needs a request context (url_for).
+
+        Returns:
+            tuple: (body bytes, etag)
+        """
+        key = (template, tuple(sorted(context.items())))
+        with self.lock:
+            page = self.pages.get(key)
+            if page is not None:
+                self.pages.move_to_end(key)
+                self.hits += 1
+                return page
+
+        from flask import render_template
+        body = render_template(template, **context).encode('utf-8')
+        page = (body, hashlib.sha1(body).hexdigest()[:16])
+
+        with self.lock:
+            self.pages[key] = page
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+            self.misses += 1
+        return page
+
+    def response(self, template, **context):
+        """Render (or reuse) a page as a response that honours If-None-Match."""
+        from flask import Response, request
+        body, etag = self.render(template, **context)
+        response = Response(body, mimetype='text/html')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+
+    def invalidate(self, *args):
+        """Drop every rendered page (accepts and ignores listener arguments)."""
+        with self.lock:
+            self.pages.clear()
+
+    def get_status(self):
+        with self.lock:
+            return {
+                'pages': len(self.pages),
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Per-client rate limiting for motion commands.
+Each client address gets a token bucket, so one flooding browser or script
+cannot starve the motors or the worker threads for everyone else. Stop
+commands are never limited.
+"""
+import time
+import threading
+
+RATE = 20          # commands per second per client (the dashboard sends at most 20)
+BURST = 10         # commands a client may send back to back
+MAX_CLIENTS = 256  # buckets kept before idle ones are dropped
+IDLE_TIMEOUT = 60  # seconds before an idle client's bucket is forgotten
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, up to ``capacity``."""
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now):
+        """Take a token if one is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class RateLimiter:
+    """Token buckets keyed by client."""
+    def __init__(self, rate=RATE, burst=BURST, max_clients=MAX_CLIENTS, idle_timeout=IDLE_TIMEOUT):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.lock = threading.Lock()
+        self.buckets = {}  # client -> TokenBucket
+        self.allowed = 0
+        self.rejected = 0
+
+    def allow(self, client):
+        """Check (and count) one command from a client.
+
+        Returns:
+            bool: False if the client is over its rate
+        """
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(client)
+            if bucket is None:
+                if len(self.buckets) >= self.max_clients:
+                    self._drop_idle(now)
+                bucket = self.buckets[client] = TokenBucket(self.rate, self.burst, now)
+            if bucket.take(now):
+                self.allowed += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def _drop_idle(self, now):
+        idle = [client for client, bucket in self.buckets.items()
+                if now - bucket.updated > self.idle_timeout]
+        for client in idle:
+            del self.buckets[client]
+
+    def get_status(self):
+        with self.lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'clients': len(self.buckets),
+                'allowed': self.allowed,
+                'rejected': self.rejected
+            }
+
+
+def too_many_commands():
+    """The 429 response for a client over its rate."""
+    from flask import jsonify
+    response = jsonify({"status": "error", "message": "Too many motion commands, slow down"})
+    response.status_code = 429
+    response.headers['Retry-After'] = '1'
+    return response
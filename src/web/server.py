@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Embedded WSGI server for the Smart Wheelchair web interface.
+Serves the Flask app from a fixed pool of worker threads inside the main
+process, so the motors, GPIO and sensor threads are only ever set up once
+(no reloader, no second process) and a burst of clients cannot spawn
+unbounded threads.
+"""
+import time
+import select
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler, make_server
+
+# Default settings
+SERVER_MODE = 'production'  # 'production' (thread pool) or 'development' (werkzeug dev server)
+THREADS = 32                # long-lived streams (MJPEG, SSE, WebSocket) each hold one worker
+KEEPALIVE_TIMEOUT = 5       # seconds an idle keep-alive connection is kept open
+PRIORITY_THREADS = 2        # workers reserved for PRIORITY_PATHS
+PRIORITY_PATHS = (b'/api/emergency_stop',)
+PEEK_TIMEOUT = 0.01         # seconds the accept loop waits for a new connection's request line
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """HTTP/1.1 handler that closes idle keep-alive connections.
+
+    The timeout only covers waiting for the next request line; once a
+    request has started, streaming responses may run indefinitely.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def handle_one_request(self):
+        self.connection.settimeout(self.server.keepalive_timeout)
+        return super().handle_one_request()
+
+    def parse_request(self):
+        self.connection.settimeout(None)
+        return super().parse_request()
+
+    def log_request(self, code='-', size='-'):
+        # Access logging for every poll is expensive on the Pi; keep errors only
+        try:
+            status = int(getattr(code, 'value', code))
+        except (TypeError, ValueError):
+            status = 0
+        if status >= 400:
+            super().log_request(code, size)
+
+
+class SingleRequestHandler(KeepAliveRequestHandler):
+    """Handle one request and close, so a priority worker is never held by keep-alive."""
+    def handle(self):
+        try:
+            self.handle_one_request()
+        except (ConnectionError, socket.timeout):
+            pass
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """WSGI server that hands each connection to a bounded thread pool.
+
+    Connections whose first request is for one of PRIORITY_PATHS go to a
+    small separate pool, so an emergency stop never queues behind streams
+    or a flood of motor commands holding the main workers.
+    """
+    multithread = True
+
+    def __init__(self, host, port, app, threads=THREADS, keepalive_timeout=KEEPALIVE_TIMEOUT,
+                 handler=KeepAliveRequestHandler, priority_threads=PRIORITY_THREADS):
+        super().__init__(host, port, app, handler=handler)
+        self.threads = threads
+        self.keepalive_timeout = keepalive_timeout
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='http')
+        self.priority_executor = ThreadPoolExecutor(max_workers=priority_threads,
+                                                    thread_name_prefix='http-priority')
+
+    def is_priority(self, request):
+        """Peek at the request line (without consuming it) for a priority path.
+
+        Clients send the request right after connecting, so waiting a few
+        milliseconds is enough; a client that sends nothing in that time is
+        handled by the regular pool.
+        """
+        try:
+            readable, _, _ = select.select([request], [], [], PEEK_TIMEOUT)
+            if not readable:
+                return False
+            head = request.recv(128, socket.MSG_PEEK)
+        except OSError:
+            return False
+        _, _, target = head.partition(b' ')
+        return target.startswith(PRIORITY_PATHS)
+
+    def process_request(self, request, client_address):
+        if self.is_priority(request):
+            self.priority_executor.submit(self._process_request, request, client_address,
+                                          SingleRequestHandler)
+        else:
+            self.executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address, handler=None):
+        try:
+            if handler is None:
+                self.finish_request(request, client_address)
+            else:
+                handler(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+        self.priority_executor.shutdown(wait=False)
+
+
+def create_server(app, host='0.0.0.0', port=5001, mode=SERVER_MODE, threads=THREADS,
+                  keepalive_timeout=KEEPALIVE_TIMEOUT):
+    """Bind a server for the app; call serve_forever() on the result to run it.
+
+    Raises:
+        OSError: If the port cannot be bound
+    """
+    if mode == 'development':
+        # Same server app.run() uses, without the reloader or debugger
+        return make_server(host, port, app, threaded=True)
+    return PooledWSGIServer(host, port, app, threads=threads, keepalive_timeout=keepalive_timeout)
+
+
+def serve(app, host='0.0.0.0', port=5001, **kwargs):
+    """Run the app until interrupted."""
+    server = create_server(app, host, port, **kwargs)
+    print(f"Serving on http://{host}:{server.server_port} ({kwargs.get('mode', SERVER_MODE)} mode)")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+# Compare start-up and request throughput of both modes
+if __name__ == "__main__":
+    import argparse
+    import threading
+    import http.client
+    from flask import Flask
+
+    parser = argparse.ArgumentParser(description='Benchmark the web server modes')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per mode')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent keep-alive clients')
+    args = parser.parse_args()
+
+    bench_app = Flask(__name__)
+
+    @bench_app.route('/ping')
+    def ping():
+        return 'pong'
+
+    def run_clients(port, count, clients):
+        def client():
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            for _ in range(count // clients):
+                connection.request('GET', '/ping')
+                connection.getresponse().read()
+            connection.close()
+
+        workers = [threading.Thread(target=client) for _ in range(clients)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    for mode in ('development', 'production'):
+        start = time.perf_counter()
+        server = create_server(bench_app, '127.0.0.1', 0, mode=mode)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        # Start-up ends when the first request is answered
+        while True:
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=1)
+                connection.request('GET', '/ping')
+                connection.getresponse().read()
+                connection.close()
+                break
+            except (ConnectionError, socket.timeout):
+                time.sleep(0.001)
+        startup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_clients(server.server_port, args.requests, args.clients)
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+
+        print(f"{mode:12s} start-up {startup * 1000:6.1f} ms, "
+              f"{args.requests / elapsed:7.0f} req/s with {args.clients} clients")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Aggregated dashboard state for the Smart Wheelchair web interface.
+Collects motor, distance, obstacle, GPS and camera state into one document
+with a combined version number. The document is serialized once per version,
+so polls that find nothing new cost a few comparisons and a 304.
+"""
+import json
+import time
+import threading
+
+
+class StateAggregator:
+    """Combine named state sections under a single version number."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sections = {}   # name -> callable returning a JSON-serializable value
+        self.values = {}
+        self.version = 0
+        self.boot_id = format(int(time.time()), 'x')  # keeps ETags unique across restarts
+        self.body = None
+        self.body_version = None
+
+    def add_section(self, name, func):
+        with self.lock:
+            self.sections[name] = func
+            self.version += 1
+
+    def refresh(self):
+        """Sample every section and bump the version if any of them changed.
+
+        Returns:
+            int: The current combined version
+        """
+        with self.lock:
+            sections = list(self.sections.items())
+
+        changes = {}
+        for name, func in sections:
+            try:
+                value = func()
+            except Exception as e:
+                value = {'error': str(e)}
+            changes[name] = value
+
+        with self.lock:
+            for name, value in changes.items():
+                if self.values.get(name) != value:
+                    self.values[name] = value
+                    self.version += 1
+            return self.version
+
+    def etag(self, version):
+        return f"state-{self.boot_id}-{version}"
+
+    def get_body(self):
+        """Get the serialized document and its version (serialized once per version)."""
+        with self.lock:
+            if self.body_version != self.version:
+                document = dict(self.values)
+                document['version'] = self.version
+                self.body = json.dumps(document, separators=(',', ':')).encode()
+                self.body_version = self.version
+            return self.body, self.body_version
@@ -34,17 +34,33 @@ document.addEventListener('DOMContentLoaded', function() {
     let currentDirection = 'stop';
     let updateInterval = 500; // milliseconds
     let updateTimer = null;
+    let telemetrySource = null;
+    let lastGeofenceCheck = 0;
     let joystick = null;
     let joystickPosition = { x: 0, y: 0 };
+    let joystickHeld = false;
+    
+    // WebSocket joystick channel (falls back to HTTP when unavailable)
+    const JOYSTICK_SEND_INTERVAL = 50;  // ms between frames sent while moving
+    const JOYSTICK_HEARTBEAT = 250;     // ms between repeats of a held position
+    let joystickSocket = null;
+    let joystickSeq = 0;
+    let joystickPending = null;
+    let joystickSendTimer = null;
+    let joystickLastSent = 0;
+    let joystickRtt = null;
+    const joystickSentAt = new Map();
     
     // GPS Variables
     let gpsUpdateInterval;
     let lastGpsData = null;
+    let lastGeofenceSeq = null;  // seq of the last geofence event seen (null until the first poll)
     let map = null;
     let marker = null;
     
     // Initialize joystick
     createJoystick();
+    connectJoystickChannel();
     
     // Check if camera is available
     checkCameraAvailability();
@@ -87,7 +103,9 @@ document.addEventListener('DOMContentLoaded', function() {
             const y = parseFloat(-data.vector.y).toFixed(2);
             
             joystickPosition = { x, y };
-            joystickInfo.textContent = `X: ${x}, Y: ${y}`;
+            joystickHeld = true;
+            joystickInfo.textContent = joystickRtt === null ?
+                `X: ${x}, Y: ${y}` : `X: ${x}, Y: ${y} (RTT ${joystickRtt.toFixed(0)} ms)`;
             
             // Only send joystick updates when motors are running
             if (motorRunning) {
@@ -97,37 +115,129 @@ document.addEventListener('DOMContentLoaded', function() {
         
         joystick.on('end', function() {
             joystickPosition = { x: 0, y: 0 };
+            joystickHeld = false;
             joystickInfo.textContent = `X: 0, Y: 0`;
             
             // Stop the motors if they're running
             if (motorRunning) {
-                setDirection('stop');
+                if (joystickChannelOpen()) {
+                    sendJoystickCommand(0, 0);
+                } else {
+                    setDirection('stop');
+                }
             }
         });
+        
+        // The server stops the chair if a held position is not repeated
+        setInterval(function() {
+            if (joystickHeld && motorRunning && joystickChannelOpen() &&
+                    performance.now() - joystickLastSent > JOYSTICK_HEARTBEAT) {
+                sendJoystickCommand(joystickPosition.x, joystickPosition.y);
+            }
+        }, JOYSTICK_HEARTBEAT);
+    }
+    
+    /**
+     * Open the WebSocket joystick channel if the server supports it
+     */
+    function connectJoystickChannel() {
+        if (!window.WebSocket) {
+            return;
+        }
+        
+        fetch('/api/joystick/channel')
+            .then(response => response.json())
+            .then(data => {
+                if (!data.available) {
+                    return;
+                }
+                
+                const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+                const socket = new WebSocket(`${protocol}//${window.location.host}${data.path}`);
+                socket.binaryType = 'arraybuffer';
+                socket.onopen = () => { joystickSocket = socket; };
+                socket.onmessage = event => handleJoystickAck(event.data);
+                socket.onclose = () => {
+                    joystickSocket = null;
+                    setTimeout(connectJoystickChannel, 2000);
+                };
+            })
+            .catch(error => {
+                console.error('Error checking joystick channel:', error);
+            });
+    }
+    
+    function joystickChannelOpen() {
+        return joystickSocket !== null && joystickSocket.readyState === WebSocket.OPEN;
+    }
+    
+    /**
+     * Measure round-trip latency from the server's acknowledgement
+     */
+    function handleJoystickAck(buffer) {
+        const seq = new DataView(buffer).getUint32(0, true);
+        const sentAt = joystickSentAt.get(seq);
+        if (sentAt !== undefined) {
+            joystickRtt = performance.now() - sentAt;
+        }
+        
+        // Forget this frame and any whose acknowledgement was lost
+        for (const key of joystickSentAt.keys()) {
+            if (key <= seq) {
+                joystickSentAt.delete(key);
+            }
+        }
     }
     
     /**
-     * Send joystick position to control motors
+     * Send joystick position to control motors, at most once per
+     * JOYSTICK_SEND_INTERVAL - positions in between are replaced by the newest
      */
     function sendJoystickCommand(x, y) {
-        fetch('/api/motors/control', {
+        joystickPending = { x: parseFloat(x), y: parseFloat(y) };
+        
+        const wait = JOYSTICK_SEND_INTERVAL - (performance.now() - joystickLastSent);
+        if (wait <= 0) {
+            flushJoystickCommand();
+        } else if (!joystickSendTimer) {
+            joystickSendTimer = setTimeout(flushJoystickCommand, wait);
+        }
+    }
+    
+    function flushJoystickCommand() {
+        joystickSendTimer = null;
+        if (!joystickPending) {
+            return;
+        }
+        
+        const { x, y } = joystickPending;
+        joystickPending = null;
+        joystickLastSent = performance.now();
+        
+        if (joystickChannelOpen()) {
+            // Binary frame: int16 x, int16 y (scaled by 1000), uint8 speed, uint32 sequence
+            const seq = ++joystickSeq;
+            const frame = new DataView(new ArrayBuffer(9));
+            frame.setInt16(0, Math.round(x * 1000), true);
+            frame.setInt16(2, Math.round(y * 1000), true);
+            frame.setUint8(4, currentSpeed);
+            frame.setUint32(5, seq, true);
+            joystickSentAt.set(seq, joystickLastSent);
+            joystickSocket.send(frame.buffer);
+            return;
+        }
+        
+        fetch('/api/joystick', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
             body: JSON.stringify({
-                command: 'joystick',
                 speed: currentSpeed,
                 x: x,
                 y: y
             })
         })
-        .then(response => response.json())
-        .then(data => {
-            if (data.status === 'success') {
-                // Update UI if needed
-            }
-        })
         .catch(error => {
             console.error('Error sending joystick command:', error);
         });
@@ -401,11 +511,30 @@ document.addEventListener('DOMContentLoaded', function() {
     }
     
     /**
-     * Start periodic updates of sensor data
+     * Start updates of sensor data - pushed over Server-Sent Events when the
+     * browser supports them, otherwise polled
      */
     function startUpdates() {
         if (updateTimer) {
             clearInterval(updateTimer);
+            updateTimer = null;
+        }
+        
+        if (window.EventSource) {
+            // EventSource reconnects by itself if the stream drops
+            telemetrySource = new EventSource('/api/stream');
+            telemetrySource.addEventListener('motors', event => applyMotorStatus(JSON.parse(event.data)));
+            telemetrySource.addEventListener('distance', event => applyDistance(JSON.parse(event.data)));
+            telemetrySource.addEventListener('gps', event => {
+                applyGpsData(JSON.parse(event.data));
+                
+                // Geofence alerts are still polled, at most every 5 seconds
+                if (Date.now() - lastGeofenceCheck > 5000) {
+                    lastGeofenceCheck = Date.now();
+                    updateGeofenceStatus();
+                }
+            });
+            return;
         }
         
         updateData();
@@ -413,54 +542,61 @@ document.addEventListener('DOMContentLoaded', function() {
     }
     
     /**
-     * Update sensor data from API
+     * Update sensor data from API (fallback when Server-Sent Events are unavailable)
      */
     function updateData() {
-        // Get motor status
-        fetch('/api/motors/status')
+        // One request for all state; the browser revalidates with the ETag
+        // and gets a 304 while nothing has changed
+        fetch('/api/state')
             .then(response => response.json())
             .then(data => {
-                motorRunning = data.running;
-                currentSpeed = data.speed;
-                currentDirection = data.direction;
-                
-                // Update UI to reflect current state
-                speedControl.value = currentSpeed;
-                updateSpeedDisplay();
-                updateMotorUI();
-                updateDirectionUI(currentDirection);
-            })
-            .catch(error => {
-                console.error('Error fetching motor status:', error);
-            });
-        
-        // Get distance sensor data
-        fetch('/api/sensors/distance')
-            .then(response => response.json())
-            .then(data => {
-                if (data.distance !== undefined) {
-                    const distance = data.distance;
-                    distanceValue.textContent = `${distance} cm`;
-                    
-                    // Update distance indicator (percentage based on 0-100cm range)
-                    const percentage = Math.min(100, Math.max(0, 100 - distance));
-                    distanceIndicator.style.width = `${percentage}%`;
-                    
-                    // Color coding for distance
-                    if (distance < 15) {
-                        distanceIndicator.className = 'progress-bar bg-danger';
-                    } else if (distance < 30) {
-                        distanceIndicator.className = 'progress-bar bg-warning';
-                    } else {
-                        distanceIndicator.className = 'progress-bar bg-success';
-                    }
+                if (data.motors) {
+                    applyMotorStatus(data.motors);
+                }
+                if (data.distance) {
+                    applyDistance(data.distance);
+                }
+                if (data.gps) {
+                    applyGpsData(data.gps);
                 }
             })
             .catch(error => {
-                console.error('Error fetching sensor data:', error);
+                console.error('Error fetching dashboard state:', error);
             });
     }
     
+    function applyMotorStatus(data) {
+        motorRunning = data.running;
+        currentSpeed = data.speed;
+        currentDirection = data.direction;
+        
+        // Update UI to reflect current state
+        speedControl.value = currentSpeed;
+        updateSpeedDisplay();
+        updateMotorUI();
+        updateDirectionUI(currentDirection);
+    }
+    
+    function applyDistance(data) {
+        if (data.distance !== undefined) {
+            const distance = data.distance;
+            distanceValue.textContent = `${distance} cm`;
+            
+            // Update distance indicator (percentage based on 0-100cm range)
+            const percentage = Math.min(100, Math.max(0, 100 - distance));
+            distanceIndicator.style.width = `${percentage}%`;
+            
+            // Color coding for distance
+            if (distance < 15) {
+                distanceIndicator.className = 'progress-bar bg-danger';
+            } else if (distance < 30) {
+                distanceIndicator.className = 'progress-bar bg-warning';
+            } else {
+                distanceIndicator.className = 'progress-bar bg-success';
+            }
+        }
+    }
+    
     // Initialize GPS functionality
     function initGPS() {
         // Start GPS data updates
@@ -479,52 +615,90 @@ document.addEventListener('DOMContentLoaded', function() {
     // Update GPS data from server
     function updateGpsData() {
         fetch('/api/gps/formatted')
+            .then(response => response.json())
+            .then(applyGpsData)
+            .catch(error => {
+                console.error('Error fetching GPS data:', error);
+            });
+        
+        updateGeofenceStatus();
+    }
+    
+    function applyGpsData(data) {
+        // Update GPS status
+        const statusIndicator = document.getElementById('gps-status-indicator');
+        const statusText = document.getElementById('gps-status-text');
+        const statusDescription = document.getElementById('gps-status-description');
+        
+        // Update status indicator based on GPS status
+        statusIndicator.className = 'status-circle me-2';
+        switch (data.status) {
+            case 'active':
+                statusIndicator.classList.add('bg-gps-active');
+                statusText.textContent = 'Active';
+                break;
+            case 'no_fix':
+            case 'connected':
+                statusIndicator.classList.add('bg-gps-connecting');
+                statusText.textContent = 'Connecting';
+                break;
+            case 'disconnected':
+            case 'error':
+                statusIndicator.classList.add('bg-gps-error');
+                statusText.textContent = 'Error';
+                break;
+            default:
+                statusIndicator.classList.add('bg-secondary');
+                statusText.textContent = 'Unknown';
+        }
+        
+        // Update status description
+        statusDescription.textContent = data.status_description || 'No information available';
+        
+        // Update coordinates and other info
+        document.getElementById('gps-coordinates').textContent = data.coordinates || '--';
+        document.getElementById('gps-speed').textContent = data.speed || '--';
+        document.getElementById('gps-altitude').textContent = data.altitude || '--';
+        document.getElementById('gps-satellites').textContent = data.satellites || '--';
+        
+        // Save data for map
+        lastGpsData = data;
+        
+        // Update the map if coordinates are available
+        updateMapIfAvailable();
+    }
+    
+    // Show geofence enter/exit alerts that arrived since the last check
+    function updateGeofenceStatus() {
+        fetch('/api/geofence/status')
             .then(response => response.json())
             .then(data => {
-                // Update GPS status
-                const statusIndicator = document.getElementById('gps-status-indicator');
-                const statusText = document.getElementById('gps-status-text');
-                const statusDescription = document.getElementById('gps-status-description');
-                
-                // Update status indicator based on GPS status
-                statusIndicator.className = 'status-circle me-2';
-                switch (data.status) {
-                    case 'active':
-                        statusIndicator.classList.add('bg-gps-active');
-                        statusText.textContent = 'Active';
-                        break;
-                    case 'no_fix':
-                    case 'connected':
-                        statusIndicator.classList.add('bg-gps-connecting');
-                        statusText.textContent = 'Connecting';
-                        break;
-                    case 'disconnected':
-                    case 'error':
-                        statusIndicator.classList.add('bg-gps-error');
-                        statusText.textContent = 'Error';
-                        break;
-                    default:
-                        statusIndicator.classList.add('bg-secondary');
-                        statusText.textContent = 'Unknown';
+                // The first poll only marks where we are; events from before the page loaded are not alerts
+                if (lastGeofenceSeq === null || data.seq < lastGeofenceSeq) {
+                    // A lower seq means the server restarted and is counting again
+                    const firstPoll = lastGeofenceSeq === null;
+                    lastGeofenceSeq = firstPoll ? (data.seq || 0) : 0;
+                    if (firstPoll) {
+                        return;
+                    }
                 }
-                
-                // Update status description
-                statusDescription.textContent = data.status_description || 'No information available';
-                
-                // Update coordinates and other info
-                document.getElementById('gps-coordinates').textContent = data.coordinates || '--';
-                document.getElementById('gps-speed').textContent = data.speed || '--';
-                document.getElementById('gps-altitude').textContent = data.altitude || '--';
-                document.getElementById('gps-satellites').textContent = data.satellites || '--';
-                
-                // Save data for map
-                lastGpsData = data;
-                
-                // Update the map if coordinates are available
-                updateMapIfAvailable();
+                (data.events || []).forEach(event => {
+                    if (event.seq <= lastGeofenceSeq) {
+                        return;
+                    }
+                    lastGeofenceSeq = event.seq;
+                    
+                    if (event.alert) {
+                        const limit = event.speed_limit !== null ? ` (speed limit ${event.speed_limit}%)` : '';
+                        const message = event.event === 'enter'
+                            ? `Entered ${event.fence}${limit}`
+                            : `Left ${event.fence}`;
+                        showToast('Geofence', message, event.event === 'enter' ? 'warning' : 'info');
+                    }
+                });
             })
             .catch(error => {
-                console.error('Error fetching GPS data:', error);
+                console.error('Error fetching geofence status:', error);
             });
     }
     
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Server-Sent Events telemetry for the Smart Wheelchair web interface.
+One broadcaster thread samples the motor, distance, obstacle and GPS state
+and pushes each value to every connected dashboard only when it changes, so
+sensor reads no longer scale with the number of open browsers.
+"""
+import os
+import sys
+import json
+import time
+import queue
+import threading
+from collections import deque
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_INTERVAL = 0.2  # seconds between source samples
+QUEUE_SIZE = 16        # messages buffered per client before the oldest are dropped
+KEEPALIVE = 15         # seconds between comment lines on an idle stream
+RETRY_MS = 2000        # client reconnect delay sent to EventSource
+
+
+class MedianFilter:
+    """Median of the last few readings, to drop single ultrasonic spikes."""
+    def __init__(self, size=5):
+        self.values = deque(maxlen=size)
+
+    def add(self, value):
+        self.values.append(value)
+        ordered = sorted(self.values)
+        return ordered[len(ordered) // 2]
+
+
+def format_event(event, data):
+    """Encode one SSE message."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+class TelemetryBroadcaster:
+    """Sample named sources and fan changes out to SSE clients.
+
+    Each client has a bounded queue; a client that stops reading loses its
+    oldest messages instead of holding memory or slowing the others. The
+    sampling thread only runs while at least one client is connected.
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL, queue_size=QUEUE_SIZE, keepalive=KEEPALIVE):
+        self.interval = interval
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+
+        self.lock = threading.Lock()
+        self.sources = {}   # name -> callable returning a JSON-serializable value
+        self.latest = {}    # name -> (value, encoded message)
+        # Every source call holds sample_lock, so a sensor is never read from two threads
+        self.sample_lock = threading.Lock()
+        self.sampled = {}   # name -> (monotonic time, value) of the last sample
+        self.clients = set()
+        self.running = False
+        self.thread = None
+        self.dropped = 0
+
+    def add_source(self, name, func):
+        """Register a source; func() is called on the broadcaster thread."""
+        with self.lock:
+            self.sources[name] = func
+
+    def publish(self, name, value):
+        """Send a value to every client if it differs from the last one."""
+        with self.lock:
+            previous = self.latest.get(name)
+            if previous is not None and previous[0] == value:
+                return
+            message = format_event(name, value)
+            self.latest[name] = (value, message)
+            clients = list(self.clients)
+
+        for client in clients:
+            self._offer(client, message)
+
+    def _offer(self, client, message):
+        """Queue a message for a client, dropping its oldest one when full."""
+        while True:
+            try:
+                client.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    client.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _worker(self):
+        """Sample every source until the last client disconnects."""
+        next_sample = time.monotonic()
+        while True:
+            with self.lock:
+                if not self.clients:
+                    self.running = False
+                    break
+                sources = list(self.sources.items())
+
+            for name, func in sources:
+                try:
+                    value = self._sample(name, func)
+                except Exception as e:
+                    print(f"Error sampling telemetry source {name}: {e}")
+                    continue
+                if value is not None:
+                    self.publish(name, value)
+
+            next_sample += self.interval
+            delay = next_sample - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_sample = time.monotonic()
+
+    def _sample(self, name, func):
+        with self.sample_lock:
+            value = func()
+            self.sampled[name] = (time.monotonic(), value)
+            return value
+
+    def current(self, name, max_age=1.0):
+        """Get the last sampled value of a source, sampling it only if older than max_age.
+
+        Lets request handlers share the broadcaster's readings instead of
+        building their own samplers; while SSE clients are connected the
+        value is never more than one sample interval old.
+        """
+        with self.lock:
+            func = self.sources.get(name)
+        if func is None:
+            return None
+
+        entry = self.sampled.get(name)
+        if entry is not None and time.monotonic() - entry[0] < max_age:
+            return entry[1]
+        with self.sample_lock:
+            # Another thread may have sampled while we waited
+            entry = self.sampled.get(name)
+            if entry is not None and time.monotonic() - entry[0] < max_age:
+                return entry[1]
+        return self._sample(name, func)
+
+    def subscribe(self):
+        """Register a client queue, primed with the current value of every source."""
+        client = queue.Queue(maxsize=self.queue_size)
+        with self.lock:
+            for _, message in self.latest.values():
+                self._offer(client, message)
+            self.clients.add(client)
+            if not self.running:
+                self.running = True
+                self.thread = threading.Thread(target=self._worker)
+                self.thread.daemon = True
+                self.thread.start()
+        return client
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self.clients.discard(client)
+            # Forget cached values once nobody listens so they are resampled fresh
+            if not self.clients:
+                self.latest.clear()
+
+    def stream(self):
+        """Generate the SSE response body for one client."""
+        client = self.subscribe()
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            while True:
+                try:
+                    yield client.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield b": keepalive\n\n"
+        finally:
+            self.unsubscribe(client)
+
+    def get_status(self):
+        with self.lock:
+            return {
+                'clients': len(self.clients),
+                'running': self.running,
+                'sources': sorted(self.sources),
+                'dropped': self.dropped
+            }
+
+
+def distance_source():
+    """Build a source returning the filtered distance and obstacle level.
+
+    Uses the obstacle detection thread's readings when it is running, so the
+    ultrasonic sensor is never triggered from two places.
+    """
+    from sensors import obstacle_detection
+    distance_filter = MedianFilter()
+
+    def sample():
+        if obstacle_detection.is_running:
+            distance = obstacle_detection.get_obstacle_data()['distance']
+        else:
+            from sensors.distance_sensor import read_distance
+            distance = read_distance()
+        if distance is None:
+            return None
+
+        distance = round(distance_filter.add(distance), 1)
+        if distance <= obstacle_detection.OBSTACLE_THRESHOLD_DANGER:
+            level = 'danger'
+        elif distance <= obstacle_detection.OBSTACLE_THRESHOLD_WARNING:
+            level = 'warning'
+        elif distance <= obstacle_detection.OBSTACLE_THRESHOLD_CAUTION:
+            level = 'caution'
+        else:
+            level = 'none'
+        return {'distance': distance, 'warning_level': level}
+
+    return sample
+
+
+def gps_source():
+    """Build a source returning the formatted GPS display data."""
+    from sensors import gps_module
+    cache = {'version': None, 'value': None}
+
+    def sample():
+        snapshot = gps_module.get_gps_snapshot()
+        if snapshot.version != cache['version']:
+            cache['version'] = snapshot.version
+            cache['value'] = gps_module.format_gps_for_display(snapshot)
+        return cache['value']
+
+    return sample
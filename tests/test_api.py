@@ -0,0 +1,32 @@
+import unittest
+from flask import Flask
+from src.web import api
+from src.web.rate_limit import RateLimiter
+
+class TestMotorRoutes(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.app = Flask(__name__)
+        api.register(self.app, self.drive, RateLimiter(rate=1, burst=2))
+        self.client = self.app.test_client()
+
+    def drive(self, command, speed=None):
+        self.calls.append((command, speed))
+        return {'status': 'error', 'message': 'Motors not started'}
+
+    def test_motor_routes_use_shared_drive_path(self):
+        response = self.client.post('/api/v2/motors/forward', json={'speed': 30})
+        self.assertEqual(response.get_json()['message'], 'Motors not started')
+        self.client.post('/api/v2/motors/stop')
+        # A bodyless command keeps the current speed
+        self.assertEqual(self.calls, [('forward', 30), ('stop', None)])
+
+    def test_motor_routes_are_rate_limited(self):
+        statuses = [self.client.post('/api/v2/motors/forward').status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+        # Stop is never limited
+        self.assertEqual(self.client.post('/api/v2/motors/stop').status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import gzip
+import shutil
+import tempfile
+import unittest
+from flask import Flask
+from src.web import assets
+
+class TestAssetBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.static_dir = os.path.join(self.directory, 'static')
+        self.dist_dir = os.path.join(self.static_dir, 'dist')
+        os.makedirs(os.path.join(self.static_dir, 'css'))
+        with open(os.path.join(self.static_dir, 'css', 'dashboard.css'), 'w') as f:
+            f.write("/* dashboard */\nbody {\n    color: red;\n}\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_build_hashes_minifies_and_compresses(self):
+        manifest = assets.build(self.static_dir, self.dist_dir)
+        name = manifest['css/dashboard.css']
+        self.assertRegex(name, r'^css/dashboard\.[0-9a-f]{10}\.css$')
+
+        with open(os.path.join(self.dist_dir, name), 'rb') as f:
+            data = f.read()
+        self.assertEqual(data, b'body{color: red}')
+        with open(os.path.join(self.dist_dir, name + '.gz'), 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), data)
+
+    def test_served_with_long_cache_and_encoding(self):
+        manifest = assets.build(self.static_dir, self.dist_dir)
+        app = Flask(__name__)
+        assets.register(app, self.dist_dir)
+        client = app.test_client()
+
+        with app.test_request_context():
+            url = app.jinja_env.globals['asset_url']('css/dashboard.css')
+            self.assertEqual(url, '/assets/' + manifest['css/dashboard.css'])
+            # Vendored libraries fall back to the CDN until they are fetched
+            if not os.path.exists(os.path.join(assets.STATIC_DIR, 'vendor/nipplejs.min.js')):
+                self.assertTrue(app.jinja_env.globals['asset_url']('vendor/nipplejs.min.js').startswith('https://'))
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.mimetype, 'text/css')
+        self.assertIn('immutable', response.headers['Cache-Control'])
+        self.assertEqual(gzip.decompress(response.data), b'body{color: red}')
+        response.close()
+
+        response = client.get(url)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.data, b'body{color: red}')
+        response.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import threading
+import unittest
+from unittest import mock
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from src import camera_discovery
+
+class FakeDroidCam(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'<html><title>DroidCam</title></html>')
+
+    def log_message(self, *args):
+        pass
+
+class TestCameraDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), FakeDroidCam)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        # Look for DroidCam on the fake camera's port and IP Webcam on a closed one
+        signatures = {
+            'droidcam': dict(camera_discovery.CAMERA_SIGNATURES['droidcam'], port=self.server.server_port),
+            'ip_webcam': dict(camera_discovery.CAMERA_SIGNATURES['ip_webcam'], port=1)
+        }
+        patch = mock.patch.dict(camera_discovery.CAMERA_SIGNATURES, signatures)
+        patch.start()
+        self.addCleanup(patch.stop)
+        camera_discovery.clear_cache()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        camera_discovery.clear_cache()
+
+    def test_finds_camera_by_signature(self):
+        found = []
+        cameras = camera_discovery.discover_cameras(timeout=1.0, subnet='127.0.0.1/32', callback=found.append)
+        self.assertEqual([(camera['ip'], camera['type']) for camera in cameras], [('127.0.0.1', 'droidcam')])
+        self.assertEqual(cameras[0]['port'], str(self.server.server_port))
+        self.assertEqual(found, cameras)
+
+    def test_results_cached(self):
+        cameras = camera_discovery.discover_cameras(timeout=1.0, subnet='127.0.0.1/32')
+        self.server.shutdown()
+        self.server.server_close()
+        self.assertEqual(camera_discovery.discover_cameras(timeout=1.0, subnet='127.0.0.1/32'), cameras)
+        self.assertEqual(camera_discovery.discover_cameras(timeout=1.0, subnet='127.0.0.1/32', use_cache=False), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import time
+import socket
+import unittest
+from src import camera_http
+
+class TestBackoff(unittest.TestCase):
+
+    def setUp(self):
+        camera_http.health.clear()
+
+    def test_repeated_failures_back_off(self):
+        url = 'http://10.0.0.9:8080/shot.jpg'
+        self.assertFalse(camera_http.is_backing_off(url))
+
+        camera_http._record(url, False, 'timeout')
+        self.assertFalse(camera_http.is_backing_off(url))
+        camera_http._record(url, False, 'timeout')
+        self.assertTrue(camera_http.is_backing_off(url))
+        self.assertIsNone(camera_http.fetch(url))
+
+    def test_success_ends_backoff(self):
+        url = 'http://10.0.0.9:8080/shot.jpg'
+        for _ in range(camera_http.BACKOFF_FAILURES):
+            camera_http._record(url, False)
+        camera_http._record(url, True)
+        self.assertFalse(camera_http.is_backing_off(url))
+
+@unittest.skipUnless(camera_http.REQUESTS_AVAILABLE, "requests not installed")
+class TestFetchDeadline(unittest.TestCase):
+
+    def setUp(self):
+        camera_http.health.clear()
+        # Accepts connections but never answers, like a stalled phone
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(4)
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_caller_released_at_deadline(self):
+        url = f"http://127.0.0.1:{self.server.getsockname()[1]}/status.json"
+        start = time.time()
+        self.assertIsNone(camera_http.fetch(url, kind='status', deadline=0.3))
+        self.assertLess(time.time() - start, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import threading
+import unittest
+from unittest import mock
+
+# The camera modules import their siblings by bare name
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from src import droidcam_simple
+
+try:
+    from src import droidcam_usb
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+class SlowConnect:
+    """connect_droidcam() stand-in that blocks like an adb restart until released."""
+    def __init__(self):
+        self.release = threading.Event()
+        self.threads = []
+
+    def __call__(self, ip=None, port=None):
+        self.threads.append(threading.current_thread())
+        self.release.wait(5)
+        return False, "No Android device connected via USB"
+
+class TestLazyConnect(unittest.TestCase):
+
+    def setUp(self):
+        self.connect = SlowConnect()
+        self.addCleanup(self.connect.release.set)
+
+    def test_still_image_does_not_wait_for_adb(self):
+        droidcam_simple.droidcam_connected = False
+        with mock.patch.object(droidcam_simple, 'connect_droidcam', self.connect), \
+             mock.patch.object(droidcam_simple.camera_http, 'get', side_effect=IOError("refused")):
+            start = time.time()
+            self.assertIsNone(droidcam_simple.get_still_image())
+            self.assertLess(time.time() - start, 1.0)
+
+            # The connection is set up in the background for the next call
+            self.connect.release.set()
+            droidcam_simple.connect_thread.join(2.0)
+            self.assertEqual(self.connect.threads, [droidcam_simple.connect_thread])
+
+    @unittest.skipUnless(CV2_AVAILABLE, "cv2 not installed")
+    def test_usb_capture_connects_on_worker(self):
+        droidcam_usb.droidcam_connected = False
+        with mock.patch.object(droidcam_usb, 'connect_droidcam', self.connect), \
+             mock.patch.object(droidcam_usb.cv2, 'VideoCapture') as capture:
+            capture.return_value.isOpened.return_value = False
+            start = time.time()
+            self.assertEqual(droidcam_usb.start_capture(), (True, "Capture started successfully"))
+            self.assertLess(time.time() - start, 1.0)
+
+            worker = droidcam_usb.capture_thread
+            self.connect.release.set()
+            worker.join(2.0)
+            self.assertEqual(self.connect.threads, [worker])
+            self.assertFalse(droidcam_usb.capture_running)
+
+class TestStreamWorkerStart(unittest.TestCase):
+
+    def test_concurrent_requests_start_one_worker(self):
+        started = []
+        release = threading.Event()
+
+        def worker():
+            started.append(threading.current_thread())
+            release.wait(5)
+            with droidcam_simple.stream_lock:
+                droidcam_simple.stream_running = False
+
+        with mock.patch.object(droidcam_simple, '_stream_worker', worker):
+            requests = [threading.Thread(target=droidcam_simple.get_frame, args=(0.05,)) for _ in range(8)]
+            for request in requests:
+                request.start()
+            for request in requests:
+                request.join(2.0)
+            release.set()
+            droidcam_simple.stream_thread.join(2.0)
+        self.assertEqual(len(started), 1)
+
+if __name__ == '__main__':
+    unittest.main()
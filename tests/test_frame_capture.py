@@ -0,0 +1,105 @@
+import time
+import threading
+import unittest
+from unittest import mock
+
+try:
+    import cv2
+    import numpy as np
+    from src import frame_capture
+    from src.frame_capture import PacedCapture
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+def image(value):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+@unittest.skipUnless(CV2_AVAILABLE, "cv2 not installed")
+class TestEncodedFrameCache(unittest.TestCase):
+
+    def setUp(self):
+        self.capture = PacedCapture()
+
+    def captured(self, frame):
+        with self.capture.frame_lock:
+            self.capture.latest_frame = frame
+            self.capture.frame_sequence += 1
+
+    def test_no_frame_yet(self):
+        self.assertEqual(self.capture.get_frame_and_sequence(), (None, 0))
+
+    def test_encoded_once_per_sequence(self):
+        self.captured(image(0))
+        with mock.patch.object(frame_capture.cv2, 'imencode', wraps=cv2.imencode) as imencode:
+            first, sequence = self.capture.get_frame_and_sequence()
+            second, _ = self.capture.get_frame_and_sequence()
+            self.assertIs(first, second)
+            self.assertEqual(imencode.call_count, 1)
+
+            # A new capture invalidates the cached JPEG
+            self.captured(image(255))
+            third, new_sequence = self.capture.get_frame_and_sequence()
+            self.assertEqual(new_sequence, sequence + 1)
+            self.assertNotEqual(third, first)
+            self.assertEqual(imencode.call_count, 2)
+
+    def test_if_newer_than_skips_known_frames(self):
+        self.captured(image(0))
+        frame, sequence = self.capture.get_frame_and_sequence()
+        self.assertEqual(self.capture.get_frame_and_sequence(if_newer_than=sequence), (None, sequence))
+        self.captured(image(255))
+        self.assertIsNotNone(self.capture.get_frame_and_sequence(if_newer_than=sequence)[0])
+
+class FakeCapture:
+    """Camera that delivers a frame every few milliseconds."""
+    def __init__(self):
+        self.grabbed = 0
+        self.retrieved = 0
+
+    def grab(self):
+        time.sleep(0.002)
+        self.grabbed += 1
+        return True
+
+    def retrieve(self):
+        self.retrieved += 1
+        return True, image(self.retrieved % 256)
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+@unittest.skipUnless(CV2_AVAILABLE, "cv2 not installed")
+class TestCapturePacing(unittest.TestCase):
+
+    def setUp(self):
+        self.camera = FakeCapture()
+        self.capture = PacedCapture()
+        self.capture.latest_frame = image(0)  # left over from before the idle period
+        self.capture.frame_sequence = 1
+
+        self.running = True
+        thread = threading.Thread(target=self.capture.run, args=(self.camera, lambda: self.running))
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(thread.join, 1.0)
+        self.addCleanup(self.capture.wake)
+        self.addCleanup(setattr, self, 'running', False)
+
+    def test_idle_worker_grabs_without_decoding(self):
+        self.assertTrue(wait_for(lambda: self.camera.grabbed > 0))
+        self.assertEqual(self.camera.retrieved, 0)
+
+    def test_no_stale_frame_after_idle(self):
+        self.assertTrue(wait_for(lambda: self.capture.latest_frame is None))
+        self.assertEqual(self.capture.get_frame_and_sequence(), (None, 1))
+
+        # The request wakes the worker, which flushes the buffer and decodes a current frame
+        self.assertTrue(wait_for(lambda: self.capture.get_frame_and_sequence(if_newer_than=1)[0] is not None))
+        self.assertGreater(self.camera.grabbed, self.capture.flush_frames)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from src.web.frame_tiers import FrameTierCache, reduce_factor, CV2_AVAILABLE
+
+if CV2_AVAILABLE:
+    import cv2
+    import numpy as np
+
+def jpeg(width, height):
+    ret, data = cv2.imencode('.jpg', np.zeros((height, width, 3), dtype=np.uint8))
+    return data.tobytes()
+
+class TestReduceFactor(unittest.TestCase):
+
+    def test_largest_factor_that_keeps_the_width(self):
+        self.assertEqual(reduce_factor(1920, 160), 8)
+        self.assertEqual(reduce_factor(1920, 480), 4)
+        self.assertEqual(reduce_factor(640, 480), 1)
+        self.assertEqual(reduce_factor(960, 480), 2)
+
+    def test_full_decode_until_width_is_known(self):
+        self.assertEqual(reduce_factor(None, 160), 1)
+
+@unittest.skipUnless(CV2_AVAILABLE, "cv2 not installed")
+class TestFrameTierCache(unittest.TestCase):
+
+    def test_source_width_follows_resolution_changes(self):
+        tiers = FrameTierCache(relay=None, tiers={'thumbnail': (160, 60)})
+        tiers.transform('thumbnail', jpeg(1280, 720), 1)
+        self.assertEqual(tiers.source_width, 1280)
+
+        # Reduced decodes still report the full camera width
+        tiers.transform('thumbnail', jpeg(1280, 720), 2)
+        self.assertEqual(tiers.source_width, 1280)
+
+        tiers.transform('thumbnail', jpeg(320, 240), 3)
+        self.assertEqual(tiers.source_width, 320)
+        image = cv2.imdecode(np.frombuffer(tiers.transform('thumbnail', jpeg(320, 240), 4), dtype=np.uint8),
+                             cv2.IMREAD_COLOR)
+        self.assertEqual(image.shape[1], 160)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from src.navigation import geofence
+from src.navigation.geofence import Geofence, GeofenceEngine
+
+SQUARE = [(0.0, 0.0), (0.0, 0.002), (0.002, 0.002), (0.002, 0.0)]
+
+class TestGeofence(unittest.TestCase):
+
+    def test_contains(self):
+        fence = Geofence('square', SQUARE)
+        self.assertTrue(fence.contains(0.001, 0.001))
+        self.assertFalse(fence.contains(0.003, 0.001))
+        self.assertFalse(fence.contains(0.001, -0.001))
+
+    def test_requires_three_points(self):
+        with self.assertRaises(ValueError):
+            Geofence('line', [(0, 0), (1, 1)])
+
+class TestGeofenceEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = GeofenceEngine([Geofence('corridor', SQUARE, speed_limit=30)], grid_size=0.001)
+
+    def test_enter_and_exit_events(self):
+        self.assertEqual(self.engine.update(0.005, 0.005), [])
+
+        events = self.engine.update(0.0015, 0.0015)
+        self.assertEqual([(event, fence.name) for event, fence in events], [('enter', 'corridor')])
+        self.assertEqual(self.engine.active_speed_limit(), 30)
+
+        # Staying inside produces no new events
+        self.assertEqual(self.engine.update(0.0012, 0.0012), [])
+
+        # Leaving into a cell the fence does not touch still reports the exit
+        events = self.engine.update(0.01, 0.01)
+        self.assertEqual([(event, fence.name) for event, fence in events], [('exit', 'corridor')])
+        self.assertIsNone(self.engine.active_speed_limit())
+
+class TestGeofenceEvents(unittest.TestCase):
+
+    def setUp(self):
+        geofence.engine = GeofenceEngine([Geofence('hall', SQUARE)], grid_size=0.001)
+
+    def tearDown(self):
+        geofence.engine = None
+
+    def test_events_numbered_in_order(self):
+        start = geofence.get_geofence_status()['seq']
+        geofence.check_position(0.001, 0.001)
+        geofence.check_position(0.01, 0.01)
+
+        status = geofence.get_geofence_status()
+        self.assertEqual([event['seq'] for event in status['events'][-2:]], [start + 1, start + 2])
+        self.assertEqual(status['seq'], start + 2)
+
+if __name__ == '__main__':
+    unittest.main()
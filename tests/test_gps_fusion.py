@@ -0,0 +1,40 @@
+import unittest
+from src.sensors.gps_fusion import DeadReckoningFilter
+
+class TestDeadReckoningFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.estimator = DeadReckoningFilter(max_speed=1.0, wheel_base=0.5,
+                                             correction_gain=0.5, reset_distance=30.0)
+
+    def test_no_position_before_first_fix(self):
+        self.estimator.predict(100, 100, 1.0)
+        self.assertIsNone(self.estimator.position())
+
+    def test_first_fix_sets_position(self):
+        self.estimator.correct(51.5, -0.1)
+        latitude, longitude = self.estimator.position()
+        self.assertAlmostEqual(latitude, 51.5)
+        self.assertAlmostEqual(longitude, -0.1)
+
+    def test_predict_moves_along_heading(self):
+        """Driving north at full speed for 2 s should move about 2 m north."""
+        self.estimator.correct(51.5, -0.1)
+        self.estimator.predict(100, 100, 2.0, heading=0)
+        self.assertAlmostEqual(self.estimator.north, 2.0)
+        self.assertAlmostEqual(self.estimator.east, 0.0)
+
+    def test_correction_blends_towards_fix(self):
+        self.estimator.correct(51.5, -0.1)
+        self.estimator.north = 10.0
+        self.estimator.correct(51.5, -0.1)
+        self.assertAlmostEqual(self.estimator.north, 5.0)
+
+    def test_large_error_snaps_to_fix(self):
+        self.estimator.correct(51.5, -0.1)
+        self.estimator.north = 100.0
+        self.estimator.correct(51.5, -0.1)
+        self.assertAlmostEqual(self.estimator.north, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from src.sensors import gps_module
+from src.sensors.gps_source import ReplaySource, _nmea_seconds
+from src.sensors.gps_port_finder import nmea_checksum_valid
+
+GGA = b'$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47\n'
+RMC = b'$GPRMC,123519,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W*6A\n'
+
+class TestGPSSnapshot(unittest.TestCase):
+
+    def test_snapshot_is_immutable(self):
+        snapshot = gps_module.GPSSnapshot(latitude=1.0)
+        with self.assertRaises(AttributeError):
+            snapshot.latitude = 2.0
+
+    def test_publish_swaps_snapshot_and_bumps_version(self):
+        before = gps_module.get_gps_snapshot()
+        gps_module._publish(latitude=51.5, longitude=-0.1, status='active')
+        after = gps_module.get_gps_snapshot()
+
+        self.assertIsNot(before, after)
+        self.assertEqual(after.version, before.version + 1)
+        self.assertEqual(after.latitude, 51.5)
+        self.assertEqual(gps_module.get_gps_data()['status'], 'active')
+
+class TestReplaySource(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.nmea')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(GGA + RMC)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_nmea_seconds(self):
+        self.assertEqual(_nmea_seconds(GGA.strip()), 12 * 3600 + 35 * 60 + 19)
+        self.assertIsNone(_nmea_seconds(b'$GPGSV,3,1,11'))
+
+    def test_replay_reads_all_lines_then_stops(self):
+        with ReplaySource(self.path, speed=0) as source:
+            self.assertEqual(source.readline(), GGA)
+            self.assertEqual(source.readline(), RMC)
+            with self.assertRaises(EOFError):
+                source.readline()
+
+    def test_replay_loops(self):
+        with ReplaySource(self.path, speed=0, loop=True) as source:
+            lines = [source.readline() for _ in range(3)]
+        self.assertEqual(lines, [GGA, RMC, GGA])
+
+class TestPortProbe(unittest.TestCase):
+
+    def test_valid_checksum(self):
+        self.assertTrue(nmea_checksum_valid(GGA))
+        self.assertTrue(nmea_checksum_valid(RMC.decode('ascii')))
+
+    def test_invalid_checksum(self):
+        self.assertFalse(nmea_checksum_valid(GGA.replace(b'*47', b'*48')))
+        self.assertFalse(nmea_checksum_valid(b'\x00\xff garbage'))
+        self.assertFalse(nmea_checksum_valid(b''))
+
+if __name__ == '__main__':
+    unittest.main()
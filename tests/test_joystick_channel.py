@@ -0,0 +1,55 @@
+import time
+import unittest
+from src.web.joystick_channel import (JoystickCoalescer, decode_frame, encode_frame,
+                                      handle_connection, ACK)
+
+class FakeSocket:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.sent = []
+
+    def receive(self):
+        return self.frames.pop(0) if self.frames else None
+
+    def send(self, data):
+        self.sent.append(ACK.unpack(data))
+
+class TestJoystickChannel(unittest.TestCase):
+
+    def test_frame_round_trip(self):
+        x, y, speed, seq = decode_frame(encode_frame(-0.5, 1.0, 80, 7))
+        self.assertAlmostEqual(x, -0.5)
+        self.assertAlmostEqual(y, 1.0)
+        self.assertEqual((speed, seq), (80, 7))
+        self.assertIsNone(decode_frame(b'\x00\x01'))
+
+    def test_out_of_order_frames_dropped(self):
+        applied = []
+        coalescer = JoystickCoalescer(lambda x, y, speed: applied.append((x, y, speed)))
+        ws = FakeSocket([encode_frame(0, 0.5, 50, 2), encode_frame(0, 0.9, 50, 1)])
+        handle_connection(ws, coalescer)
+        self.assertEqual(ws.sent, [(2, 1), (1, 0)])
+
+        # The close always ends on a stop
+        deadline = time.time() + 1
+        while time.time() < deadline and (not applied or applied[-1] != (0.0, 0.0, 0)):
+            time.sleep(0.01)
+        self.assertEqual(applied[-1], (0.0, 0.0, 0))
+        self.assertNotIn((0.0, 0.9, 50), applied)
+
+    def test_pending_target_is_replaced(self):
+        applied = []
+        coalescer = JoystickCoalescer(lambda x, y, speed: applied.append((x, y, speed)))
+        # Hold the lock so the worker cannot take a target in between
+        with coalescer.condition:
+            coalescer.submit(0.0, 0.2, 50)
+            coalescer.submit(0.0, 0.4, 50)
+            coalescer.submit(0.0, 0.6, 50)
+        deadline = time.time() + 1
+        while time.time() < deadline and not applied:
+            time.sleep(0.01)
+        self.assertEqual(applied, [(0.0, 0.6, 50)])
+        self.assertEqual(coalescer.coalesced, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from flask import Flask
+from src.web.metrics import Histogram, MetricsRegistry, instrument
+
+class TestHistogram(unittest.TestCase):
+
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+        for value in (0.005, 0.05, 0.05, 5.0):
+            histogram.observe(value)
+
+        counts, total, count = histogram.snapshot()
+        self.assertEqual(counts, [1, 3, 3, 4])
+        self.assertEqual(count, 4)
+        self.assertAlmostEqual(total, 5.105)
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_spans_are_reused_and_nest(self):
+        outer = self.registry.span('motor_init')
+        self.assertIs(self.registry.span('motor_init'), outer)
+
+        with outer:
+            with self.registry.span('gpio'):
+                pass
+        self.assertEqual(outer.histogram.count, 1)
+        self.assertEqual(self.registry.span('gpio').histogram.count, 1)
+        self.assertEqual(self.registry.local.starts, [])
+
+    def test_instrumented_app_exports_routes(self):
+        app = Flask(__name__)
+
+        @app.route('/ping')
+        def ping():
+            return 'pong'
+
+        instrument(app, self.registry)
+        client = app.test_client()
+        client.get('/ping')
+        client.get('/missing')
+
+        text = self.registry.render()
+        self.assertIn('http_request_duration_seconds_count{route="ping"} 1', text)
+        self.assertIn('http_requests_total{route="ping",status="2xx"} 1', text)
+        self.assertIn('http_requests_total{route="unmatched",status="4xx"} 1', text)
+        self.assertIn('http_requests_in_flight{route="ping"} 0', text)
+
+if __name__ == '__main__':
+    unittest.main()
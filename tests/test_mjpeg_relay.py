@@ -0,0 +1,109 @@
+import io
+import time
+import threading
+import unittest
+from unittest import mock
+from src.web import mjpeg_relay
+from src.web.mjpeg_relay import MJPEGRelay
+from src import camera_http
+
+JPEG_A = b'\xff\xd8' + b'A' * 100 + b'\xff\xd9'
+JPEG_B = b'\xff\xd8' + b'B' * 200 + b'\xff\xd9'
+JPEG_C = b'\xff\xd8' + b'C' * 300 + b'\xff\xd9'
+
+class OpenStream(io.BytesIO):
+    """Upstream that stays connected after its frames until closed."""
+    def __init__(self, data):
+        super().__init__(data)
+        self.closed_event = threading.Event()
+
+    def readinto(self, buffer):
+        count = super().readinto(buffer)
+        if not count:
+            self.closed_event.wait(2.0)
+        return count
+
+class FakeResponse:
+    status_code = 200
+    headers = {'Content-Type': 'multipart/x-mixed-replace; boundary=frame'}
+
+    def __init__(self, *frames):
+        self.raw = OpenStream(b''.join(
+            b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + frame + b'\r\n' for frame in frames
+        ) + b'--frame\r\n')
+
+    def close(self):
+        self.raw.closed_event.set()
+
+@unittest.skipUnless(camera_http.REQUESTS_AVAILABLE, "requests not installed")
+class TestMJPEGRelay(unittest.TestCase):
+
+    def setUp(self):
+        self.relay = MJPEGRelay(lambda: 'http://camera/video', idle_timeout=0.1,
+                                reconnect_delay=0.05, detect_changes=False)
+        patch = mock.patch.object(mjpeg_relay.camera_http, 'get')
+        self.get = patch.start()
+        self.addCleanup(patch.stop)
+        self.addCleanup(self.wait_stopped)
+
+    def connect(self, *frames):
+        response = FakeResponse(*frames)
+        self.get.return_value = response
+        self.addCleanup(response.close)
+        return response
+
+    def wait_stopped(self):
+        if self.relay.thread is None:
+            return True
+        deadline = time.time() + 2.0
+        while self.relay.get_status()['running'] and time.time() < deadline:
+            time.sleep(0.02)
+        return not self.relay.get_status()['running']
+
+    def test_one_upstream_connection_for_many_clients(self):
+        self.connect(JPEG_A, JPEG_B)
+        frame, sequence = self.relay.get_frame(timeout=2.0)
+        self.assertIn(frame, (JPEG_A, JPEG_B))
+        self.assertEqual(self.relay.get_frame(if_newer_than=1, timeout=2.0), (JPEG_B, 2))
+        self.assertEqual(self.get.call_count, 1)
+
+    def test_slow_client_gets_latest_frame(self):
+        self.relay.running = True  # frames are published by hand
+        for frame in (JPEG_A, JPEG_B, JPEG_C):
+            self.relay._publish(frame)
+        self.assertEqual(self.relay.get_frame(if_newer_than=0), (JPEG_C, 3))
+        self.assertEqual(self.relay.get_frame(if_newer_than=3, timeout=0.05), (None, 3))
+
+    def test_stream_parts(self):
+        self.relay.running = True
+        self.relay._publish(JPEG_A)
+        stream = self.relay.stream(transform=lambda frame, sequence: frame[:4])
+        part = next(stream)
+        self.assertEqual(self.relay.get_status()['clients'], 1)
+        self.assertEqual(part, b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: 4\r\n\r\n'
+                               + JPEG_A[:4] + b'\r\n')
+        stream.close()
+        self.assertEqual(self.relay.get_status()['clients'], 0)
+
+    def test_worker_stops_without_clients(self):
+        response = self.connect(JPEG_A)
+        self.relay.get_frame(timeout=2.0)
+        response.close()  # the camera hangs up; the relay only reconnects while there is demand
+        self.assertTrue(self.wait_stopped())
+
+        # A viewer arriving later must not get the frame from before the shutdown
+        self.assertIsNone(self.relay.frame)
+        response = self.connect(JPEG_B)
+        self.assertEqual(self.relay.get_frame(timeout=2.0)[0], JPEG_B)
+        response.close()
+
+class TestRelayWithoutRequests(unittest.TestCase):
+
+    def test_stream_ends_at_once(self):
+        relay = MJPEGRelay(lambda: 'http://camera/video', detect_changes=False)
+        with mock.patch.object(mjpeg_relay.camera_http, 'REQUESTS_AVAILABLE', False):
+            self.assertEqual(list(relay.stream()), [])
+        self.assertEqual(relay.get_status()['clients'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
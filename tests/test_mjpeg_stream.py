@@ -0,0 +1,52 @@
+import io
+import unittest
+from src.mjpeg_stream import MJPEGDemuxer, boundary_from_content_type
+
+JPEG_A = b'\xff\xd8' + b'A' * 100 + b'\xff\xd9'
+JPEG_B = b'\xff\xd8' + b'B' * 5000 + b'\xff\xd9'
+
+def part(jpeg, boundary=b'--myboundary', content_length=True):
+    headers = b'Content-Type: image/jpeg\r\n'
+    if content_length:
+        headers += b'Content-Length: ' + str(len(jpeg)).encode() + b'\r\n'
+    return boundary + b'\r\n' + headers + b'\r\n' + jpeg + b'\r\n'
+
+class TestMJPEGDemuxer(unittest.TestCase):
+
+    def collect(self, demuxer, data, chunk_size):
+        frames = []
+        for i in range(0, len(data), chunk_size):
+            demuxer.feed(data[i:i + chunk_size])
+            frames.extend(bytes(frame) for frame in demuxer.frames())
+        return frames
+
+    def test_boundary_from_content_type(self):
+        self.assertEqual(boundary_from_content_type('multipart/x-mixed-replace; boundary="--frame"'), b'--frame')
+        self.assertIsNone(boundary_from_content_type('image/jpeg'))
+
+    def test_parts_with_content_length(self):
+        data = part(JPEG_A) + part(JPEG_B) + part(JPEG_A)
+        frames = self.collect(MJPEGDemuxer(b'myboundary', buffer_size=64), data, 7)
+        self.assertEqual(frames, [JPEG_A, JPEG_B, JPEG_A])
+
+    def test_parts_without_content_length(self):
+        data = b''.join(part(jpeg, content_length=False) for jpeg in (JPEG_A, JPEG_B, JPEG_A))
+        frames = self.collect(MJPEGDemuxer(b'--myboundary'), data, 1000)
+        # The last part only completes when the next boundary arrives
+        self.assertEqual(frames, [JPEG_A, JPEG_B])
+
+    def test_soi_eoi_scanning(self):
+        data = b'garbage' + JPEG_A + b'\r\n' + JPEG_B
+        frames = self.collect(MJPEGDemuxer(buffer_size=128), data, 333)
+        self.assertEqual(frames, [JPEG_A, JPEG_B])
+
+    def test_readinto(self):
+        demuxer = MJPEGDemuxer(b'myboundary')
+        stream = io.BytesIO(part(JPEG_A) + part(JPEG_B))
+        frames = []
+        while demuxer.readinto(stream, 256):
+            frames.extend(bytes(frame) for frame in demuxer.frames())
+        self.assertEqual(frames, [JPEG_A, JPEG_B])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from src.motion_detection import ChangeDetector, CV2_AVAILABLE
+
+if CV2_AVAILABLE:
+    import cv2
+    import numpy as np
+
+def jpeg(value, box=None):
+    image = np.full((240, 320, 3), value, dtype=np.uint8)
+    if box is not None:
+        image[:120, :160] = box
+    ret, data = cv2.imencode('.jpg', image)
+    return data.tobytes()
+
+@unittest.skipUnless(CV2_AVAILABLE, "cv2 not installed")
+class TestChangeDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.detector = ChangeDetector(threshold=0.05, keepalive=2.0)
+
+    def test_first_frame_is_new(self):
+        self.assertEqual(self.detector.check(jpeg(100), now=100), (True, 1.0))
+
+    def test_unchanged_frames_suppressed_until_keepalive(self):
+        self.detector.check(jpeg(100), now=100)
+        is_new, score = self.detector.check(jpeg(100), now=101)
+        self.assertFalse(is_new)
+        self.assertEqual(score, 0.0)
+
+        # One unchanged frame gets through per keepalive period
+        self.assertTrue(self.detector.check(jpeg(100), now=102)[0])
+        self.assertFalse(self.detector.check(jpeg(100), now=103)[0])
+        self.assertEqual(self.detector.get_status()['last_motion_time'], 100)
+
+    def test_changed_frame_passes_and_moves_reference(self):
+        self.detector.check(jpeg(100), now=100)
+        is_new, score = self.detector.check(jpeg(100, box=250), now=100.5)
+        self.assertTrue(is_new)
+        self.assertGreater(score, 0.2)
+        self.assertEqual(self.detector.get_status()['last_motion_time'], 100.5)
+
+        # Compared with the changed frame now, not the first one
+        self.assertFalse(self.detector.check(jpeg(100, box=250), now=101)[0])
+
+if __name__ == '__main__':
+    unittest.main()
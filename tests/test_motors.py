@@ -1,5 +1,8 @@
 import unittest
+from unittest import mock
+from src.motor_control import pi_to_motor
 from src.motor_control.pi_to_motor import initialize_motors, set_motor_speed, move_forward, move_backward, turn_left, turn_right, stop, cleanup_motors
+from src.motor_control.pi_to_motor import emergency_stop, clear_emergency_stop, motor_speeds
 
 class TestMotorControl(unittest.TestCase):
 
@@ -42,5 +45,28 @@ class TestMotorControl(unittest.TestCase):
         """Test stopping the motors."""
         self.assertTrue(stop())
 
+    def test_emergency_stop_latches(self):
+        """Test that motion is refused until the stop is cleared."""
+        self.assertTrue(move_forward(50))
+        self.assertTrue(emergency_stop())
+        try:
+            self.assertFalse(move_forward(50))
+            self.assertFalse(set_motor_speed(1, 50))
+            self.assertEqual(motor_speeds[1], 0)
+        finally:
+            self.assertTrue(clear_emergency_stop())
+        self.assertTrue(move_forward(50))
+
+    def test_speed_limit_reaches_every_motor(self):
+        """Test that one failed write does not skip the other motors."""
+        self.assertTrue(move_forward(80))
+        try:
+            with mock.patch.object(pi_to_motor, 'set_motor_speed', return_value=False) as write:
+                self.assertFalse(pi_to_motor.set_speed_limit(30))
+            running = [n for n in range(1, 5) if pi_to_motor.motor_pwm[n] is not None]
+            self.assertEqual(write.call_count, len(running))
+        finally:
+            pi_to_motor.set_speed_limit(None)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
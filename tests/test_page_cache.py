@@ -0,0 +1,42 @@
+import unittest
+from flask import Flask
+from jinja2 import DictLoader
+from src.web.page_cache import PageCache
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.jinja_loader = DictLoader({'page.html': 'camera at {{ ip_camera_url }}'})
+        self.pages = PageCache()
+        self.url = 'http://10.0.0.2:8080'
+
+        @self.app.route('/')
+        def index():
+            return self.pages.response('page.html', ip_camera_url=self.url)
+
+        self.client = self.app.test_client()
+
+    def test_rendered_once_per_arguments(self):
+        self.assertEqual(self.client.get('/').data, b'camera at http://10.0.0.2:8080')
+        self.client.get('/')
+        self.assertEqual(self.pages.get_status(), {'pages': 1, 'hits': 1, 'misses': 1})
+
+        self.url = 'http://10.0.0.3:8080'
+        self.assertEqual(self.client.get('/').data, b'camera at http://10.0.0.3:8080')
+        self.assertEqual(self.pages.get_status()['pages'], 2)
+
+    def test_etag_revalidation(self):
+        etag = self.client.get('/').headers['ETag']
+        response = self.client.get('/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_invalidate_rerenders(self):
+        self.client.get('/')
+        self.pages.invalidate({}, {})
+        self.client.get('/')
+        self.assertEqual(self.pages.get_status()['misses'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
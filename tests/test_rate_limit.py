@@ -0,0 +1,41 @@
+import unittest
+from unittest import mock
+from src.web.rate_limit import RateLimiter
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch('src.web.rate_limit.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = RateLimiter(rate=10, burst=3)
+
+    def test_burst_then_limited(self):
+        results = [self.limiter.allow('10.0.0.5') for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_tokens_refill_over_time(self):
+        for _ in range(3):
+            self.limiter.allow('10.0.0.5')
+        self.assertFalse(self.limiter.allow('10.0.0.5'))
+        self.now += 0.15  # one token at 10/s
+        self.assertTrue(self.limiter.allow('10.0.0.5'))
+        self.assertFalse(self.limiter.allow('10.0.0.5'))
+
+    def test_clients_are_independent(self):
+        for _ in range(4):
+            self.limiter.allow('10.0.0.5')
+        self.assertTrue(self.limiter.allow('10.0.0.6'))
+        self.assertEqual(self.limiter.get_status()['rejected'], 1)
+
+    def test_idle_clients_dropped_when_full(self):
+        limiter = RateLimiter(rate=10, burst=3, max_clients=2, idle_timeout=60)
+        limiter.allow('a')
+        limiter.allow('b')
+        self.now += 61
+        limiter.allow('c')
+        self.assertEqual(limiter.get_status()['clients'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import time
+import threading
+import http.client
+import unittest
+from flask import Flask
+from src.web.server import create_server
+
+class TestPriorityLane(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        app = Flask(__name__)
+
+        @app.route('/slow')
+        def slow():
+            self.release.wait(5)
+            return 'slow'
+
+        @app.route('/api/emergency_stop')
+        def emergency_stop():
+            return 'stopped'
+
+        self.server = create_server(app, '127.0.0.1', 0, threads=1)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.port = self.server.server_port
+
+    def tearDown(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def request(self, path, timeout=5):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=timeout)
+        connection.request('GET', path)
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return body
+
+    def test_emergency_stop_skips_busy_pool(self):
+        # Occupy the only regular worker
+        blocker = threading.Thread(target=self.request, args=('/slow',))
+        blocker.start()
+        time.sleep(0.2)
+
+        start = time.time()
+        self.assertEqual(self.request('/api/emergency_stop', timeout=2), b'stopped')
+        self.assertLess(time.time() - start, 1.0)
+
+        self.release.set()
+        blocker.join()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from src.settings_service import SettingsService
+
+class TestSettingsService(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'settings.json')
+        self.write({'camera': {'ip_camera_url': 'http://10.0.0.2:8080'}})
+        self.service = SettingsService(self.path, check_interval=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, data):
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+
+    def test_snapshot_is_read_only(self):
+        camera = self.service.section('camera')
+        self.assertEqual(camera['ip_camera_url'], 'http://10.0.0.2:8080')
+        with self.assertRaises(TypeError):
+            camera['ip_camera_url'] = 'http://10.0.0.3:8080'
+
+    def test_unchanged_file_is_not_reparsed(self):
+        first = self.service.get()
+        self.assertIs(self.service.get(), first)
+        self.assertEqual(self.service.reloads, 1)
+
+    def test_external_change_reloads_and_notifies(self):
+        self.service.get()
+        changes = []
+        self.service.add_listener(lambda new, old: changes.append((new, old)))
+
+        self.write({'camera': {'ip_camera_url': 'http://10.0.0.30:8080'}})
+        self.assertEqual(self.service.section('camera')['ip_camera_url'], 'http://10.0.0.30:8080')
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0][1]['camera']['ip_camera_url'], 'http://10.0.0.2:8080')
+
+    def test_update_writes_atomically_and_notifies(self):
+        changes = []
+        self.service.add_listener(lambda new, old: changes.append(new))
+
+        self.service.update(lambda s: s['camera'].__setitem__('enabled', False))
+
+        with open(self.path) as f:
+            self.assertFalse(json.load(f)['camera']['enabled'])
+        self.assertEqual(os.listdir(self.directory), ['settings.json'])
+        self.assertFalse(changes[0]['camera']['enabled'])
+        # The service wrote the file itself, so it is not parsed again
+        self.assertFalse(self.service.section('camera')['enabled'])
+        self.assertEqual(len(changes), 1)
+
+if __name__ == '__main__':
+    unittest.main()
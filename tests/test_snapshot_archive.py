@@ -0,0 +1,60 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from src.camera.snapshot_archive import SnapshotArchive
+
+class TestSnapshotArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_save_and_latest(self):
+        archive = SnapshotArchive(self.root)
+        self.assertIsNone(archive.latest())
+
+        path = archive.save(b'\xff\xd8jpeg\xff\xd9')
+        archive.flush()
+        self.assertEqual(archive.latest(), path)
+        self.assertEqual(os.path.dirname(os.path.dirname(path)), self.root)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'\xff\xd8jpeg\xff\xd9')
+        self.assertFalse(os.path.exists(path + '.tmp'))
+
+    def test_save_can_wait_for_the_write(self):
+        archive = SnapshotArchive(self.root)
+        path = archive.save(b'\xff\xd8jpeg\xff\xd9', wait=5)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(archive.latest(), path)
+
+    def test_size_retention_removes_oldest(self):
+        archive = SnapshotArchive(self.root, max_bytes=250)
+        paths = []
+        for i in range(4):
+            paths.append(archive.save(b'x' * 100, os.path.join(self.root, 'day', f'{i}.jpg')))
+            archive.flush()
+
+        self.assertEqual([entry['path'] for entry in archive.recent()], paths[:1:-1])
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertTrue(os.path.exists(paths[3]))
+        self.assertEqual(archive.get_status()['total_bytes'], 200)
+
+    def test_index_loaded_from_disk(self):
+        os.makedirs(os.path.join(self.root, '20260101'))
+        old = os.path.join(self.root, 'old.jpg')
+        new = os.path.join(self.root, '20260101', 'new.jpg')
+        for path, mtime in ((old, time.time() - 60), (new, time.time())):
+            with open(path, 'wb') as f:
+                f.write(b'data')
+            os.utime(path, (mtime, mtime))
+
+        archive = SnapshotArchive(self.root)
+        self.assertEqual(archive.latest(), new)
+        self.assertEqual(archive.get_status()['images'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
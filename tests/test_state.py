@@ -0,0 +1,34 @@
+import json
+import unittest
+from src.web.state import StateAggregator
+
+class TestStateAggregator(unittest.TestCase):
+
+    def setUp(self):
+        self.motors = {'running': False, 'speed': 50}
+        self.aggregator = StateAggregator()
+        self.aggregator.add_section('motors', lambda: dict(self.motors))
+
+    def test_version_only_changes_with_state(self):
+        version = self.aggregator.refresh()
+        self.assertEqual(self.aggregator.refresh(), version)
+
+        self.motors['speed'] = 80
+        self.assertGreater(self.aggregator.refresh(), version)
+
+    def test_body_serialized_once_per_version(self):
+        version = self.aggregator.refresh()
+        body, body_version = self.aggregator.get_body()
+        self.assertEqual(body_version, version)
+        self.assertEqual(json.loads(body)['motors']['speed'], 50)
+
+        self.aggregator.refresh()
+        self.assertIs(self.aggregator.get_body()[0], body)
+
+    def test_failing_section_reports_error(self):
+        self.aggregator.add_section('gps', lambda: 1 / 0)
+        self.aggregator.refresh()
+        self.assertIn('error', json.loads(self.aggregator.get_body()[0])['gps'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from src.web.telemetry import TelemetryBroadcaster, MedianFilter, format_event
+
+class TestTelemetryBroadcaster(unittest.TestCase):
+
+    def setUp(self):
+        self.broadcaster = TelemetryBroadcaster(interval=0.01, queue_size=2)
+
+    def tearDown(self):
+        for client in list(self.broadcaster.clients):
+            self.broadcaster.unsubscribe(client)
+
+    def test_only_changes_are_sent(self):
+        client = self.broadcaster.subscribe()
+        self.broadcaster.publish('motors', {'speed': 50})
+        self.broadcaster.publish('motors', {'speed': 50})
+        self.assertEqual(client.qsize(), 1)
+        self.assertEqual(client.get_nowait(), format_event('motors', {'speed': 50}))
+
+    def test_new_client_gets_current_state(self):
+        first = self.broadcaster.subscribe()
+        self.broadcaster.publish('gps', {'status': 'active'})
+        second = self.broadcaster.subscribe()
+        self.assertEqual(second.get_nowait(), format_event('gps', {'status': 'active'}))
+        self.assertEqual(first.qsize(), 1)
+
+    def test_slow_client_drops_oldest(self):
+        client = self.broadcaster.subscribe()
+        for speed in (10, 20, 30):
+            self.broadcaster.publish('motors', {'speed': speed})
+        self.assertEqual(client.get_nowait(), format_event('motors', {'speed': 20}))
+        self.assertEqual(client.get_nowait(), format_event('motors', {'speed': 30}))
+        self.assertEqual(self.broadcaster.dropped, 1)
+
+    def test_current_reuses_recent_sample(self):
+        calls = []
+        def source():
+            calls.append(1)
+            return {'distance': 42}
+        self.broadcaster.add_source('distance', source)
+        self.assertEqual(self.broadcaster.current('distance'), {'distance': 42})
+        self.assertEqual(self.broadcaster.current('distance'), {'distance': 42})
+        self.assertEqual(len(calls), 1)
+        self.broadcaster.current('distance', max_age=0)
+        self.assertEqual(len(calls), 2)
+        self.assertIsNone(self.broadcaster.current('missing'))
+
+    def test_median_filter_drops_spike(self):
+        distance_filter = MedianFilter(3)
+        distance_filter.add(50)
+        distance_filter.add(51)
+        self.assertEqual(distance_filter.add(2), 50)
+
+if __name__ == '__main__':
+    unittest.main()